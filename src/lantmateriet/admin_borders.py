@@ -1,16 +1,21 @@
 """Administrative division borders module."""
 
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, Optional, TypeVar
 
-from owslib.ogcapi.features import Features
+import httpx
 
 from lantmateriet.admin_border_types import (
     FeatureCollectionGeoJsonKommuner,
     FeatureCollectionGeoJsonLan,
     FeatureCollectionGeoJsonRike,
+    FeatureGeoJsonKommuner,
     FeatureGeoJsonLan,
     FeatureGeoJsonRike,
 )
+from lantmateriet.ogc_features import OGCFeatures
 
 USER = os.environ["LANTMATERIET_USER"]
 PASS = os.environ["LANTMATERIET_PASSWORD"]
@@ -20,6 +25,76 @@ LIMIT = 1000
 COUNTRY = "rike"
 COUNTIES = "lan"
 MUNICIPALITIES = "kommuner"
+CRS84 = "http://www.opengis.net/def/crs/OGC/1.3/CRS84"
+EPSG_URI = "http://www.opengis.net/def/crs/EPSG/0/{}"
+FILTER_LANG = "cql2-text"
+
+T = TypeVar("T")
+
+
+def crs_uri(crs: str) -> str:
+    """Convert CRS identifier to OGC CRS URI.
+
+    Args:
+        crs: CRS as "EPSG:<code>", "CRS84" or URI
+
+    Returns:
+        OGC CRS URI
+
+    Raises:
+        ValueError
+    """
+    if crs.startswith("http"):
+        return crs
+
+    if crs.upper() in {"CRS84", "OGC:CRS84"}:
+        return CRS84
+
+    authority, _, code = crs.partition(":")
+    if authority.upper() != "EPSG" or not code.isdigit():
+        raise ValueError(f"Unsupported CRS: {crs}.")
+
+    return EPSG_URI.format(code)
+
+
+def build_query(
+    bbox: Optional[tuple[float, float, float, float]] = None,
+    bbox_crs: Optional[str] = None,
+    crs: Optional[str] = None,
+    properties: Optional[dict[str, str]] = None,
+    cql_filter: Optional[str] = None,
+) -> dict:
+    """Build OGC API Features query parameters.
+
+    Args:
+        bbox: bounding box as (minx, miny, maxx, maxy)
+        bbox_crs: CRS of bounding box, defaults to CRS84
+        crs: CRS of returned geometries, defaults to CRS84
+        properties: property equality filters, e.g. {"lanskod": "01"}
+        cql_filter: CQL2 text filter expression
+
+    Returns:
+        query parameters
+    """
+    query: dict = {}
+
+    if bbox is not None:
+        query["bbox"] = ",".join(str(coordinate) for coordinate in bbox)
+
+    if bbox_crs is not None:
+        query["bbox-crs"] = crs_uri(bbox_crs)
+
+    if crs is not None:
+        query["crs"] = crs_uri(crs)
+
+    if properties is not None:
+        query.update(properties)
+
+    if cql_filter is not None:
+        query["filter"] = cql_filter
+        query["filter-lang"] = FILTER_LANG
+
+    return query
 
 
 class AdminBorders:
@@ -27,16 +102,62 @@ class AdminBorders:
 
     Targets Kommun, Län och Rike Direkt
     API: https://api.lantmateriet.se/ogc-features/v1/administrativ-indelning
+
+    Filters given to the query methods are pushed down to the API, so only matching
+    features are transferred and parsed. This is a thin layer over `OGCFeatures`, the
+    synchronous methods run their async counterparts in a new event loop of their own
+    thread, so they also work when called from a running event loop. Use the async
+    methods inside `async with`, or with a shared client, to share the connection pool
+    between calls. A pool is bound to the event loop it is used in, so the synchronous
+    methods can not be used with a shared client.
     """
 
-    def __init__(self, limit: int = LIMIT):
+    def __init__(self, limit: int = LIMIT, client: Optional[httpx.AsyncClient] = None):
         """Initialise admin borders object.
 
         Args:
             limit: limit of API calls
+            client: shared HTTP client for async use, opened and closed by the caller
         """
-        self._features = Features(BASE_URL, auth=BASIC_AUTH)
-        self._limit = limit
+        self._features = OGCFeatures(BASE_URL, auth=BASIC_AUTH, limit=limit, client=client)
+
+    async def __aenter__(self) -> "AdminBorders":
+        """Open connection pool.
+
+        Returns:
+            admin borders object
+        """
+        await self._features.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Close connection pool.
+
+        Args:
+            exc_info: exception info
+        """
+        await self._features.__aexit__(*exc_info)
+
+    def _run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run coroutine to completion in a new event loop of its own thread.
+
+        Args:
+            coroutine: coroutine of an async method
+
+        Returns:
+            result of coroutine
+
+        Raises:
+            RuntimeError
+        """
+        if self._features.is_open is True:
+            coroutine.close()
+            raise RuntimeError(
+                "Synchronous methods can not use a shared HTTP client, use the async methods."
+            )
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
 
     @property
     def collections(self) -> list[str]:
@@ -45,7 +166,7 @@ class AdminBorders:
         Returns:
             feature collections
         """
-        return self._features.feature_collections()
+        return self._run(self._features.collections())
 
     @property
     def country(self) -> list[FeatureGeoJsonRike]:
@@ -54,9 +175,7 @@ class AdminBorders:
         Returns:
             country
         """
-        raw_country = self._features.collection_items(COUNTRY, limit=self._limit)
-        country = FeatureCollectionGeoJsonRike(**raw_country)
-        return country.features
+        return self.get_country()
 
     @property
     def counties(self) -> list[FeatureGeoJsonLan]:
@@ -65,17 +184,154 @@ class AdminBorders:
         Returns:
             counties
         """
-        raw_counties = self._features.collection_items(COUNTIES, limit=self._limit)
-        counties = FeatureCollectionGeoJsonLan(**raw_counties)
-        return counties.features
+        return self.get_counties()
 
     @property
-    def municipalities(self) -> list[FeatureCollectionGeoJsonKommuner]:
+    def municipalities(self) -> list[FeatureGeoJsonKommuner]:
         """Get municipalities.
 
         Returns:
             municipalities
         """
-        raw_municipalities = self._features.collection_items(MUNICIPALITIES, limit=self._limit)
+        return self.get_municipalities()
+
+    def get_country(
+        self,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+        bbox_crs: Optional[str] = None,
+        crs: Optional[str] = None,
+        properties: Optional[dict[str, str]] = None,
+        cql_filter: Optional[str] = None,
+    ) -> list[FeatureGeoJsonRike]:
+        """Get country features matching filters.
+
+        Args:
+            bbox: bounding box as (minx, miny, maxx, maxy)
+            bbox_crs: CRS of bounding box, defaults to CRS84
+            crs: CRS of returned geometries, defaults to CRS84
+            properties: property equality filters
+            cql_filter: CQL2 text filter expression
+
+        Returns:
+            country
+        """
+        return self._run(self.get_country_async(bbox, bbox_crs, crs, properties, cql_filter))
+
+    def get_counties(
+        self,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+        bbox_crs: Optional[str] = None,
+        crs: Optional[str] = None,
+        properties: Optional[dict[str, str]] = None,
+        cql_filter: Optional[str] = None,
+    ) -> list[FeatureGeoJsonLan]:
+        """Get county features matching filters.
+
+        Args:
+            bbox: bounding box as (minx, miny, maxx, maxy)
+            bbox_crs: CRS of bounding box, defaults to CRS84
+            crs: CRS of returned geometries, defaults to CRS84
+            properties: property equality filters, e.g. {"lanskod": "01"}
+            cql_filter: CQL2 text filter expression
+
+        Returns:
+            counties
+        """
+        return self._run(self.get_counties_async(bbox, bbox_crs, crs, properties, cql_filter))
+
+    def get_municipalities(
+        self,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+        bbox_crs: Optional[str] = None,
+        crs: Optional[str] = None,
+        properties: Optional[dict[str, str]] = None,
+        cql_filter: Optional[str] = None,
+    ) -> list[FeatureGeoJsonKommuner]:
+        """Get municipality features matching filters.
+
+        Args:
+            bbox: bounding box as (minx, miny, maxx, maxy)
+            bbox_crs: CRS of bounding box, defaults to CRS84
+            crs: CRS of returned geometries, defaults to CRS84
+            properties: property equality filters, e.g. {"lanskod": "01"}
+            cql_filter: CQL2 text filter expression
+
+        Returns:
+            municipalities
+        """
+        return self._run(self.get_municipalities_async(bbox, bbox_crs, crs, properties, cql_filter))
+
+    async def get_country_async(
+        self,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+        bbox_crs: Optional[str] = None,
+        crs: Optional[str] = None,
+        properties: Optional[dict[str, str]] = None,
+        cql_filter: Optional[str] = None,
+    ) -> list[FeatureGeoJsonRike]:
+        """Get country features matching filters asynchronously.
+
+        Args:
+            bbox: bounding box as (minx, miny, maxx, maxy)
+            bbox_crs: CRS of bounding box, defaults to CRS84
+            crs: CRS of returned geometries, defaults to CRS84
+            properties: property equality filters
+            cql_filter: CQL2 text filter expression
+
+        Returns:
+            country
+        """
+        query = build_query(bbox, bbox_crs, crs, properties, cql_filter)
+        raw_country = await self._features.collection_items(COUNTRY, **query)
+        country = FeatureCollectionGeoJsonRike(**raw_country)
+        return country.features
+
+    async def get_counties_async(
+        self,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+        bbox_crs: Optional[str] = None,
+        crs: Optional[str] = None,
+        properties: Optional[dict[str, str]] = None,
+        cql_filter: Optional[str] = None,
+    ) -> list[FeatureGeoJsonLan]:
+        """Get county features matching filters asynchronously.
+
+        Args:
+            bbox: bounding box as (minx, miny, maxx, maxy)
+            bbox_crs: CRS of bounding box, defaults to CRS84
+            crs: CRS of returned geometries, defaults to CRS84
+            properties: property equality filters, e.g. {"lanskod": "01"}
+            cql_filter: CQL2 text filter expression
+
+        Returns:
+            counties
+        """
+        query = build_query(bbox, bbox_crs, crs, properties, cql_filter)
+        raw_counties = await self._features.collection_items(COUNTIES, **query)
+        counties = FeatureCollectionGeoJsonLan(**raw_counties)
+        return counties.features
+
+    async def get_municipalities_async(
+        self,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+        bbox_crs: Optional[str] = None,
+        crs: Optional[str] = None,
+        properties: Optional[dict[str, str]] = None,
+        cql_filter: Optional[str] = None,
+    ) -> list[FeatureGeoJsonKommuner]:
+        """Get municipality features matching filters asynchronously.
+
+        Args:
+            bbox: bounding box as (minx, miny, maxx, maxy)
+            bbox_crs: CRS of bounding box, defaults to CRS84
+            crs: CRS of returned geometries, defaults to CRS84
+            properties: property equality filters, e.g. {"lanskod": "01"}
+            cql_filter: CQL2 text filter expression
+
+        Returns:
+            municipalities
+        """
+        query = build_query(bbox, bbox_crs, crs, properties, cql_filter)
+        raw_municipalities = await self._features.collection_items(MUNICIPALITIES, **query)
         municipalities = FeatureCollectionGeoJsonKommuner(**raw_municipalities)
         return municipalities.features
@@ -0,0 +1,278 @@
+"""Arrow geometry module.
+
+Processes layers as Arrow tables, so attributes are never converted to pandas and
+geometry operations run vectorised on shapely arrays. Timestamps are read without time
+zone, in UTC, as GeoDataFrames are read, so outputs have the same schema either way.
+"""
+
+import itertools
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+import geopandas as gpd
+import numpy as np
+import pyarrow as pa
+import pyogrio
+import shapely
+
+from lantmateriet.reproject import reproject
+
+GEOMETRY_TYPE_NAMES = {
+    shapely.GeometryType.POINT: "Point",
+    shapely.GeometryType.LINESTRING: "LineString",
+    shapely.GeometryType.POLYGON: "Polygon",
+    shapely.GeometryType.MULTIPOINT: "MultiPoint",
+    shapely.GeometryType.MULTILINESTRING: "MultiLineString",
+    shapely.GeometryType.MULTIPOLYGON: "MultiPolygon",
+}
+UNKNOWN_GEOMETRY_TYPE = "Unknown"
+DEFAULT_GEOMETRY_NAME = "wkb_geometry"
+BATCH_SIZE = 65_536
+
+
+def naive_timestamps(table: pa.Table) -> pa.Table:
+    """Drop time zone of timestamp columns, keeping their UTC times.
+
+    Args:
+        table: Arrow table
+
+    Returns:
+        Arrow table with naive timestamps
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type) and field.type.tz is not None:
+            table = table.set_column(i, field.name, table[i].cast(pa.timestamp(field.type.unit)))
+
+    return table
+
+
+@dataclass
+class GeoTable:
+    """Arrow table of attributes with a geometry array.
+
+    Geometries are kept as a shapely array beside the attribute table, and only
+    encoded to WKB when written.
+
+    Args:
+        table: attribute table, without geometry column
+        geometries: shapely geometry array, one per row
+        geometry_name: name of geometry column
+        crs: CRS of geometries
+    """
+
+    table: pa.Table
+    geometries: np.ndarray
+    geometry_name: str = DEFAULT_GEOMETRY_NAME
+    crs: Optional[str] = None
+
+    def __len__(self) -> int:
+        """Get number of rows.
+
+        Returns:
+            number of rows
+        """
+        return self.table.num_rows
+
+    @classmethod
+    def from_geodataframe(cls, df: gpd.GeoDataFrame) -> "GeoTable":
+        """Convert GeoDataFrame to geo table.
+
+        Args:
+            df: geopandas GeoDataFrame
+
+        Returns:
+            geo table
+        """
+        return cls(
+            pa.Table.from_pandas(df.drop(columns=df.geometry.name), preserve_index=False),
+            np.asarray(df.geometry.values),
+            df.geometry.name,
+            None if df.crs is None else df.crs.to_string(),
+        )
+
+    @classmethod
+    def read(cls, file: str, layer: str, where: Optional[str] = None) -> "GeoTable":
+        """Read layer with pyogrio's Arrow reader.
+
+        Args:
+            file: file to read
+            layer: layer to read
+            where: SQL filter
+
+        Returns:
+            geo table
+        """
+        meta, table = pyogrio.read_arrow(file, layer=layer, where=where)
+        return cls.from_arrow(table, meta["geometry_name"] or DEFAULT_GEOMETRY_NAME, meta["crs"])
+
+    @classmethod
+    def read_batches(
+        cls, file: str, layer: str, where: Optional[str] = None, batch_size: int = BATCH_SIZE
+    ) -> Iterator["GeoTable"]:
+        """Read layer in batches with pyogrio's Arrow stream reader.
+
+        Args:
+            file: file to read
+            layer: layer to read
+            where: SQL filter
+            batch_size: max number of features per batch
+
+        Yields:
+            geo table of each batch
+        """
+        with pyogrio.open_arrow(
+            file, layer=layer, where=where, batch_size=batch_size, use_pyarrow=True
+        ) as (meta, reader):
+            geometry_name = meta["geometry_name"] or DEFAULT_GEOMETRY_NAME
+            for batch in reader:
+                yield cls.from_arrow(pa.Table.from_batches([batch]), geometry_name, meta["crs"])
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table, geometry_name: str, crs: Optional[str]) -> "GeoTable":
+        """Convert Arrow table with a WKB geometry column to geo table.
+
+        Args:
+            table: Arrow table
+            geometry_name: name of WKB geometry column
+            crs: CRS of geometries
+
+        Returns:
+            geo table
+        """
+        geometry_index = table.schema.get_field_index(geometry_name)
+        return cls(
+            naive_timestamps(table.remove_column(geometry_index)),
+            shapely.from_wkb(table[geometry_name].to_numpy(zero_copy_only=False)),
+            geometry_name,
+            crs,
+        )
+
+    def explode(self) -> "GeoTable":
+        """Explode multi-part geometries to one row per part.
+
+        Returns:
+            exploded geo table
+        """
+        parts, index = shapely.get_parts(self.geometries, return_index=True)
+        return GeoTable(self.table.take(index), parts, self.geometry_name, self.crs)
+
+    def take(self, indices: np.ndarray) -> "GeoTable":
+        """Select rows.
+
+        Args:
+            indices: row indices
+
+        Returns:
+            geo table with selected rows
+        """
+        return GeoTable(
+            self.table.take(indices), self.geometries[indices], self.geometry_name, self.crs
+        )
+
+    def set_column(self, name: str, values: np.ndarray) -> "GeoTable":
+        """Set attribute column, appending it if missing.
+
+        Args:
+            name: column name
+            values: column values
+
+        Returns:
+            geo table with column
+        """
+        if name in self.table.column_names:
+            table = self.table.set_column(
+                self.table.column_names.index(name), name, pa.array(values)
+            )
+        else:
+            table = self.table.append_column(name, pa.array(values))
+
+        return GeoTable(table, self.geometries, self.geometry_name, self.crs)
+
+    def to_crs(self, crs: str) -> "GeoTable":
+        """Reproject geometries.
+
+        Args:
+            crs: CRS to reproject to
+
+        Returns:
+            reprojected geo table
+        """
+        return self.to_crs_many([crs])[crs]
+
+    def to_crs_many(self, crs: list[str]) -> dict[str, "GeoTable"]:
+        """Reproject geometries to several CRSs, sharing the attribute table.
+
+        Args:
+            crs: CRSs to reproject to
+
+        Returns:
+            reprojected geo tables by CRS
+        """
+        return {
+            target: GeoTable(self.table, geometries, self.geometry_name, target)
+            for target, geometries in reproject(self.geometries, self.crs, crs).items()
+        }
+
+    @property
+    def geometry_type(self) -> str:
+        """Get common geometry type.
+
+        Returns:
+            geometry type name, Unknown for mixed types
+        """
+        type_ids = np.unique(shapely.get_type_id(self.geometries))
+        if len(type_ids) != 1:
+            return UNKNOWN_GEOMETRY_TYPE
+
+        return GEOMETRY_TYPE_NAMES.get(shapely.GeometryType(type_ids[0]), UNKNOWN_GEOMETRY_TYPE)
+
+    def to_arrow(self) -> pa.Table:
+        """Convert to Arrow table with a WKB geometry column.
+
+        Returns:
+            Arrow table
+        """
+        return self.table.append_column(
+            self.geometry_name, pa.array(shapely.to_wkb(self.geometries), pa.binary())
+        )
+
+    def write(self, file: str, driver: str) -> None:
+        """Write with pyogrio's Arrow writer.
+
+        Args:
+            file: file to write
+            driver: OGR driver
+        """
+        pyogrio.write_arrow(
+            self.to_arrow(),
+            file,
+            driver=driver,
+            geometry_name=self.geometry_name,
+            geometry_type=self.geometry_type,
+            crs=self.crs,
+        )
+
+    def write_batches(self, tables: Iterable["GeoTable"], file: str, driver: str) -> None:
+        """Write this and following geo tables as one stream, holding one batch at a time.
+
+        The schema, geometry type and CRS of the stream are taken from this table.
+
+        Args:
+            tables: following geo tables
+            file: file to write
+            driver: OGR driver
+        """
+        first = self.to_arrow()
+        batches = (
+            batch
+            for table in itertools.chain([first], (table.to_arrow() for table in tables))
+            for batch in table.to_batches()
+        )
+        pyogrio.write_arrow(
+            pa.RecordBatchReader.from_batches(first.schema, batches),
+            file,
+            driver=driver,
+            geometry_name=self.geometry_name,
+            geometry_type=self.geometry_type,
+            crs=self.crs,
+        )
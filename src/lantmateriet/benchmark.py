@@ -0,0 +1,522 @@
+"""Benchmark module.
+
+Generates synthetic GeoPackages shaped like Topografi 50 at a configurable scale, runs
+the full extraction on them and reports throughput and peak memory of tasks per layer.
+Results can be stored as a baseline with the options of the run, and later results of
+a run with the same options are compared against it to detect slowdowns and memory
+growth.
+
+The synthetic data has
+- mark: a polygon coverage of grid cells with densified, jittered shared edges, where
+  patches of cells share objekttyp, so touching cells are dissolved as in real ground
+- vaglinje: road lines as random walks
+- textpunkt: text points
+with objekttyp and texttyp drawn from distributions resembling the real data.
+"""
+
+import json
+import math
+import os
+import shutil
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from os import path
+from typing import Any, Optional
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from lantmateriet.config import config_50
+from lantmateriet.extract import extract
+from lantmateriet.gpkg import BYTES_PER_COORDINATE
+from lantmateriet.memory import load_memory_report
+from lantmateriet.plan import PLAN_FILE, load_plan
+from lantmateriet.tracing import TASK_SPAN, TRACE_FILE, read_trace
+from lantmateriet.utils import format_table
+
+MARK_FEATURES = 10_000
+ROAD_FEATURES = 20_000
+TEXT_FEATURES = 20_000
+ORIGIN = (400_000.0, 6_500_000.0)
+CELL_SIZE = 500.0
+EDGE_VERTICES = 8
+PATCH_SIZE = 4
+PATCH_MIX = 0.2
+ROAD_STEP = 100.0
+ROAD_VERTICES = (5, 30)
+CREATED = datetime(2023, 2, 1)
+TOLERANCE = 0.25
+TOTAL = "total"
+RESULT_COLUMNS = (
+    "layer",
+    "features",
+    "seconds",
+    "features_per_s",
+    "mb_per_s",
+    "growth_mb",
+    "traced_mb",
+)
+
+MARK_TYPES = {
+    "Barr- och blandskog": 0.40,
+    "Lövskog": 0.06,
+    "Öppen mark": 0.10,
+    "Åker": 0.12,
+    "Sjö": 0.09,
+    "Kalfjäll": 0.05,
+    "Fjällbjörkskog": 0.04,
+    "Låg bebyggelse": 0.04,
+    "Sluten bebyggelse": 0.01,
+    "Hög bebyggelse": 0.005,
+    "Industri- och handelsbebyggelse": 0.01,
+    "Vattendragsyta": 0.02,
+    "Anlagt vatten": 0.005,
+    "Glaciär": 0.005,
+    "Fruktodling": 0.005,
+}
+ROAD_TYPES = {
+    "Småväg": 0.35,
+    "Småväg enkel standard": 0.20,
+    "Lokalgata liten": 0.15,
+    "Lokalgata stor": 0.08,
+    "Landsväg liten": 0.08,
+    "Landsväg": 0.05,
+    "Huvudgata": 0.04,
+    "Mötesfri väg": 0.02,
+    "Motortrafikled": 0.01,
+    "Motorväg": 0.01,
+    "Övergripande länk": 0.01,
+}
+TEXT_TYPES = {
+    "Gård": 0.30,
+    "Terrängnamn": 0.20,
+    "By": 0.12,
+    "Sjönamn": 0.12,
+    "Vattendragsnamn": 0.08,
+    "Berg": 0.06,
+    "Ö": 0.05,
+    "Småort": 0.04,
+    "Tätort": 0.03,
+}
+DATASETS = {
+    "mark": ("mark_sverige.gpkg", "objekttyp", MARK_TYPES),
+    "vaglinje": ("kommunikation_sverige.gpkg", "objekttyp", ROAD_TYPES),
+    "textpunkt": ("text_sverige.gpkg", "texttyp", TEXT_TYPES),
+}
+
+
+def choose(rng: np.random.Generator, types: dict[str, float], size: int) -> np.ndarray:
+    """Draw names from a distribution.
+
+    Args:
+        rng: random generator
+        types: weight by name
+        size: number of names
+
+    Returns:
+        names
+    """
+    weights = np.array(list(types.values()))
+    return rng.choice(np.array(list(types.keys()), dtype=object), size, p=weights / weights.sum())
+
+
+def attributes(
+    rng: np.random.Generator, types: dict[str, float], names: np.ndarray, field: str
+) -> dict[str, Any]:
+    """Get attribute columns of synthetic features.
+
+    Args:
+        rng: random generator
+        types: weight by name
+        names: name of each feature
+        field: field of names
+
+    Returns:
+        columns by field
+    """
+    codes = {name: 1000 + i for i, name in enumerate(types)}
+    return {
+        "objektidentitet": [str(uuid.UUID(bytes=rng.bytes(16), version=4)) for _ in names],
+        "skapad": [CREATED + timedelta(seconds=int(s)) for s in rng.integers(0, 10**7, len(names))],
+        f"{field}nr": np.array([codes[name] for name in names], dtype=np.int64),
+        field: names,
+    }
+
+
+def grid_shape(features: int) -> tuple[int, int]:
+    """Get columns and rows of a grid with at least this many cells.
+
+    Args:
+        features: number of cells
+
+    Returns:
+        columns and rows
+    """
+    columns = max(1, math.ceil(math.sqrt(features)))
+    return columns, max(1, math.ceil(features / columns))
+
+
+def mark_polygons(rng: np.random.Generator, features: int) -> np.ndarray:
+    """Generate a coverage of grid cell polygons with shared, densified edges.
+
+    Args:
+        rng: random generator
+        features: number of polygons
+
+    Returns:
+        shapely polygon array, in row order
+    """
+    columns, rows = grid_shape(features)
+    step = CELL_SIZE / EDGE_VERTICES
+    jitter = step / 4
+    x = ORIGIN[0] + np.arange(columns * EDGE_VERTICES + 1) * step
+    y = ORIGIN[1] + np.arange(rows * EDGE_VERTICES + 1) * step
+    nodes_x = x[:, None] + rng.uniform(-jitter, jitter, (len(x), len(y)))
+    nodes_y = y[None, :] + rng.uniform(-jitter, jitter, (len(x), len(y)))
+
+    side = np.arange(EDGE_VERTICES)
+    ring_i = np.concatenate(
+        [side, np.full(EDGE_VERTICES, EDGE_VERTICES), side[::-1] + 1, [0] * EDGE_VERTICES]
+    )
+    ring_j = np.concatenate(
+        [[0] * EDGE_VERTICES, side, np.full(EDGE_VERTICES, EDGE_VERTICES), side[::-1] + 1]
+    )
+    ring_i = np.concatenate([ring_i, ring_i[:1]])
+    ring_j = np.concatenate([ring_j, ring_j[:1]])
+
+    cells = np.arange(features)
+    i = (cells % columns)[:, None] * EDGE_VERTICES + ring_i[None, :]
+    j = (cells // columns)[:, None] * EDGE_VERTICES + ring_j[None, :]
+    coordinates = np.stack([nodes_x[i, j], nodes_y[i, j]], axis=-1).reshape(-1, 2)
+
+    return shapely.polygons(shapely.linearrings(coordinates, indices=np.repeat(cells, len(ring_i))))
+
+
+def mark_names(rng: np.random.Generator, features: int) -> np.ndarray:
+    """Draw ground names by patches of cells, mixed with some single cells.
+
+    Args:
+        rng: random generator
+        features: number of polygons
+
+    Returns:
+        names, in row order of cells
+    """
+    columns, rows = grid_shape(features)
+    patches = choose(
+        rng,
+        MARK_TYPES,
+        math.ceil(columns / PATCH_SIZE) * math.ceil(rows / PATCH_SIZE),
+    )
+    cells = np.arange(features)
+    patch = (cells // columns // PATCH_SIZE) * math.ceil(columns / PATCH_SIZE) + (
+        cells % columns // PATCH_SIZE
+    )
+    names = patches[patch]
+
+    mixed = rng.random(features) < PATCH_MIX
+    names[mixed] = choose(rng, MARK_TYPES, int(mixed.sum()))
+    return names
+
+
+def road_lines(rng: np.random.Generator, features: int, extent: float) -> np.ndarray:
+    """Generate road lines as random walks.
+
+    Args:
+        rng: random generator
+        features: number of lines
+        extent: side of square to start lines in, in metres
+
+    Returns:
+        shapely multi line string array
+    """
+    vertices = rng.integers(ROAD_VERTICES[0], ROAD_VERTICES[1], features)
+    lines = np.repeat(np.arange(features), vertices)
+    headings = rng.uniform(0, 2 * np.pi, features)[lines] + np.cumsum(
+        rng.normal(0, 0.3, len(lines))
+    )
+    starts = np.concatenate([[0], np.cumsum(vertices)[:-1]])
+
+    steps = np.column_stack([np.cos(headings), np.sin(headings)]) * ROAD_STEP
+    steps[starts] = rng.uniform(0, extent, (features, 2)) + ORIGIN
+    coordinates = np.cumsum(steps, axis=0)
+    coordinates -= np.repeat(coordinates[starts] - steps[starts], vertices, axis=0)
+
+    return shapely.multilinestrings(
+        shapely.linestrings(coordinates, indices=lines), indices=np.arange(features)
+    )
+
+
+def text_points(rng: np.random.Generator, features: int, extent: float) -> np.ndarray:
+    """Generate text points.
+
+    Args:
+        rng: random generator
+        features: number of points
+        extent: side of square to place points in, in metres
+
+    Returns:
+        shapely point array
+    """
+    return shapely.points(rng.uniform(0, extent, (features, 2)) + ORIGIN)
+
+
+def generate_topografi(target_path: str, scale: float = 1.0, seed: int = 0) -> dict[str, str]:
+    """Generate synthetic Topografi 50 GeoPackages.
+
+    At scale 1 there are 10k ground polygons, 20k road lines and 20k text points. Existing
+    GeoPackages in target path are replaced.
+
+    Args:
+        target_path: path to save GeoPackages to
+        scale: scale of number of features
+        seed: seed of random generator
+
+    Returns:
+        GeoPackage by layer
+    """
+    rng = np.random.default_rng(seed)
+    mark_features = max(PATCH_SIZE**2, int(MARK_FEATURES * scale))
+    extent = grid_shape(mark_features)[0] * CELL_SIZE
+
+    geometries = {
+        "mark": (mark_polygons(rng, mark_features), mark_names(rng, mark_features)),
+        "vaglinje": (
+            road_lines(rng, max(1, int(ROAD_FEATURES * scale)), extent),
+            choose(rng, ROAD_TYPES, max(1, int(ROAD_FEATURES * scale))),
+        ),
+        "textpunkt": (
+            text_points(rng, max(1, int(TEXT_FEATURES * scale)), extent),
+            choose(rng, TEXT_TYPES, max(1, int(TEXT_FEATURES * scale))),
+        ),
+    }
+
+    os.makedirs(target_path, exist_ok=True)
+    files = {}
+    for layer, (file_name, field, types) in DATASETS.items():
+        layer_geometries, names = geometries[layer]
+        file = path.join(target_path, file_name)
+        if path.exists(file):
+            os.remove(file)
+        gpd.GeoDataFrame(
+            attributes(rng, types, names, field),
+            geometry=layer_geometries,
+            crs=config_50.espg_3006,
+        ).to_file(file, layer=layer, driver="GPKG", engine="pyogrio")
+        files[layer] = file
+
+    return files
+
+
+@dataclass
+class BenchmarkResult:
+    """Benchmark result of a layer or of the whole run.
+
+    Args:
+        name: layer name, or total
+        features: number of features extracted
+        seconds: wall time in seconds, summed over tasks for layers
+        megabytes: size of extracted geometries in megabytes
+        growth: highest growth of peak RSS of a task above RSS at its start in bytes
+        peak_traced: highest peak memory traced by tracemalloc of a task in bytes
+    """
+
+    name: str
+    features: int
+    seconds: float
+    megabytes: float
+    growth: int
+    peak_traced: int
+
+    @property
+    def features_per_second(self) -> float:
+        """Get throughput in features.
+
+        Returns:
+            features per second
+        """
+        return self.features / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """Get throughput in geometry size.
+
+        Returns:
+            megabytes per second
+        """
+        return self.megabytes / self.seconds if self.seconds > 0 else 0.0
+
+
+def run_benchmark(
+    source_path: str, target_path: str, workers: Optional[int] = None, **options: Any
+) -> list[BenchmarkResult]:
+    """Run full extraction twice, timed with tracing, then with memory accounting.
+
+    Memory accounting traces allocations in every worker, which slows tasks down, so
+    throughput is measured in a run without it. Outputs in target path are removed
+    first and the second run is forced, so every task runs in both.
+
+    Args:
+        source_path: path of GeoPackages
+        target_path: path to save extracted files to
+        workers: number of workers, tuned from CPUs and memory by default
+        **options: other options of extract, e.g. arrow or batch_size
+
+    Returns:
+        result per layer, and total result of the whole run last
+    """
+    shutil.rmtree(target_path, ignore_errors=True)
+
+    start = time.perf_counter()
+    extract(source_path, target_path, workers=workers, trace=True, **options)
+    seconds = time.perf_counter() - start
+
+    task_seconds: dict[str, float] = {}
+    for item in read_trace(path.join(target_path, TRACE_FILE)):
+        if item.name == TASK_SPAN and item.task is not None:
+            task_seconds[item.task[1]] = task_seconds.get(item.task[1], 0.0) + item.wall / 1e9
+
+    extract(source_path, target_path, workers=workers, force=True, memory=True, **options)
+    plan = load_plan(path.join(target_path, PLAN_FILE))
+    report = load_memory_report(target_path)
+
+    results = []
+    for layer in sorted({entry.layer for entry in plan}):
+        entries = [entry for entry in plan if entry.layer == layer]
+        tasks = [task for key, task in report.items() if key[1] == layer]
+        results.append(
+            BenchmarkResult(
+                layer,
+                sum(entry.features for entry in entries),
+                task_seconds.get(layer, 0.0),
+                sum(entry.vertices for entry in entries) * BYTES_PER_COORDINATE / 1024**2,
+                max((task.growth for task in tasks), default=0),
+                max((task.peak_traced for task in tasks), default=0),
+            )
+        )
+
+    results.append(
+        BenchmarkResult(
+            TOTAL,
+            sum(result.features for result in results),
+            seconds,
+            sum(result.megabytes for result in results),
+            max((result.growth for result in results), default=0),
+            max((result.peak_traced for result in results), default=0),
+        )
+    )
+    return results
+
+
+def format_results(results: list[BenchmarkResult]) -> str:
+    """Format benchmark results as a text table.
+
+    Args:
+        results: benchmark results
+
+    Returns:
+        table with one row per result
+    """
+    return format_table(
+        RESULT_COLUMNS,
+        [
+            (
+                result.name,
+                str(result.features),
+                f"{result.seconds:.2f}",
+                f"{result.features_per_second:.0f}",
+                f"{result.megabytes_per_second:.2f}",
+                f"{result.growth / 1024**2:.1f}",
+                f"{result.peak_traced / 1024**2:.1f}",
+            )
+            for result in results
+        ],
+    )
+
+
+def save_baseline(baseline_file: str, results: list[BenchmarkResult], options: dict) -> None:
+    """Save benchmark results as baseline.
+
+    Args:
+        baseline_file: path to baseline file
+        results: benchmark results
+        options: options of benchmark run, e.g. scale, seed, workers, arrow and batch_size
+    """
+    with open(baseline_file, "w") as f:
+        json.dump(
+            {"options": options, "results": [asdict(result) for result in results]}, f, indent=2
+        )
+
+
+def load_baseline(baseline_file: str) -> tuple[dict, list[BenchmarkResult]]:
+    """Load baseline benchmark results.
+
+    Args:
+        baseline_file: path to baseline file
+
+    Returns:
+        options of baseline run and benchmark results
+    """
+    with open(baseline_file, "r") as f:
+        baseline = json.load(f)
+
+    return baseline["options"], [BenchmarkResult(**result) for result in baseline["results"]]
+
+
+def option_differences(options: dict, baseline_options: dict) -> list[str]:
+    """Get differences of benchmark options from those of a baseline.
+
+    Args:
+        options: options of benchmark run
+        baseline_options: options of baseline run
+
+    Returns:
+        description of each differing option, empty if runs are comparable
+    """
+    return [
+        f"{option}: {options.get(option)}, baseline {baseline_options.get(option)}"
+        for option in sorted(set(options) | set(baseline_options))
+        if options.get(option) != baseline_options.get(option)
+    ]
+
+
+def regressions(
+    results: list[BenchmarkResult],
+    baseline: list[BenchmarkResult],
+    tolerance: float = TOLERANCE,
+) -> list[str]:
+    """Compare benchmark results with baseline.
+
+    Memory is compared by the traced peak of tasks. Growth of peak RSS is reported but
+    not compared, since reused workers keep freed heap and grow by close to nothing.
+
+    Args:
+        results: benchmark results
+        baseline: baseline benchmark results, of the same options
+        tolerance: allowed relative slowdown and memory growth
+
+    Returns:
+        description of each regression, empty if none
+    """
+    baseline_results = {result.name: result for result in baseline}
+    found = []
+    for result in results:
+        if result.name not in baseline_results:
+            continue
+
+        expected = baseline_results[result.name]
+        if result.features_per_second < expected.features_per_second * (1 - tolerance):
+            found.append(
+                f"{result.name}: {result.features_per_second:.0f} features/s, "
+                f"baseline {expected.features_per_second:.0f}"
+            )
+        if result.peak_traced > expected.peak_traced * (1 + tolerance):
+            found.append(
+                f"{result.name}: traced peak {result.peak_traced / 1024**2:.1f} MB, "
+                f"baseline {expected.peak_traced / 1024**2:.1f} MB"
+            )
+
+    return found
@@ -1,10 +1,35 @@
 """CLI module."""
 
+from enum import Enum
+from os import path
+from typing import Optional
+
 import typer
 from tqdm import tqdm
 
 from lantmateriet.api import Lantmateriet
+from lantmateriet.benchmark import (
+    format_results,
+    generate_topografi,
+    load_baseline,
+    option_differences,
+    regressions,
+    run_benchmark,
+    save_baseline,
+)
 from lantmateriet.extract import extract
+from lantmateriet.geometry import FILE_ENDING_DRIVERS_MAP
+from lantmateriet.memory import format_memory_report, load_memory_report, sort_memory_report
+from lantmateriet.plan import PLAN_FILE, format_plan, load_plan
+from lantmateriet.profiler import PROFILE_FILE, read_folded, top_frames
+from lantmateriet.pyramid import BorderPyramid
+from lantmateriet.scheduler import RETRIES
+from lantmateriet.topology import Topology
+from lantmateriet.tracing import TRACE_FILE, read_trace, summary
+
+FileEnding = Enum(  # type: ignore[misc]
+    "FileEnding", {file_ending: file_ending for file_ending in FILE_ENDING_DRIVERS_MAP}, type=str
+)
 
 app = typer.Typer()
 
@@ -29,11 +54,195 @@ def download_all(order_id: str, save_path: str):
 
 
 @app.command()
-def extract_all(source_path: str, target_path):
+def extract_all(
+    source_path: str,
+    target_path,
+    single_pass: bool = False,
+    workers: Optional[int] = None,
+    memory_budget_gb: Optional[float] = None,
+    force: bool = False,
+    content_hash: bool = False,
+    resume: bool = False,
+    retries: int = RETRIES,
+    arrow: bool = False,
+    file_ending: FileEnding = FileEnding["fgb"],
+    tile_size: Optional[float] = None,
+    crs: Optional[list[str]] = None,
+    dissolve_tile_size: Optional[float] = None,
+    batch_size: Optional[int] = None,
+    plan: bool = False,
+    trace: bool = False,
+    memory: bool = False,
+    profile: bool = False,
+):
     """Extract geojson from gpkg files.
 
     Args:
         source_path: path to search for files
         target_path: path to save extracted files to
+        single_pass: read each layer once and partition it in memory
+        workers: number of workers, tuned from CPUs and memory by default
+        memory_budget_gb: memory budget of running tasks in GB, a share of available by default
+        force: rebuild all outputs, ignoring the manifest
+        content_hash: fingerprint source files by content instead of size and mtime
+        resume: continue from the journal of an interrupted run
+        retries: max number of retries of a failed task
+        arrow: process lines and points as Arrow tables from read to save
+        file_ending: what file type to save, e.g. fgb, geojson or parquet
+        tile_size: split outputs by a SWEREF 99 TM grid of this size in metres, e.g. 50000
+        crs: CRS to save in, repeat to save in several, e.g. EPSG:4326 and EPSG:3006
+        dissolve_tile_size: dissolve very large partitions in parallel grid tiles of this size
+            in metres, e.g. 20000
+        batch_size: stream lines and points in batches of this many features, e.g. 65536
+        plan: only list tasks with their estimated cost, saving the plan in target path
+        trace: time each stage of each task, saving a Chrome trace in target path
+        memory: measure peak memory of each stage of each task, saving a memory report in
+            target path that later runs admit tasks and tune workers by
+        profile: sample stacks of each task, saving flamegraph folded stacks in target path
     """
-    extract(source_path, target_path)
+    memory_budget = None if memory_budget_gb is None else int(memory_budget_gb * 1024**3)
+    extract(
+        source_path,
+        target_path,
+        single_pass,
+        workers,
+        memory_budget,
+        force,
+        content_hash,
+        resume,
+        retries,
+        arrow,
+        file_ending.value,
+        tile_size,
+        crs,
+        dissolve_tile_size,
+        batch_size,
+        plan,
+        trace,
+        memory,
+        profile,
+    )
+
+    if plan is True:
+        typer.echo(format_plan(load_plan(path.join(target_path, PLAN_FILE))))
+
+    if trace is True:
+        typer.echo(summary(read_trace(path.join(target_path, TRACE_FILE))))
+
+    if memory is True:
+        report = load_memory_report(target_path)
+        typer.echo(format_memory_report(sort_memory_report(list(report.values()))))
+
+    if profile is True:
+        typer.echo(top_frames(read_folded(path.join(target_path, PROFILE_FILE))))
+
+
+@app.command()
+def benchmark(
+    target_path: str,
+    scale: float = 1.0,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    arrow: bool = False,
+    batch_size: Optional[int] = None,
+    baseline: Optional[str] = None,
+    update_baseline: bool = False,
+):
+    """Benchmark extraction on synthetic Topografi 50 data.
+
+    Args:
+        target_path: path to save synthetic source and extracted files to
+        scale: scale of number of features, 1 is 10k ground, 20k road and 20k text features
+        seed: seed of synthetic data
+        workers: number of workers, tuned from CPUs and memory by default
+        arrow: process lines and points as Arrow tables from read to save
+        batch_size: stream lines and points in batches of this many features
+        baseline: baseline file to compare results with, exiting with 1 on regressions,
+            saved if it does not exist
+        update_baseline: save results as baseline instead of comparing
+
+    Raises:
+        BadParameter: if baseline is to be updated without a baseline file, or was run
+            with other options
+        Exit: if throughput or traced peak memory regressed compared with baseline
+    """
+    if update_baseline is True and baseline is None:
+        raise typer.BadParameter("--update-baseline needs a --baseline file to save to.")
+
+    options = {
+        "scale": scale,
+        "seed": seed,
+        "workers": workers,
+        "arrow": arrow,
+        "batch_size": batch_size,
+    }
+    baseline_options: Optional[dict] = None
+    if baseline is not None and update_baseline is False and path.exists(baseline):
+        baseline_options, baseline_results = load_baseline(baseline)
+        differences = option_differences(options, baseline_options)
+        if len(differences) > 0:
+            raise typer.BadParameter(
+                f"Baseline was run with other options: {'; '.join(differences)}."
+            )
+
+    source_path = path.join(target_path, "source")
+    generate_topografi(source_path, scale, seed)
+    results = run_benchmark(
+        source_path,
+        path.join(target_path, "output"),
+        workers,
+        arrow=arrow,
+        batch_size=batch_size,
+    )
+    typer.echo(format_results(results))
+
+    if baseline is None:
+        return
+
+    if baseline_options is None:
+        save_baseline(baseline, results, options)
+        typer.echo(f"Saved baseline to {baseline}.")
+        return
+
+    found = regressions(results, baseline_results)
+    for regression in found:
+        typer.echo(f"Regression: {regression}")
+
+    if len(found) > 0:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def build_border_pyramid(target_path: str):
+    """Build pyramid of generalised administrative borders.
+
+    Args:
+        target_path: path to save pyramid to
+    """
+    # imported here since admin borders require API credentials at import
+    from lantmateriet.admin_borders import AdminBorders
+
+    BorderPyramid.build(Topology.from_admin_borders(AdminBorders()), target_path)
+
+
+@app.command()
+def basemap(
+    source_path: str,
+    archive: str,
+    min_zoom: int = 0,
+    max_zoom: int = 12,
+    workers: Optional[int] = None,
+):
+    """Build PMTiles basemap of vector tiles from extracted files.
+
+    Args:
+        source_path: path of extracted files
+        archive: PMTiles file to save basemap to
+        min_zoom: min zoom level
+        max_zoom: max zoom level
+        workers: number of processes, number of CPUs by default
+    """
+    # imported here since vector tiles require the optional tiles dependencies
+    from lantmateriet.vector_tiles import build_pmtiles
+
+    build_pmtiles(source_path, archive, min_zoom, max_zoom, workers)
@@ -2,21 +2,56 @@
 
 import glob
 import logging
+import os
+from contextlib import ExitStack
+from dataclasses import replace
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Callable, Optional, Union
 
 import fiona
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import shapely
-from ray.util.multiprocessing import Pool
 
 from lantmateriet.config import config_50
-from lantmateriet.geometry import Geometry
+from lantmateriet.geometry import FILE_ENDING_DRIVERS_MAP, Geometry, union_tree
+from lantmateriet.gpkg import (
+    NameStatistics,
+    geometry_type,
+    name_statistics,
+)
+from lantmateriet.journal import Journal
 from lantmateriet.line import Line
+from lantmateriet.manifest import Manifest
+from lantmateriet.memory import (
+    format_memory_report,
+    load_memory_report,
+    measured_memory,
+    memory_per_worker,
+    memory_report,
+    save_memory_report,
+    sort_memory_report,
+)
+from lantmateriet.plan import plan_entries, save_plan
 from lantmateriet.point import Point
 from lantmateriet.polygon import Polygon
-from lantmateriet.utils import normalise_item_names, read_first_entry, read_unique_names
+from lantmateriet.profiler import profile_task, read_folded, save_profile, start_profile, top_frames
+from lantmateriet.scheduler import RETRIES, Task, TaskScheduler, auto_workers
+from lantmateriet.tracing import (
+    TASK_SPAN,
+    read_trace,
+    save_trace,
+    span,
+    start,
+    summary,
+    trace_task,
+)
+from lantmateriet.utils import (
+    normalise_item_names,
+    read_first_entry,
+    read_partitions,
+)
 
 file_geometry_mapping: dict[shapely.Geometry, Union[Line, Polygon, Point]] = {
     shapely.Point: Point,
@@ -26,31 +61,122 @@ file_geometry_mapping: dict[shapely.Geometry, Union[Line, Polygon, Point]] = {
     shapely.Polygon: Polygon,
     shapely.MultiPolygon: Polygon,
 }
+geometry_type_mapping: dict[str, Union[Line, Polygon, Point]] = {
+    "POINT": Point,
+    "MULTIPOINT": Point,
+    "LINESTRING": Line,
+    "MULTILINESTRING": Line,
+    "POLYGON": Polygon,
+    "MULTIPOLYGON": Polygon,
+}
 
-WORKER_INNER = 3
-WORKER_OUTER = 6
+BYTES_PER_FEATURE = 2048
+BYTES_PER_VERTEX = 64
+DISSOLVE_FACTOR = 3
+COST_PER_FEATURE = 1.0
+COST_PER_VERTEX = 0.1
+DISSOLVE_COST_FACTOR = 10
+TILED_DISSOLVE_FEATURES = 100_000
+ALL_NAMES = "*"
 
 logger = logging.getLogger(__name__)
 
 
-def save_sweden_base(target_path: str, processed_geo_objects: Geometry) -> None:
+def estimate_memory(statistics: NameStatistics, dissolve: bool = False) -> int:
+    """Estimate peak memory of processing features.
+
+    Vertices are copied a few times during processing, e.g. when read, exploded and
+    reprojected. Dissolving builds intermediate geometries on top of that.
+
+    Args:
+        statistics: feature and vertex counts
+        dissolve: if features are dissolved
+
+    Returns:
+        estimated memory in bytes
+    """
+    memory = statistics.features * BYTES_PER_FEATURE + statistics.vertices * BYTES_PER_VERTEX
+    return memory * DISSOLVE_FACTOR if dissolve is True else memory
+
+
+def estimate_cost(statistics: NameStatistics, dissolve: bool = False) -> float:
+    """Estimate relative cost of processing features.
+
+    Reading, exploding and writing grow with both features and vertices, and
+    dissolving costs about an order of magnitude more per feature.
+
+    Args:
+        statistics: feature and vertex counts
+        dissolve: if features are dissolved
+
+    Returns:
+        estimated cost
+    """
+    cost = statistics.features * COST_PER_FEATURE + statistics.vertices * COST_PER_VERTEX
+    return cost * DISSOLVE_COST_FACTOR if dissolve is True else cost
+
+
+def sweden_base_path(target_path: str) -> str:
+    """Get path of sweden base.
+
+    Args:
+        target_path: save path of object
+
+    Returns:
+        path of sweden base
+    """
+    return f"{target_path}/mark_sverige/mark/00_sverige" + ".geojson"
+
+
+def save_sweden_base(
+    target_path: str, processed_geo_objects: list[gpd.GeoDataFrame], workers: Optional[int] = None
+) -> None:
     """Save sweden base from all dissolved ground.
 
+    The ground is unioned as a parallel tree over spatially grouped polygons, and the
+    first non-missing attributes are kept, as in a dissolve.
+
     Args:
         target_path: save path of object
         processed_geo_objects: geometry objects
+        workers: number of union threads, number of CPUs by default
     """
-    df_sverige = (
-        pd.concat([item for item in processed_geo_objects]).dissolve().explode(index_parts=False)
+    df_ground = pd.concat([item for item in processed_geo_objects], ignore_index=True)
+    parts = shapely.get_parts(union_tree(np.asarray(df_ground.geometry.values), workers))
+
+    attributes = (
+        df_ground.drop(columns=df_ground.geometry.name).groupby(np.zeros(len(df_ground))).first()
+    )
+    df_sverige = gpd.GeoDataFrame(
+        attributes.iloc[[0] * len(parts)].reset_index(drop=True),
+        geometry=parts,
+        crs=df_ground.crs,
     )
     df_sverige["area_m2"] = df_sverige.area
     df_sverige["length_m"] = df_sverige.length
     df_sverige = df_sverige.to_crs(config_50.epsg_4326)
-    df_sverige.to_file(f"{target_path}/mark_sverige/mark/00_sverige" + ".geojson", driver="GeoJSON")
+    df_sverige.to_file(sweden_base_path(target_path), driver="GeoJSON")
+
+
+def is_ground(geo_object: Geometry) -> bool:
+    """Check if geometry object is part of the sweden base.
+
+    Args:
+        geo_object: geometry object
+
+    Returns:
+        true if ground polygon
+    """
+    return "mark" in geo_object._file_path and isinstance(geo_object, Polygon)
 
 
 def parallel_process(
-    geo_object: Geometry, target_path: str, output_name: str
+    geo_object: Geometry,
+    target_path: str,
+    output_name: str,
+    file_ending: str = "fgb",
+    tile_size: Optional[float] = None,
+    crs: Optional[list[str]] = None,
 ) -> Optional[gpd.GeoDataFrame]:
     """Parallel process.
 
@@ -58,68 +184,545 @@ def parallel_process(
         geo_object: geometry object
         target_path: save path of object
         output_name: name of object to save
+        file_ending: what file type to save
+        tile_size: split output by grid tiles of this size in metres
+        crs: CRSs to save in, EPSG:4326 by default
 
     Returns:
         processed geodataframe
     """
-    if geo_object.df is not None:
-        geo_object.process()
-        geo_object.save(target_path, output_name)
+    geo_object.process()
+    geo_object.save(target_path, output_name, file_ending, tile_size, crs)
 
-        if "mark" in geo_object._file_path:
+    if is_ground(geo_object):
+        with span("ground", len(geo_object.df)):
             return geo_object.df.dissolve().explode(index_parts=False)
 
     return None
 
 
-def extract_geojson(target_path: str, file: str, layer: str) -> None:
-    """Extract and save geojson files.
+def process_layer(
+    file: str,
+    layer: str,
+    field: str,
+    output_names: dict[str, str],
+    target_path: str,
+    file_ending: str = "fgb",
+    tile_size: Optional[float] = None,
+    crs: Optional[list[str]] = None,
+    dissolve_tile_size: Optional[float] = None,
+) -> Optional[gpd.GeoDataFrame]:
+    """Read layer once, partition it by field and process each partition.
+
+    Runs in a worker, so the layer is only read there. Partitions are released as they
+    are processed.
 
     Args:
-        target_path: path to load from
         file: file to load
         layer: layer to load from file
+        field: field to partition layer by
+        output_names: output name by name to process
+        target_path: save path of objects
+        file_ending: what file type to save
+        tile_size: split outputs by grid tiles of this size in metres
+        crs: CRSs to save in, EPSG:4326 by default
+        dissolve_tile_size: dissolve partitions of at least TILED_DISSOLVE_FEATURES
+            features in parallel grid tiles of this size in metres
+
+    Returns:
+        processed ground of layer, None if layer is not ground
+    """
+    with span("read_layer") as read_span:
+        partitions = read_partitions(file, layer, field)
+        read_span.features = sum(len(df) for df in partitions.values())
+
+    geometry_object = get_geometry_object(file, layer)
+    ground = []
+    for name, output_name in output_names.items():
+        df = partitions.pop(name, None)
+        if df is None:
+            continue
+
+        geo_object = geometry_object(file, "50", layer, name, field, df)
+        if geometry_object is Polygon and len(df) >= TILED_DISSOLVE_FEATURES:
+            geo_object.dissolve_tile_size = dissolve_tile_size
+
+        result = parallel_process(geo_object, target_path, output_name, file_ending, tile_size, crs)
+        if result is not None:
+            ground.append(result)
+
+    return pd.concat(ground, ignore_index=True) if len(ground) > 0 else None
+
+
+def instrumented_process(
+    trace_path: Optional[str],
+    memory: bool,
+    profile_path: Optional[str],
+    key: tuple,
+    function: Callable,
+    *args: Any,
+) -> Optional[gpd.GeoDataFrame]:
+    """Process a task, tracing or profiling it.
+
+    Args:
+        trace_path: trace folder to append spans to, not traced if None
+        memory: account peak memory of stages
+        profile_path: profile folder to append sampled stacks to, not profiled if None
+        key: task key
+        function: task function, parallel_process or process_layer
+        *args: arguments of function
+
+    Returns:
+        processed geodataframe
     """
-    logger.info(f"Working on {file} - {layer}")
-    field = "objekttyp"
+    with ExitStack() as stack:
+        if trace_path is not None:
+            stack.enter_context(trace_task(trace_path, key, memory))
+        if profile_path is not None:
+            stack.enter_context(profile_task(profile_path, key))
+
+        return function(*args)
+
 
+def get_field(file: str, layer: str) -> str:
+    """Get field to partition layer by.
+
+    Args:
+        file: file to load
+        layer: layer to load from file
+
+    Returns:
+        field name
+    """
     if "text" in file or "text" in layer:
-        field = "texttyp"
-
-    file_names = read_unique_names(file, layer, field)
-    normalised_names = normalise_item_names(file_names)
-    geometry_type = type(read_first_entry(file, layer).geometry[0])
-    geometry_object = file_geometry_mapping[geometry_type]
-
-    with Pool(WORKER_INNER) as pool:
-        all_geo = [
-            (geometry_object(file, "50", layer, name, field), target_path, output_name)
-            for name, output_name in normalised_names.items()
-            if name not in config_50.exclude
+        return "texttyp"
+
+    return "objekttyp"
+
+
+def get_geometry_object(file: str, layer: str) -> Union[Line, Polygon, Point]:
+    """Get geometry class of layer from its declared geometry type.
+
+    Layers declared with a generic geometry type fall back to the type of their first
+    feature.
+
+    Args:
+        file: GeoPackage to load
+        layer: layer to load from file
+
+    Returns:
+        geometry class
+    """
+    declared_type = geometry_type(file, layer)
+    if declared_type in geometry_type_mapping:
+        return geometry_type_mapping[declared_type]
+
+    return file_geometry_mapping[type(read_first_entry(file, layer).geometry[0])]
+
+
+def plan_layer(
+    target_path: str,
+    file: str,
+    layer: str,
+    single_pass: bool = False,
+    arrow: bool = False,
+    file_ending: str = "fgb",
+    tile_size: Optional[float] = None,
+    crs: Optional[list[str]] = None,
+    dissolve_tile_size: Optional[float] = None,
+    batch_size: Optional[int] = None,
+) -> list[Task]:
+    """Plan extraction tasks of a layer, one per name, or one per layer in single pass.
+
+    Args:
+        target_path: path to save extracted files to
+        file: file to load
+        layer: layer to load from file
+        single_pass: plan one task reading the layer once and partitioning it in memory,
+            instead of one task per name reading its own partition
+        arrow: process names that are not dissolved as Arrow tables
+        file_ending: what file type to save
+        tile_size: split outputs by grid tiles of this size in metres
+        crs: CRSs to save in, EPSG:4326 by default
+        dissolve_tile_size: dissolve partitions of at least TILED_DISSOLVE_FEATURES
+            features in parallel grid tiles of this size in metres
+        batch_size: stream names that are not dissolved in batches of this many features,
+            so their estimated memory is that of one batch, unless saved as parquet or
+            tiles, which are processed whole
+
+    Returns:
+        extraction tasks with estimated cost and memory
+    """
+    field = get_field(file, layer)
+    statistics = name_statistics(file, layer, field)
+    output_names = {
+        name: output_name
+        for name, output_name in normalise_item_names(list(statistics.keys())).items()
+        if name not in config_50.exclude
+    }
+    if len(output_names) == 0:
+        return []
+
+    geometry_object = get_geometry_object(file, layer)
+    dissolve = geometry_object is Polygon
+
+    if single_pass is True:
+        layer_statistics = NameStatistics(
+            sum(statistics[name].features for name in output_names),
+            sum(statistics[name].vertices for name in output_names),
+        )
+        return [
+            Task(
+                (file, layer, ALL_NAMES),
+                (
+                    file,
+                    layer,
+                    field,
+                    output_names,
+                    target_path,
+                    file_ending,
+                    tile_size,
+                    crs,
+                    dissolve_tile_size,
+                ),
+                sum(estimate_cost(statistics[name], dissolve) for name in output_names),
+                estimate_memory(layer_statistics)
+                + max(estimate_memory(statistics[name], dissolve) for name in output_names),
+                {"features": layer_statistics.features, "vertices": layer_statistics.vertices},
+            )
         ]
-        processed_geo_objects = pool.starmap(parallel_process, all_geo)
 
-    if "mark" in file:
-        save_sweden_base(target_path, processed_geo_objects)
+    tasks = []
+    for name, output_name in output_names.items():
+        geo_object = geometry_object(file, "50", layer, name, field, None, arrow)
+        memory = estimate_memory(statistics[name], dissolve)
+        if dissolve is True and statistics[name].features >= TILED_DISSOLVE_FEATURES:
+            geo_object.dissolve_tile_size = dissolve_tile_size
+
+        if dissolve is False and batch_size is not None:
+            geo_object.batch_size = batch_size
+            if file_ending != "parquet" and tile_size is None:
+                memory = int(memory * min(1.0, batch_size / max(1, statistics[name].features)))
+
+        tasks.append(
+            Task(
+                (file, layer, name),
+                (geo_object, target_path, output_name, file_ending, tile_size, crs),
+                estimate_cost(statistics[name], dissolve),
+                memory,
+                {"features": statistics[name].features, "vertices": statistics[name].vertices},
+            )
+        )
+
+    return tasks
+
+
+def task_objects(task: Task) -> list[tuple[Geometry, str]]:
+    """Get geometry objects, without their data, and output names of an extraction task.
+
+    Args:
+        task: extraction task, of one name or of a whole layer
 
-    logger.info(f"Saved {file} - {layer}")
+    Returns:
+        geometry objects and output names
+    """
+    if task.key[2] != ALL_NAMES:
+        geo_object, _, output_name = task.args[:3]
+        return [(geo_object, output_name)]
+
+    file, layer, field, output_names = task.args[:4]
+    geometry_object = get_geometry_object(file, layer)
+    return [
+        (geometry_object(file, "50", layer, name, field), output_name)
+        for name, output_name in output_names.items()
+    ]
+
+
+def task_outputs(task: Task) -> tuple[list[str], object]:
+    """Get output paths, one per CRS and name, and config of an extraction task.
+
+    Args:
+        task: extraction task
+
+    Returns:
+        output paths and config
+    """
+    if task.key[2] == ALL_NAMES:
+        target_path, file_ending, tile_size, crs = task.args[4:8]
+    else:
+        _, target_path, _, file_ending, tile_size, crs = task.args
+
+    objects = task_objects(task)
+    outputs = [
+        geo_object.output_path(target_path, output_name, file_ending, tile_size is not None, target)
+        for geo_object, output_name in objects
+        for target in ([geo_object.config.epsg_4326] if crs is None else crs)
+    ]
+    return outputs, objects[0][0].config
+
+
+def is_ground_task(task: Task) -> bool:
+    """Check if extraction task processes ground of the sweden base.
+
+    Args:
+        task: extraction task
+
+    Returns:
+        true if any geometry object of task is ground
+    """
+    return any(is_ground(geo_object) for geo_object, _ in task_objects(task))
 
 
-def extract(source_path: str, target_path: str) -> None:
+def stale_tasks(target_path: str, tasks: list[Task], manifest: Manifest) -> list[Task]:
+    """Select tasks with outputs that are missing or built from other inputs.
+
+    The sweden base depends on all ground partitions of a file, so if it or any of them
+    is stale, all ground partitions of the file are processed again.
+
+    Args:
+        target_path: path to save extracted files to
+        tasks: extraction tasks
+        manifest: extraction manifest
+
+    Returns:
+        stale tasks
+    """
+    stale = set()
+    for task in tasks:
+        file, layer, name = task.key
+        outputs, config = task_outputs(task)
+        entry = manifest.entry(file, layer, name, config)
+        if not all(manifest.is_current(output, entry) for output in outputs):
+            stale.add(task.key)
+
+    ground_files = {task.key[0] for task in tasks if is_ground_task(task)}
+    stale_ground_files = {
+        file
+        for file in ground_files
+        if any(key[0] == file for key in stale)
+        or not manifest.is_current(
+            sweden_base_path(target_path),
+            manifest.entry(file, "mark", config_50.ground_sweden, config_50),
+        )
+    }
+
+    return [
+        task
+        for task in tasks
+        if task.key in stale or (task.key[0] in stale_ground_files and is_ground_task(task))
+    ]
+
+
+def extract(
+    source_path: str,
+    target_path: str,
+    single_pass: bool = False,
+    workers: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    force: bool = False,
+    content_hash: bool = False,
+    resume: bool = False,
+    retries: int = RETRIES,
+    arrow: bool = False,
+    file_ending: str = "fgb",
+    tile_size: Optional[float] = None,
+    crs: Optional[list[str]] = None,
+    dissolve_tile_size: Optional[float] = None,
+    batch_size: Optional[int] = None,
+    plan: bool = False,
+    trace: bool = False,
+    memory: bool = False,
+    profile: bool = False,
+) -> None:
     """Run extraction of gkpg to geojson.
 
+    All (file, layer, name) tasks run on one scheduler, highest estimated cost first,
+    admitted while their estimated memory fits in the memory budget. The plan of all
+    tasks is saved in the target path, and with `plan` only the plan is made. Tasks
+    measured in the memory report of a previous run are admitted by their measured
+    memory when it is larger, and the number of workers is tuned from the highest
+    measured peak. A manifest in the target path records the inputs and the options
+    changing outputs of each output, so only outputs with changed inputs or options are
+    rebuilt.
+
+    Finished tasks are recorded in a journal as they complete. Failed tasks are retried
+    with lower concurrency, and a run stopped by failures or interrupted can continue
+    from the journal with `resume`.
+
     Args:
         source_path: path to search for files
         target_path: path to save extracted files to
+        single_pass: read each layer once and partition it in memory, in one task per
+            layer
+        workers: number of workers, tuned from CPUs and memory by default
+        memory_budget: memory budget in bytes, a share of available memory by default
+        force: rebuild all outputs, ignoring the manifest
+        content_hash: fingerprint source files by content instead of size and mtime
+        resume: skip tasks completed in the journal of a previous run
+        retries: max number of retries of a failed task
+        arrow: process lines and points as Arrow tables from read to save, not combined
+            with single pass
+        file_ending: what file type to save, e.g. fgb or parquet
+        tile_size: split outputs by a SWEREF 99 TM grid of this size in metres, with a
+            tile index per output
+        crs: CRSs to save in, reprojected in one pass, e.g. EPSG:4326 and EPSG:3006,
+            EPSG:4326 by default
+        dissolve_tile_size: dissolve very large partitions in parallel grid tiles of this
+            size in metres, e.g. 20000
+        batch_size: read, process and save lines and points in batches of this many
+            features with flat memory use, e.g. 65536, not combined with single pass
+        plan: only plan tasks and save the plan, without extracting
+        trace: record wall time, CPU time, features and bytes of each stage of each
+            task, saved as a Chrome trace in the target path
+        memory: also record peak RSS and traced memory of each stage of each task,
+            updating the memory report in the target path
+        profile: sample stacks of each task, saved as folded stacks tagged by file, layer
+            and name in the target path, e.g. for flamegraphs
+
+    Raises:
+        ValueError: if file ending is not supported
+        RuntimeError: if extraction tasks failed after all retries
     """
+    if file_ending not in FILE_ENDING_DRIVERS_MAP:
+        raise ValueError(
+            f"Unsupported file ending {file_ending}, use one of {', '.join(FILE_ENDING_DRIVERS_MAP)}."
+        )
+
     file_pattern = str(Path(source_path) / "*.gpkg")
     files = glob.glob(file_pattern)
+    manifest = Manifest(
+        target_path,
+        content_hash,
+        {
+            "arrow": arrow,
+            "file_ending": file_ending,
+            "tile_size": tile_size,
+            "dissolve_tile_size": dissolve_tile_size,
+            "batch_size": batch_size,
+        },
+    )
+    measured = load_memory_report(target_path)
+    trace_path = start(target_path, memory) if trace is True or memory is True else None
+    profile_path = start_profile(target_path) if profile is True else None
 
-    all_files = []
+    tasks = []
     for file in files:
         available_layers = fiona.listlayers(file)
         for layer in available_layers:
-            all_files.append((target_path, file, layer))
+            logger.info(f"Planning {file} - {layer}")
+            with span("plan") as plan_span:
+                layer_tasks = plan_layer(
+                    target_path,
+                    file,
+                    layer,
+                    single_pass,
+                    arrow,
+                    file_ending,
+                    tile_size,
+                    crs,
+                    dissolve_tile_size,
+                    batch_size,
+                )
+                plan_span.features = len(layer_tasks)
+            tasks.extend(layer_tasks)
+
+    estimates = {task.key: task.memory for task in tasks}
+    for task in tasks:
+        if task.key in measured:
+            task.memory = measured_memory(measured[task.key])
+
+    stale = {task.key for task in tasks}
+    if force is False:
+        stale = {task.key for task in stale_tasks(target_path, tasks, manifest)}
+        logger.info(f"Skipping {len(tasks) - len(stale)} of {len(tasks)} unchanged tasks.")
+
+    os.makedirs(target_path, exist_ok=True)
+    plan_file = save_plan(target_path, plan_entries(tasks, stale))
+    logger.info(f"Saved plan of {len(tasks)} tasks to {plan_file}")
+    if plan is True:
+        if trace_path is not None:
+            save_trace(target_path, trace_path)
+        if profile_path is not None:
+            save_profile(target_path, profile_path)
+        return
+
+    tasks = [task for task in tasks if task.key in stale]
+    journal = Journal(target_path, resume)
+
+    entries = {task.key: manifest.entry(*task.key, task_outputs(task)[1]) for task in tasks}
+    resumed = [task for task in tasks if journal.is_done(task.key, entries[task.key])]
+    remaining = [task for task in tasks if not journal.is_done(task.key, entries[task.key])]
+
+    if workers is None and (worker_memory := memory_per_worker(measured)) is not None:
+        workers = auto_workers(worker_memory)
+        logger.info(f"Tuned to {workers} workers from memory report.")
+
+    scheduler = TaskScheduler(workers, memory_budget=memory_budget, retries=retries)
+    function: Callable = process_layer if single_pass is True else parallel_process
+    if trace_path is not None or profile_path is not None:
+        remaining = [
+            replace(task, args=(trace_path, memory, profile_path, task.key, function, *task.args))
+            for task in remaining
+        ]
+        function = instrumented_process
+
+    results = scheduler.run(
+        function,
+        remaining,
+        on_done=lambda task, result: journal.done(task.key, entries[task.key], result),
+    )
+    results |= {task.key: journal.result(task.key) for task in resumed}
+
+    for key, error in scheduler.failures.items():
+        journal.failed(key, error)
+
+    ground: dict[str, list[gpd.GeoDataFrame]] = {}
+    for task in tasks:
+        if task.key not in results:
+            continue
+
+        for output in task_outputs(task)[0]:
+            manifest.update(output, entries[task.key])
+        if results[task.key] is not None:
+            ground.setdefault(task.key[0], []).append(results[task.key])
+
+    failed_ground_files = {
+        task.key[0] for task in tasks if task.key in scheduler.failures and is_ground_task(task)
+    }
+    for file, processed_geo_objects in ground.items():
+        if file in failed_ground_files:
+            logger.error(f"Not saving sweden base from {file}, ground tasks failed.")
+            continue
+
+        with span("sweden_base", len(processed_geo_objects)):
+            save_sweden_base(target_path, processed_geo_objects, workers)
+        manifest.update(
+            sweden_base_path(target_path),
+            manifest.entry(file, "mark", config_50.ground_sweden, config_50),
+        )
+        logger.info(f"Saved sweden base from {file}")
+
+    manifest.save()
+
+    if profile_path is not None:
+        profile_file = save_profile(target_path, profile_path)
+        logger.info(f"Saved profile to {profile_file}\n{top_frames(read_folded(profile_file))}")
+
+    if trace_path is not None:
+        trace_file = save_trace(target_path, trace_path)
+        trace_spans = read_trace(trace_file)
+        logger.info(f"Saved trace to {trace_file}\n{summary(trace_spans)}")
+
+    if trace_path is not None and memory is True:
+        report = memory_report(trace_spans, TASK_SPAN, estimates)
+        measured |= {tuple(task.key): task for task in report}
+        report_file = save_memory_report(target_path, sort_memory_report(list(measured.values())))
+        logger.info(f"Saved memory report to {report_file}\n{format_memory_report(report)}")
+
+    if len(scheduler.failures) > 0:
+        journal.close()
+        raise RuntimeError(
+            f"{len(scheduler.failures)} extraction tasks failed, resume to retry them."
+        )
 
-    with Pool(WORKER_OUTER) as pool:
-        pool.starmap(extract_geojson, all_files)
+    journal.clear()
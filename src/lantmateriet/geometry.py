@@ -1,19 +1,83 @@
 """Geometry module."""
 
+import math
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from os import path
-from typing import Union
+from typing import Any, Iterator, Optional, Union
 
 import geopandas as gpd
+import numpy as np
+import shapely
 from shapely.ops import polygonize
 
 from lantmateriet import config
-from lantmateriet.utils import timeit
+from lantmateriet.arrow import GeoTable
+from lantmateriet.geoparquet import hilbert_distance, write_geoparquet
+from lantmateriet.gpkg import BYTES_PER_COORDINATE
+from lantmateriet.reproject import crs_suffix, reproject
+from lantmateriet.tiling import INDEX_FILE, group_by_tile, tile_bounds, tile_name, write_index
+from lantmateriet.tracing import Span, is_enabled, span
+from lantmateriet.utils import available_cpus
 
 TOUCHING_MAX_DIST = 1e-5
 BUFFER_DIST = 1e-8
-FILE_ENDING_DRIVERS_MAP = {"geojson": "GeoJson", "fgb": "FlatGeobuf"}
+FILE_ENDING_DRIVERS_MAP = {"geojson": "GeoJSON", "fgb": "FlatGeobuf", "parquet": "Parquet"}
+LEAVES_PER_WORKER = 4
+UNION_FAN_IN = 4
+
+
+def union_tree(
+    geometries: np.ndarray, workers: Optional[int] = None, fan_in: int = UNION_FAN_IN
+) -> shapely.Geometry:
+    """Union geometries as a parallel tree of unions.
+
+    Geometries are ordered along a Hilbert curve and split into spatially compact
+    groups, which are unioned in parallel threads, GEOS releases the GIL. Results are
+    then merged level by level, each level unioning the seams of neighbouring groups.
+
+    Args:
+        geometries: shapely geometry array
+        workers: number of threads, number of CPUs by default
+        fan_in: number of unions merged per union at upper levels
+
+    Returns:
+        union of geometries
+    """
+    if len(geometries) == 0:
+        return shapely.GeometryCollection()
+
+    workers = workers or available_cpus()
+    geometries = geometries[np.argsort(hilbert_distance(geometries), kind="stable")]
+    group_size = max(fan_in, math.ceil(len(geometries) / (workers * LEAVES_PER_WORKER)))
+
+    with ThreadPoolExecutor(workers) as executor:
+        while len(geometries) > 1:
+            groups = [
+                geometries[start : start + group_size]
+                for start in range(0, len(geometries), group_size)
+            ]
+            geometries = np.array(list(executor.map(shapely.union_all, groups)), dtype=object)
+            group_size = fan_in
+
+    return geometries[0]
+
+
+def measure(current: Span, data: Union[gpd.GeoDataFrame, GeoTable]) -> None:
+    """Set feature count and geometry size of data on span, if tracing is enabled.
+
+    Args:
+        current: span of stage
+        data: geopandas GeoDataFrame or geo table
+    """
+    if not is_enabled():
+        return
+
+    geometries = data.geometries if isinstance(data, GeoTable) else data.geometry.values
+    current.features = len(data)
+    current.nbytes = int(shapely.get_num_coordinates(geometries).sum()) * BYTES_PER_COORDINATE
 
 
 class DissolveTouchingGeometry:
@@ -21,15 +85,26 @@ class DissolveTouchingGeometry:
 
     Args:
         df: GeoPandas dataframe
+        tile_size: dissolve in grid tiles of this size in metres, in parallel
+        workers: number of threads of a tiled dissolve, number of CPUs by default
     """
 
-    def __init__(self, df: gpd.GeoDataFrame):
+    def __init__(
+        self,
+        df: gpd.GeoDataFrame,
+        tile_size: Optional[float] = None,
+        workers: Optional[int] = None,
+    ):
         """Initialise object.
 
         Args:
             df: dataframe
+            tile_size: dissolve in grid tiles of this size in metres, in parallel
+            workers: number of threads of a tiled dissolve, number of CPUs by default
         """
         self.df = df
+        self._tile_size = tile_size
+        self._workers = workers or available_cpus()
 
     def _get_spatial_index(self):
         """Get spatial index of GeoPandas dataframe.
@@ -159,26 +234,176 @@ class DissolveTouchingGeometry:
 
         return keep_indices, drop_indices
 
+    @staticmethod
+    def _label_components(
+        size: int, input_geometry_index: np.ndarray, touching_geometry_index: np.ndarray
+    ) -> np.ndarray:
+        """Label connected components of touching geometries.
+
+        Labels are propagated along touching pairs with pointer jumping, until each
+        geometry is labelled by the smallest index of its component.
+
+        Args:
+            size: number of geometries
+            input_geometry_index: index of input geometry
+            touching_geometry_index: index of touching geometry
+
+        Returns:
+            component label of each geometry
+        """
+        labels = np.arange(size)
+        while True:
+            minimum = np.minimum(labels[input_geometry_index], labels[touching_geometry_index])
+            updated = labels.copy()
+            np.minimum.at(updated, input_geometry_index, minimum)
+            np.minimum.at(updated, touching_geometry_index, minimum)
+            updated = updated[updated]
+
+            if np.array_equal(updated, labels):
+                return labels
+
+            labels = updated
+
+    @staticmethod
+    def _get_primary_indices(labels: np.ndarray, connected: np.ndarray) -> np.ndarray:
+        """Get index of geometry keeping the attributes of each connected component.
+
+        Picks the same geometry as _remove_duplicate_geometries: the last geometry of
+        each component, except for the first component, which keeps its first geometry
+        unless it has geometries after the start of the second component.
+
+        Args:
+            labels: component label of each geometry
+            connected: indices of geometries touching another geometry, sorted
+
+        Returns:
+            primary index of each component, sorted
+        """
+        connected_labels = labels[connected]
+        unique_labels, last = np.unique(connected_labels[::-1], return_index=True)
+        primary = connected[len(connected) - 1 - last]
+
+        first = connected_labels[0]
+        others = connected[connected_labels != first]
+        if len(others) == 0 or primary[unique_labels == first][0] < others[0]:
+            primary[unique_labels == first] = connected[0]
+
+        return np.sort(primary)
+
+    def _union_components(
+        self, labels: np.ndarray, connected: np.ndarray, tile_size: float
+    ) -> dict[int, Any]:
+        """Union connected components by grid tile in parallel, then stitch tile seams.
+
+        Args:
+            labels: component label of each geometry
+            connected: indices of geometries touching another geometry
+            tile_size: tile size in metres
+
+        Returns:
+            union of each component by label
+        """
+        geometries = np.asarray(self.df.geometry.values)
+        tiles = group_by_tile(geometries[connected], tile_size)
+
+        def _union_tile(indices: np.ndarray) -> list[tuple[int, Any]]:
+            tile_indices = connected[indices]
+            tile_labels = labels[tile_indices]
+            order = np.argsort(tile_labels, kind="stable")
+            unique_labels, starts = np.unique(tile_labels[order], return_index=True)
+            groups = np.split(tile_indices[order], starts[1:])
+            return [
+                (int(label), shapely.union_all(geometries[group]))
+                for label, group in zip(unique_labels, groups, strict=True)
+            ]
+
+        parts: dict[int, list] = {}
+        with ThreadPoolExecutor(self._workers) as executor:
+            for tile_unions in executor.map(_union_tile, tiles.values()):
+                for label, union in tile_unions:
+                    parts.setdefault(label, []).append(union)
+
+            seams = {label: items for label, items in parts.items() if len(items) > 1}
+            small = [label for label, items in seams.items() if len(items) <= UNION_FAN_IN]
+            unions = {label: items[0] for label, items in parts.items() if len(items) == 1}
+            merged = executor.map(shapely.union_all, [seams[label] for label in small])
+            unions |= dict(zip(small, merged, strict=True))
+
+        for label, items in seams.items():
+            if label not in unions:
+                unions[label] = union_tree(np.array(items, dtype=object), self._workers)
+
+        return unions
+
+    def _dissolve_and_explode_tiled(self, tile_size: float) -> gpd.GeoDataFrame:
+        """Dissolve and explode touching geometries, split by a grid of tiles.
+
+        Touching geometries are found for the whole dataframe, as in the untiled dissolve,
+        but connected as vectorised components, and the components are unioned per tile in
+        parallel. Only components crossing tile borders are stitched afterwards.
+
+        Args:
+            tile_size: tile size in metres
+
+        Returns:
+            GeoPandas dataframe with dissolved, touching geometries, and exploded geometry objects
+        """
+        with span("touching", len(self.df)):
+            spatial_index = self._get_spatial_index()
+            input_geometry_index, touching_geometry_index = spatial_index.nearest(
+                self.df["geometry"], exclusive=True, max_distance=TOUCHING_MAX_DIST
+            )
+
+        if len(input_geometry_index) == 0:
+            return self.df
+
+        with span("components", len(self.df)):
+            labels = self._label_components(
+                len(self.df), input_geometry_index, touching_geometry_index
+            )
+            connected = np.flatnonzero(np.bincount(labels, minlength=len(self.df))[labels] > 1)
+            primary = self._get_primary_indices(labels, connected)
+
+        with span("union", len(connected)):
+            unions = self._union_components(labels, connected, tile_size)
+
+        keep = np.isin(np.arange(len(self.df)), connected, invert=True)
+        keep[primary] = True
+
+        df = self.df.iloc[np.flatnonzero(keep)].copy()
+        geometry_column = df.columns.get_loc(df.geometry.name)
+        df.iloc[np.searchsorted(np.flatnonzero(keep), primary), geometry_column] = gpd.GeoSeries(
+            [unions[labels[index]] for index in primary], crs=self.df.crs
+        ).values
+
+        return df.explode(ignore_index=True)
+
     def dissolve_and_explode(self) -> gpd.GeoDataFrame:
         """Dissolve and explode touching geometries.
 
         Returns:
             GeoPandas dataframe with dissolved, touching geometries, and exploded geometry objects
         """
-        touching_geometries = self._get_touching_geometries()
+        if self._tile_size is not None:
+            return self._dissolve_and_explode_tiled(self._tile_size)
+
+        with span("touching", len(self.df)):
+            touching_geometries = self._get_touching_geometries()
 
         if len(touching_geometries) == 0:
             return self.df
 
         keep_indices, drop_indices = self._get_df_indices(touching_geometries)
 
-        dissolved_geometry = [
-            self.df.iloc[list(tgi)].dissolve().geometry[0] for _, tgi in touching_geometries.items()
-        ]
+        with span("union", len(self.df)):
+            dissolved_geometry = [
+                self.df.iloc[list(tgi)].dissolve().geometry[0]
+                for _, tgi in touching_geometries.items()
+            ]
 
         dissolved_df = gpd.GeoDataFrame(
             {"geometry": dissolved_geometry},
-            index=[index for index in keep_indices],
+            index=self.df.iloc[list(touching_geometries.keys())].index,
         )
 
         self.df.loc[keep_indices, "geometry"] = dissolved_df.loc[keep_indices, "geometry"]
@@ -213,7 +438,18 @@ class DissolveTouchingGeometry:
 class Geometry:
     """Geometry class."""
 
-    def __init__(self, file_path: str, detail_level: str, layer: str, name: str, field: str):
+    def __init__(
+        self,
+        file_path: str,
+        detail_level: str,
+        layer: str,
+        name: str,
+        field: str,
+        df: Optional[gpd.GeoDataFrame] = None,
+        arrow: bool = False,
+        dissolve_tile_size: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ):
         """Initialise Geometry object.
 
         Args:
@@ -222,6 +458,14 @@ class Geometry:
             layer: layer to load
             name: name of data
             field: geopandas field
+            df: already read data of name, e.g. a partition of a single-pass layer read,
+                otherwise data is read on first use
+            arrow: process data as Arrow table from read to save, unless dissolved or
+                already read
+            dissolve_tile_size: dissolve in parallel grid tiles of this size in metres,
+                e.g. for very large partitions
+            batch_size: process and save data in batches of this many features with flat
+                memory use, unless dissolved or already read
         """
         if detail_level == "10":
             self.config: Union[config.Config1M, config.Config50, config.Config10] = config.config_10
@@ -237,13 +481,62 @@ class Geometry:
         self._name = name
         self._field = field
 
-        self.df = gpd.read_file(
-            file_path,
-            layer=layer,
-            where=f"{field}='{name}'",
-            engine="pyogrio",
-            use_arrow=True,
-        )
+        self._df = df
+        self._arrow = arrow
+        self.dissolve_tile_size = dissolve_tile_size
+        self.batch_size = batch_size
+        self._batched: Optional[tuple[bool, bool]] = None
+        self.table: Optional[GeoTable] = None
+
+    @property
+    def df(self) -> gpd.GeoDataFrame:
+        """Get data of name, read on first use.
+
+        Reading is deferred so it runs where the object is processed, e.g. in a worker,
+        and only file, layer and filter are serialised to get there.
+
+        Returns:
+            geopandas GeoDataFrame
+        """
+        if self._df is None:
+            self._df = self._read()
+
+        return self._df
+
+    @df.setter
+    def df(self, df: gpd.GeoDataFrame) -> None:
+        """Set data of name.
+
+        Args:
+            df: geopandas GeoDataFrame
+        """
+        self._df = df
+
+    def _read(self) -> gpd.GeoDataFrame:
+        """Read data of name from file.
+
+        Returns:
+            geopandas GeoDataFrame
+        """
+        with span("read") as read:
+            df = gpd.read_file(
+                self._file_path,
+                layer=self._layer,
+                where=self._where(),
+                engine="pyogrio",
+                use_arrow=True,
+            )
+            measure(read, df)
+
+        return df
+
+    def _where(self) -> str:
+        """Get SQL filter of name.
+
+        Returns:
+            SQL filter
+        """
+        return f"{self._field}='{self._name}'"
 
     @staticmethod
     def _set_area(df: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
@@ -271,21 +564,22 @@ class Geometry:
         df["length_m"] = df.length
         return df
 
-    @timeit(True)
     @staticmethod
-    def _dissolve(df: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    def _dissolve(df: gpd.GeoDataFrame, tile_size: Optional[float] = None) -> gpd.GeoDataFrame:
         """Dissolve geometry.
 
         Args:
             object_name: object name
             df: geopandas GeoDataFrame
+            tile_size: dissolve in parallel grid tiles of this size in metres
 
         Returns:
             dissolved geopandas GeoDataFrame
         """
-        return DissolveTouchingGeometry(df).dissolve_and_explode()
+        with span("dissolve") as dissolve:
+            measure(dissolve, df)
+            return DissolveTouchingGeometry(df, tile_size).dissolve_and_explode()
 
-    @timeit(True)
     @staticmethod
     def _dissolve_exterior(df: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
         """Dissolve exterior geometry.
@@ -297,7 +591,9 @@ class Geometry:
         Returns:
             dissolved geopandas GeoDataFrame
         """
-        return DissolveTouchingGeometry(df).dissolve_and_explode_exterior()
+        with span("dissolve_exterior") as dissolve:
+            measure(dissolve, df)
+            return DissolveTouchingGeometry(df).dissolve_and_explode_exterior()
 
     def _process(
         self,
@@ -312,33 +608,301 @@ class Geometry:
             set_area: set area column
             set_length: set length column
         """
+        if self.batch_size is not None and dissolve is False and self._df is None:
+            self._batched = (set_area, set_length)
+            return
+
+        if self._arrow is True and dissolve is False and self._df is None:
+            self.table = self._process_table(set_area, set_length)
+            return
+
         if dissolve is True:
             if self._name in self.config.exteriorise:
                 self.df = Geometry._dissolve_exterior(self.df)
             else:
-                self.df = Geometry._dissolve(self.df)
+                self.df = Geometry._dissolve(self.df, self.dissolve_tile_size)
         else:
-            self.df = self.df.explode(ignore_index=True)
+            with span("explode") as explode:
+                self.df = self.df.explode(ignore_index=True)
+                measure(explode, self.df)
 
         if set_area is True:
-            self.df = Geometry._set_area(self.df)
+            with span("area", len(self.df)):
+                self.df = Geometry._set_area(self.df)
 
         if set_length is True:
-            self.df = Geometry._set_length(self.df)
+            with span("length", len(self.df)):
+                self.df = Geometry._set_length(self.df)
 
-    def _save(self, save_path: str, file: str, file_ending: str = "fgb") -> None:
-        """Save processed geometry items in EPSG:4326.
+    def _process_table(self, set_area: bool = True, set_length: bool = True) -> GeoTable:
+        """Process data items as Arrow table.
+
+        Args:
+            set_area: set area column
+            set_length: set length column
+
+        Returns:
+            processed geo table
+        """
+        with span("read") as read:
+            table = GeoTable.read(self._file_path, self._layer, self._where())
+            measure(read, table)
+
+        return self._process_batch(table, set_area, set_length)
+
+    @staticmethod
+    def _process_batch(table: GeoTable, set_area: bool = True, set_length: bool = True) -> GeoTable:
+        """Process data items of a geo table.
+
+        Args:
+            table: geo table
+            set_area: set area column
+            set_length: set length column
+
+        Returns:
+            processed geo table
+        """
+        with span("explode") as explode:
+            table = table.explode()
+            measure(explode, table)
+
+        if set_area is True:
+            with span("area", len(table)):
+                table = table.set_column("area_m2", shapely.area(table.geometries))
+
+        if set_length is True:
+            with span("length", len(table)):
+                table = table.set_column("length_m", shapely.length(table.geometries))
+
+        return table
+
+    def _process_batches(
+        self, batch_size: int, set_area: bool = True, set_length: bool = True
+    ) -> Iterator[GeoTable]:
+        """Read and process data items batch by batch.
+
+        Args:
+            batch_size: max number of features per batch
+            set_area: set area column
+            set_length: set length column
+
+        Yields:
+            processed geo table of each batch
+        """
+        for table in GeoTable.read_batches(self._file_path, self._layer, self._where(), batch_size):
+            yield self._process_batch(table, set_area, set_length)
+
+    def output_path(
+        self,
+        save_path: str,
+        file: str,
+        file_ending: str = "fgb",
+        tiled: bool = False,
+        crs: Optional[str] = None,
+    ) -> str:
+        """Get path of saved file.
 
         Args:
             save_path: path to save files in
             file: name of saved file
             file_ending: what file type to save
+            tiled: get path of tile index of a tiled output
+            crs: CRS of saved file, files in other CRSs than EPSG:4326 get a CRS suffix
+
+        Returns:
+            path of saved file
         """
-        file_ending_driver = FILE_ENDING_DRIVERS_MAP[file_ending]
         folder_path = path.join(
             save_path, self._file_path.split("/")[-1].split(".")[0], self._layer
         )
-        os.makedirs(folder_path, exist_ok=True)
+        if crs is not None and crs != self.config.epsg_4326:
+            file = file + crs_suffix(crs)
+
+        if tiled is True:
+            return path.join(folder_path, file, INDEX_FILE)
+
+        return path.join(folder_path, file) + f".{file_ending}"
+
+    @staticmethod
+    def _reproject(
+        data: Union[gpd.GeoDataFrame, GeoTable], crs: list[str]
+    ) -> dict[str, Union[gpd.GeoDataFrame, GeoTable]]:
+        """Reproject data to several CRSs in one pass, without copying attributes.
+
+        Args:
+            data: geopandas GeoDataFrame or geo table
+            crs: CRSs to reproject to
+
+        Returns:
+            reprojected data by CRS
+        """
+        with span("reproject") as reprojection:
+            measure(reprojection, data)
+            if isinstance(data, GeoTable):
+                return dict(data.to_crs_many(crs))
+
+            projected = reproject(
+                np.asarray(data.geometry.values),
+                None if data.crs is None else data.crs.to_string(),
+                crs,
+            )
+
+        reprojected = {}
+        for target, geometries in projected.items():
+            df = data.copy(deep=False)
+            df[data.geometry.name] = gpd.GeoSeries(geometries, index=data.index, crs=target)
+            reprojected[target] = df
+
+        return reprojected
+
+    @staticmethod
+    def _write(data: Union[gpd.GeoDataFrame, GeoTable], output_path: str, file_ending: str) -> None:
+        """Write data in its CRS.
+
+        Args:
+            data: geopandas GeoDataFrame or geo table
+            output_path: path of file
+            file_ending: what file type to save
+        """
+        file_ending_driver = FILE_ENDING_DRIVERS_MAP[file_ending]
+
+        with span("write", len(data)) as write:
+            if file_ending_driver == FILE_ENDING_DRIVERS_MAP["parquet"]:
+                table = data if isinstance(data, GeoTable) else GeoTable.from_geodataframe(data)
+                write_geoparquet(table.table, table.geometries, table.crs, output_path)
+            elif isinstance(data, GeoTable):
+                data.write(output_path, file_ending_driver)
+            else:
+                data.to_file(output_path, driver=file_ending_driver)
+
+            if is_enabled():
+                write.nbytes = path.getsize(output_path)
+
+    def _save_tiles(
+        self,
+        data: Union[gpd.GeoDataFrame, GeoTable],
+        save_path: str,
+        file: str,
+        file_ending: str,
+        tile_size: float,
+        crs: list[str],
+    ) -> None:
+        """Save data split by grid tiles, with a tile index per CRS.
+
+        Args:
+            data: geopandas GeoDataFrame or geo table
+            save_path: path to save files in
+            file: name of saved file
+            file_ending: what file type to save
+            tile_size: tile size in metres
+            crs: CRSs to save in
+        """
+        geometries = (
+            data.geometries if isinstance(data, GeoTable) else np.asarray(data.geometry.values)
+        )
+        tiles = group_by_tile(geometries, tile_size)
+
+        for target, projected in self._reproject(data, crs).items():
+            folder_path = path.dirname(self.output_path(save_path, file, file_ending, True, target))
+            shutil.rmtree(folder_path, ignore_errors=True)
+            os.makedirs(folder_path)
+
+            entries = []
+            for tile, indices in tiles.items():
+                tile_file = f"{tile_name(tile)}.{file_ending}"
+                tile_data = (
+                    projected.take(indices)
+                    if isinstance(projected, GeoTable)
+                    else projected.iloc[indices]
+                )
+                self._write(tile_data, path.join(folder_path, tile_file), file_ending)
+
+                entries.append(
+                    {
+                        "tile": list(tile),
+                        "file": tile_file,
+                        "bounds": tile_bounds(tile, tile_size),
+                        "extent": shapely.total_bounds(geometries[indices]).tolist(),
+                        "features": len(indices),
+                    }
+                )
+
+            write_index(folder_path, entries, tile_size, file_ending, target)
+
+    def _save_batches(
+        self,
+        save_path: str,
+        file: str,
+        file_ending: str,
+        crs: list[str],
+        batch_size: int,
+        set_area: bool = True,
+        set_length: bool = True,
+    ) -> None:
+        """Save data processed batch by batch as a stream per CRS.
+
+        Only one batch is held in memory at a time, and the layer is read once per CRS.
+
+        Args:
+            save_path: path to save files in
+            file: name of saved file
+            file_ending: what file type to save
+            crs: CRSs to save in
+            batch_size: max number of features per batch
+            set_area: set area column
+            set_length: set length column
+        """
+        for target in crs:
+            tables = (
+                table.to_crs(target)
+                for table in self._process_batches(batch_size, set_area, set_length)
+            )
+            first = next(tables, None)
+            if first is None:
+                first = self._process_table(set_area, set_length).to_crs(target)
+
+            output_path = self.output_path(save_path, file, file_ending, crs=target)
+            os.makedirs(path.dirname(output_path), exist_ok=True)
+            with span("write_batches") as write:
+                first.write_batches(tables, output_path, FILE_ENDING_DRIVERS_MAP[file_ending])
+                if is_enabled():
+                    write.nbytes = path.getsize(output_path)
+
+    def _save(
+        self,
+        save_path: str,
+        file: str,
+        file_ending: str = "fgb",
+        tile_size: Optional[float] = None,
+        crs: Optional[list[str]] = None,
+    ) -> None:
+        """Save processed geometry items, in EPSG:4326 by default.
+
+        Args:
+            save_path: path to save files in
+            file: name of saved file
+            file_ending: what file type to save
+            tile_size: split output by grid tiles of this size in metres, e.g. 50 km
+            crs: CRSs to save in, reprojected in one pass, EPSG:4326 by default
+        """
+        crs = [self.config.epsg_4326] if crs is None else crs
+
+        if self._batched is not None and self.batch_size is not None:
+            if tile_size is None and file_ending != "parquet":
+                self._save_batches(
+                    save_path, file, file_ending, crs, self.batch_size, *self._batched
+                )
+                return
+
+            self.table = self._process_table(*self._batched)
+
+        data = self.table if self.table is not None else self.df
+
+        if tile_size is not None:
+            self._save_tiles(data, save_path, file, file_ending, tile_size, crs)
+            return
 
-        df = self.df.to_crs(self.config.epsg_4326)
-        df.to_file(path.join(folder_path, file) + f".{file_ending}", driver=file_ending_driver)
+        for target, projected in self._reproject(data, crs).items():
+            output_path = self.output_path(save_path, file, file_ending, crs=target)
+            os.makedirs(path.dirname(output_path), exist_ok=True)
+            self._write(projected, output_path, file_ending)
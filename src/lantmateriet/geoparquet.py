@@ -0,0 +1,167 @@
+"""GeoParquet module.
+
+Writes GeoParquet 1.1 with a bbox covering column and rows sorted along a Hilbert
+curve, so row group statistics let readers such as DuckDB or Arrow skip row groups
+outside a queried bbox.
+"""
+
+import json
+from typing import Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
+from pyproj import CRS
+
+from lantmateriet.arrow import GEOMETRY_TYPE_NAMES
+
+GEOPARQUET_VERSION = "1.1.0"
+GEOMETRY_NAME = "geometry"
+BBOX_NAME = "bbox"
+COMPRESSION = "zstd"
+COMPRESSION_LEVEL = 9
+HILBERT_LEVEL = 16
+TARGET_ROW_GROUP_BYTES = 32 * 1024**2
+MIN_ROW_GROUP_SIZE = 1024
+MAX_ROW_GROUP_SIZE = 122_880
+
+
+def hilbert_distance(
+    geometries: np.ndarray, bounds: Optional[tuple] = None, level: int = HILBERT_LEVEL
+) -> np.ndarray:
+    """Get distance along Hilbert curve of bbox centres.
+
+    Args:
+        geometries: shapely geometry array
+        bounds: extent to fit the curve in, total bounds of geometries by default
+        level: curve order, the extent is divided in 2^level cells per axis
+
+    Returns:
+        Hilbert distances
+    """
+    if len(geometries) == 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    side = 1 << level
+    bboxes = shapely.bounds(geometries)
+    xmin, ymin, xmax, ymax = shapely.total_bounds(geometries) if bounds is None else bounds
+    width = max(xmax - xmin, np.finfo(float).tiny)
+    height = max(ymax - ymin, np.finfo(float).tiny)
+
+    centre_x = np.nan_to_num((bboxes[:, 0] + bboxes[:, 2]) / 2, nan=xmin)
+    centre_y = np.nan_to_num((bboxes[:, 1] + bboxes[:, 3]) / 2, nan=ymin)
+    x = np.clip(((centre_x - xmin) / width * (side - 1)).astype(np.int64), 0, side - 1)
+    y = np.clip(((centre_y - ymin) / height * (side - 1)).astype(np.int64), 0, side - 1)
+
+    distance = np.zeros(len(geometries), dtype=np.uint64)
+    s = side >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        distance += (s * s * ((3 * rx) ^ ry)).astype(np.uint64)
+
+        swap = ~ry
+        flip = swap & rx
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+
+    return distance
+
+
+def bbox_array(geometries: np.ndarray) -> pa.StructArray:
+    """Get bbox covering column of geometries.
+
+    Args:
+        geometries: shapely geometry array
+
+    Returns:
+        struct array with xmin, ymin, xmax and ymax
+    """
+    bboxes = shapely.bounds(geometries)
+    return pa.StructArray.from_arrays(
+        [pa.array(bboxes[:, i], pa.float64()) for i in range(4)],
+        names=["xmin", "ymin", "xmax", "ymax"],
+    )
+
+
+def geo_metadata(geometries: np.ndarray, crs: Optional[str]) -> dict:
+    """Get GeoParquet file metadata.
+
+    Args:
+        geometries: shapely geometry array
+        crs: CRS of geometries
+
+    Returns:
+        geo metadata
+    """
+    type_ids = np.unique(shapely.get_type_id(geometries[~shapely.is_missing(geometries)]))
+    column = {
+        "encoding": "WKB",
+        "geometry_types": sorted(
+            GEOMETRY_TYPE_NAMES[shapely.GeometryType(type_id)]
+            for type_id in type_ids
+            if shapely.GeometryType(type_id) in GEOMETRY_TYPE_NAMES
+        ),
+        "crs": None if crs is None else CRS.from_user_input(crs).to_json_dict(),
+        "covering": {
+            BBOX_NAME: {key: [BBOX_NAME, key] for key in ("xmin", "ymin", "xmax", "ymax")}
+        },
+    }
+    if len(geometries) > 0:
+        column["bbox"] = [float(value) for value in shapely.total_bounds(geometries)]
+
+    return {
+        "version": GEOPARQUET_VERSION,
+        "primary_column": GEOMETRY_NAME,
+        "columns": {GEOMETRY_NAME: column},
+    }
+
+
+def row_group_size(table: pa.Table) -> int:
+    """Get number of rows per row group from average row size.
+
+    Args:
+        table: table to write
+
+    Returns:
+        rows per row group
+    """
+    if table.num_rows == 0:
+        return MAX_ROW_GROUP_SIZE
+
+    row_bytes = max(1, table.nbytes // table.num_rows)
+    return int(np.clip(TARGET_ROW_GROUP_BYTES // row_bytes, MIN_ROW_GROUP_SIZE, MAX_ROW_GROUP_SIZE))
+
+
+def write_geoparquet(
+    table: pa.Table, geometries: np.ndarray, crs: Optional[str], file: str
+) -> None:
+    """Write attributes and geometries as Hilbert sorted GeoParquet.
+
+    Args:
+        table: attribute table
+        geometries: shapely geometry array, one per row
+        crs: CRS of geometries
+        file: file to write
+    """
+    order = np.argsort(hilbert_distance(geometries), kind="stable")
+    geometries = geometries[order]
+
+    table = table.take(order)
+    table = table.append_column(GEOMETRY_NAME, pa.array(shapely.to_wkb(geometries), pa.binary()))
+    table = table.append_column(BBOX_NAME, bbox_array(geometries))
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), b"geo": json.dumps(geo_metadata(geometries, crs))}
+    )
+
+    pq.write_table(
+        table,
+        file,
+        row_group_size=row_group_size(table),
+        compression=COMPRESSION,
+        compression_level=COMPRESSION_LEVEL,
+        write_statistics=True,
+    )
@@ -0,0 +1,190 @@
+"""GeoPackage metadata module.
+
+Reads metadata straight from the SQLite database of a GeoPackage, without going
+through GDAL or reading geometries.
+"""
+
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+BYTES_PER_COORDINATE = 16
+GEOMETRY_COLUMN = "SELECT column_name FROM gpkg_geometry_columns WHERE table_name = ?"
+GEOMETRY_TYPE = "SELECT geometry_type_name FROM gpkg_geometry_columns WHERE table_name = ?"
+CONTENTS_EXTENT = "SELECT min_x, min_y, max_x, max_y FROM gpkg_contents WHERE table_name = ?"
+
+
+@dataclass
+class NameStatistics:
+    """Statistics of features with the same name.
+
+    Args:
+        features: number of features
+        geometry_bytes: total size of geometry blobs
+    """
+
+    features: int
+    geometry_bytes: int
+
+    @property
+    def vertices(self) -> int:
+        """Estimate number of vertices from geometry size, assuming XY coordinates.
+
+        Returns:
+            estimated number of vertices
+        """
+        return self.geometry_bytes // BYTES_PER_COORDINATE
+
+
+def quote(identifier: str) -> str:
+    """Quote SQL identifier.
+
+    Args:
+        identifier: table or column name
+
+    Returns:
+        quoted identifier
+    """
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def connect(file: str) -> sqlite3.Connection:
+    """Open GeoPackage read only, to be closed by the caller.
+
+    Args:
+        file: path to GeoPackage
+
+    Returns:
+        SQLite connection
+    """
+    return sqlite3.connect(Path(file).resolve().as_uri() + "?mode=ro", uri=True)
+
+
+def geometry_column(connection: sqlite3.Connection, layer: str) -> str:
+    """Get geometry column of layer.
+
+    Args:
+        connection: SQLite connection
+        layer: layer name
+
+    Returns:
+        geometry column name
+
+    Raises:
+        ValueError
+    """
+    row = connection.execute(GEOMETRY_COLUMN, (layer,)).fetchone()
+    if row is None:
+        raise ValueError(f"Layer {layer} has no geometry column.")
+
+    return row[0]
+
+
+def name_statistics(file: str, layer: str, field: str) -> dict[str, NameStatistics]:
+    """Get feature count and geometry size per unique name in field.
+
+    Args:
+        file: path to GeoPackage
+        layer: layer name
+        field: field to group by
+
+    Returns:
+        statistics by name, in sorted order
+    """
+    with closing(connect(file)) as connection:
+        geometry = quote(geometry_column(connection, layer))
+        rows = connection.execute(
+            f"SELECT {quote(field)}, COUNT(*), COALESCE(SUM(LENGTH({geometry})), 0) "  # noqa: S608
+            f"FROM {quote(layer)} WHERE {quote(field)} IS NOT NULL "
+            f"GROUP BY {quote(field)} ORDER BY {quote(field)}"
+        ).fetchall()
+
+    return {
+        name: NameStatistics(features, geometry_bytes) for name, features, geometry_bytes in rows
+    }
+
+
+def unique_names(file: str, layer: str, field: str) -> list[str]:
+    """Get unique names in field, without reading the layer.
+
+    Args:
+        file: path to GeoPackage
+        layer: layer name
+        field: field to get names of
+
+    Returns:
+        unique names, in sorted order
+    """
+    with closing(connect(file)) as connection:
+        rows = connection.execute(
+            f"SELECT DISTINCT {quote(field)} FROM {quote(layer)} "  # noqa: S608
+            f"WHERE {quote(field)} IS NOT NULL ORDER BY {quote(field)}"
+        ).fetchall()
+
+    return [name for (name,) in rows]
+
+
+def feature_count(file: str, layer: str) -> int:
+    """Get number of features in layer.
+
+    Args:
+        file: path to GeoPackage
+        layer: layer name
+
+    Returns:
+        number of features
+    """
+    with closing(connect(file)) as connection:
+        row = connection.execute(f"SELECT COUNT(*) FROM {quote(layer)}").fetchone()  # noqa: S608
+
+    return row[0]
+
+
+def geometry_type(file: str, layer: str) -> str:
+    """Get declared geometry type of layer.
+
+    Args:
+        file: path to GeoPackage
+        layer: layer name
+
+    Returns:
+        geometry type name in upper case, e.g. MULTIPOLYGON, or GEOMETRY if mixed
+
+    Raises:
+        ValueError
+    """
+    with closing(connect(file)) as connection:
+        row = connection.execute(GEOMETRY_TYPE, (layer,)).fetchone()
+
+    if row is None:
+        raise ValueError(f"Layer {layer} has no geometry column.")
+
+    return row[0].upper()
+
+
+def extent(file: str, layer: str) -> Optional[tuple[float, float, float, float]]:
+    """Get extent of layer from its contents entry, or its spatial index if not set.
+
+    Args:
+        file: path to GeoPackage
+        layer: layer name
+
+    Returns:
+        bounds as (minx, miny, maxx, maxy) in layer CRS, None if unknown
+    """
+    with closing(connect(file)) as connection:
+        row = connection.execute(CONTENTS_EXTENT, (layer,)).fetchone()
+        if row is not None and None not in row:
+            return tuple(row)
+
+        rtree = quote(f"rtree_{layer}_{geometry_column(connection, layer)}")
+        try:
+            row = connection.execute(
+                f"SELECT MIN(minx), MIN(miny), MAX(maxx), MAX(maxy) FROM {rtree}"  # noqa: S608
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+
+    return None if None in row else tuple(row)
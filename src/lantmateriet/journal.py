@@ -0,0 +1,149 @@
+"""Extraction journal module.
+
+The journal records each finished extraction task as soon as it completes, so an
+interrupted run can be resumed without redoing finished tasks.
+"""
+
+import json
+import logging
+import os
+import shutil
+from os import path
+from typing import Hashable, Optional
+
+import geopandas as gpd
+
+JOURNAL_FOLDER = ".journal"
+JOURNAL_FILE = "journal.jsonl"
+CHECKPOINT_FOLDER = "checkpoints"
+DONE = "done"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+
+class Journal:
+    """Append-only extraction journal.
+
+    Each line is a JSON record of a finished or failed task. Task results needed
+    later, e.g. dissolved ground for the sweden base, are checkpointed as GeoParquet
+    next to the journal.
+    """
+
+    def __init__(self, target_path: str, resume: bool = False):
+        """Initialise journal in target path.
+
+        Args:
+            target_path: extraction target directory
+            resume: continue an existing journal, otherwise start a new one
+        """
+        self._path = path.join(target_path, JOURNAL_FOLDER)
+        self.completed: dict[Hashable, dict] = {}
+        self._records = 0
+
+        if resume is True:
+            self._load()
+        else:
+            shutil.rmtree(self._path, ignore_errors=True)
+
+        os.makedirs(path.join(self._path, CHECKPOINT_FOLDER), exist_ok=True)
+        self._file = open(path.join(self._path, JOURNAL_FILE), "a")
+
+    def _load(self) -> None:
+        """Load completed tasks, truncating a partly written last record."""
+        journal_file = path.join(self._path, JOURNAL_FILE)
+        if not path.exists(journal_file):
+            return
+
+        with open(journal_file, "r+b") as f:
+            offset = 0
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Record without line end.")
+
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning("Truncating incomplete journal record.")
+                    f.truncate(offset)
+                    break
+
+                offset += len(line)
+                self._records += 1
+                if record["status"] == DONE:
+                    self.completed[tuple(record["key"])] = record
+
+        logger.info(f"Resuming with {len(self.completed)} completed tasks.")
+
+    def _append(self, record: dict) -> None:
+        """Append record and flush it to disk.
+
+        Args:
+            record: journal record
+        """
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._records += 1
+
+    def is_done(self, key: tuple, entry: dict) -> bool:
+        """Check if task was completed from the same inputs.
+
+        Args:
+            key: task key
+            entry: manifest entry of current task inputs
+
+        Returns:
+            true if completed
+        """
+        return key in self.completed and self.completed[key]["entry"] == entry
+
+    def done(self, key: tuple, entry: dict, result: Optional[gpd.GeoDataFrame] = None) -> None:
+        """Record completed task.
+
+        Args:
+            key: task key
+            entry: manifest entry of task inputs
+            result: task result to checkpoint
+        """
+        checkpoint = None
+        if result is not None:
+            checkpoint = path.join(CHECKPOINT_FOLDER, f"{self._records:06d}.parquet")
+            result.to_parquet(path.join(self._path, checkpoint))
+
+        record = {"key": list(key), "status": DONE, "entry": entry, "checkpoint": checkpoint}
+        self._append(record)
+        self.completed[key] = record
+
+    def failed(self, key: tuple, error: BaseException) -> None:
+        """Record failed task.
+
+        Args:
+            key: task key
+            error: raised error
+        """
+        self._append({"key": list(key), "status": FAILED, "error": repr(error)})
+
+    def result(self, key: tuple) -> Optional[gpd.GeoDataFrame]:
+        """Read checkpointed result of completed task.
+
+        Args:
+            key: task key
+
+        Returns:
+            task result, None if the task has no result
+        """
+        checkpoint = self.completed[key]["checkpoint"]
+        if checkpoint is None:
+            return None
+
+        return gpd.read_parquet(path.join(self._path, checkpoint))
+
+    def close(self) -> None:
+        """Close journal."""
+        self._file.close()
+
+    def clear(self) -> None:
+        """Close and remove journal, e.g. after a completed run."""
+        self.close()
+        shutil.rmtree(self._path, ignore_errors=True)
@@ -1,5 +1,9 @@
 """Line module."""
 
+from typing import Optional
+
+import geopandas as gpd
+
 from lantmateriet.geometry import Geometry
 
 
@@ -13,6 +17,9 @@ class Line(Geometry):
         layer: str = "vaglinje",
         name: str = "mark",
         field: str = "objekttyp",
+        df: Optional[gpd.GeoDataFrame] = None,
+        arrow: bool = False,
+        batch_size: Optional[int] = None,
     ):
         """Initialise Line object.
 
@@ -22,8 +29,13 @@ class Line(Geometry):
             layer: layer to load
             name: name of data
             field: geopandas field
+            df: already read data of name
+            arrow: process data as Arrow table from read to save
+            batch_size: process and save data in batches of this many features
         """
-        super().__init__(file_path, detail_level, layer, name, field)
+        super().__init__(
+            file_path, detail_level, layer, name, field, df, arrow, batch_size=batch_size
+        )
         self.dissolve = False
 
     def process(self, set_length: bool = True) -> None:
@@ -34,12 +46,21 @@ class Line(Geometry):
         """
         self._process(self.dissolve, False, set_length)
 
-    def save(self, save_path: str, file: str, file_ending: str = "fgb") -> None:
-        """Save processed communication items in EPSG:4326.
+    def save(
+        self,
+        save_path: str,
+        file: str,
+        file_ending: str = "fgb",
+        tile_size: Optional[float] = None,
+        crs: Optional[list[str]] = None,
+    ) -> None:
+        """Save processed communication items, in EPSG:4326 by default.
 
         Args:
             save_path: path to save files in
             file: name of saved file
             file_ending: what file type to save
+            tile_size: split output by grid tiles of this size in metres
+            crs: CRSs to save in, EPSG:4326 by default
         """
-        self._save(save_path, file, file_ending)
+        self._save(save_path, file, file_ending, tile_size, crs)
@@ -0,0 +1,187 @@
+"""Extraction manifest module.
+
+The manifest in the target directory records what each output file was built from, so
+reruns only process partitions whose inputs changed.
+"""
+
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import os
+from functools import lru_cache
+from os import path
+from typing import Optional
+
+MANIFEST_FILE = "manifest.json"
+PACKAGE = "ifk-lantmateriet"
+HASH_CHUNK_SIZE = 1024**2
+
+
+@lru_cache
+def code_version() -> str:
+    """Get version of extraction code.
+
+    Combines the package version with a digest of the package sources, so changed code
+    invalidates outputs also without a version bump.
+
+    Returns:
+        code version
+    """
+    try:
+        version = importlib.metadata.version(PACKAGE)
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+
+    digest = hashlib.sha256()
+    source_path = path.dirname(__file__)
+    for file in sorted(os.listdir(source_path)):
+        if file.endswith(".py"):
+            with open(path.join(source_path, file), "rb") as f:
+                digest.update(f.read())
+
+    return f"{version}+{digest.hexdigest()[:12]}"
+
+
+def config_fingerprint(config: object) -> str:
+    """Get fingerprint of config.
+
+    Args:
+        config: config object, e.g. config_50
+
+    Returns:
+        config digest
+    """
+    values: dict = {"class": type(config).__name__}
+    values |= {
+        key: sorted(value) if isinstance(value, (set, frozenset)) else value
+        for key, value in inspect.getmembers(config)
+        if not key.startswith("_") and not callable(value)
+    }
+    return hashlib.sha256(json.dumps(values, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def file_fingerprint(file: str, content_hash: bool = False) -> dict:
+    """Get fingerprint of source file.
+
+    Args:
+        file: path to file
+        content_hash: include digest of file content, otherwise size and mtime are used
+
+    Returns:
+        file fingerprint
+    """
+    stat = os.stat(file)
+    fingerprint: dict = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    if content_hash is True:
+        digest = hashlib.sha256()
+        with open(file, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+
+        fingerprint["sha256"] = digest.hexdigest()
+
+    return fingerprint
+
+
+class Manifest:
+    """Extraction manifest.
+
+    Maps each output file, relative to the target directory, to the source file
+    fingerprint, layer, name, config, extraction options and code version it was built
+    from.
+    """
+
+    def __init__(
+        self, target_path: str, content_hash: bool = False, options: Optional[dict] = None
+    ):
+        """Initialise manifest, loading an existing one from target path.
+
+        Args:
+            target_path: extraction target directory
+            content_hash: fingerprint source files by content digest
+            options: extraction options that change outputs, e.g. arrow and batch size
+        """
+        self._target_path = target_path
+        self._content_hash = content_hash
+        self._options = {} if options is None else options
+        self._fingerprints: dict[str, dict] = {}
+        self.outputs: dict[str, dict] = {}
+
+        manifest_file = path.join(target_path, MANIFEST_FILE)
+        if path.exists(manifest_file):
+            with open(manifest_file, "r") as f:
+                self.outputs = json.load(f)["outputs"]
+
+    def _relative(self, output: str) -> str:
+        """Get output path relative to target directory.
+
+        Args:
+            output: output path
+
+        Returns:
+            relative output path
+        """
+        return path.relpath(output, self._target_path)
+
+    def entry(self, file: str, layer: str, name: str, config: object) -> dict:
+        """Build manifest entry of an output.
+
+        Source files are fingerprinted once per manifest.
+
+        Args:
+            file: source file
+            layer: source layer
+            name: source name
+            config: config used for processing
+
+        Returns:
+            manifest entry
+        """
+        if file not in self._fingerprints:
+            self._fingerprints[file] = file_fingerprint(file, self._content_hash)
+
+        return {
+            "file": path.basename(file),
+            "source": self._fingerprints[file],
+            "layer": layer,
+            "name": name,
+            "config": config_fingerprint(config),
+            "options": self._options,
+            "version": code_version(),
+        }
+
+    def is_current(self, output: str, entry: dict) -> bool:
+        """Check if output exists and was built from the same inputs.
+
+        Args:
+            output: output path
+            entry: manifest entry of current inputs
+
+        Returns:
+            true if output is up to date
+        """
+        return path.exists(output) and self.outputs.get(self._relative(output)) == entry
+
+    def update(self, output: str, entry: Optional[dict]) -> None:
+        """Record or remove output.
+
+        Args:
+            output: output path
+            entry: manifest entry, None to remove output
+        """
+        if entry is None:
+            self.outputs.pop(self._relative(output), None)
+        else:
+            self.outputs[self._relative(output)] = entry
+
+    def save(self) -> None:
+        """Save manifest atomically to target directory."""
+        os.makedirs(self._target_path, exist_ok=True)
+        manifest_file = path.join(self._target_path, MANIFEST_FILE)
+
+        with open(manifest_file + ".tmp", "w") as f:
+            json.dump({"outputs": self.outputs}, f, indent=2, sort_keys=True, ensure_ascii=False)
+
+        os.replace(manifest_file + ".tmp", manifest_file)
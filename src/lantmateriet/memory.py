@@ -0,0 +1,256 @@
+"""Memory accounting module.
+
+Reads the resident set size (RSS) of the process and its peak, which on Linux can be
+reset so each stage gets its own high-water mark. Peaks of traced extraction tasks are
+kept in a memory report in the target directory, which later runs use to admit tasks
+by their measured memory when larger than estimated, and to tune the number of workers.
+"""
+
+import json
+import resource
+import sys
+from dataclasses import asdict, dataclass, field
+from os import path
+from typing import Hashable, Optional
+
+from lantmateriet.utils import format_table
+
+PROC_STATUS = "/proc/self/status"
+PROC_CLEAR_REFS = "/proc/self/clear_refs"
+RESET_PEAK = "5"
+MEMORY_REPORT_FILE = "memory.json"
+MEMORY_MARGIN = 1.2
+STAGES = ("read", "dissolve", "reproject", "write")
+REPORT_COLUMNS = ("file", "layer", "name", "peak_rss_mb", "growth_mb", "traced_mb", "estimate_mb")
+
+
+def _proc_status(key: str) -> Optional[int]:
+    """Read memory value of this process from proc status.
+
+    Args:
+        key: status key, e.g. VmRSS:
+
+    Returns:
+        value in bytes, None if not available
+    """
+    try:
+        with open(PROC_STATUS, "r") as f:
+            for line in f:
+                if line.startswith(key):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    return None
+
+
+def _max_rss() -> int:
+    """Get peak RSS of process life time from resource usage.
+
+    Returns:
+        peak RSS in bytes
+    """
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def current_rss() -> int:
+    """Get current RSS of this process.
+
+    Returns:
+        RSS in bytes, peak RSS if current is not available
+    """
+    rss = _proc_status("VmRSS:")
+    return _max_rss() if rss is None else rss
+
+
+def peak_rss() -> int:
+    """Get peak RSS of this process since last reset.
+
+    Returns:
+        peak RSS in bytes
+    """
+    rss = _proc_status("VmHWM:")
+    return _max_rss() if rss is None else rss
+
+
+def reset_peak_rss() -> bool:
+    """Reset peak RSS of this process to its current RSS.
+
+    Returns:
+        true if reset, false if peak RSS is kept for the process life time
+    """
+    try:
+        with open(PROC_CLEAR_REFS, "w") as f:
+            f.write(RESET_PEAK)
+    except OSError:
+        return False
+
+    return True
+
+
+@dataclass
+class TaskMemory:
+    """Measured memory of an extraction task.
+
+    Args:
+        key: task key, e.g. (file, layer, name)
+        peak_rss: peak RSS of worker process in bytes
+        growth: peak RSS above RSS at task start in bytes
+        peak_traced: peak memory traced by tracemalloc in bytes
+        estimate: estimated memory of task in bytes
+        stages: peak RSS and traced memory by stage
+    """
+
+    key: list
+    peak_rss: int
+    growth: int
+    peak_traced: int
+    estimate: int = 0
+    stages: dict[str, dict[str, int]] = field(default_factory=dict)
+
+
+def memory_report(
+    trace_spans: list, task_span: str, estimates: Optional[dict[Hashable, int]] = None
+) -> list[TaskMemory]:
+    """Get memory of each traced task, in order of decreasing growth of peak RSS.
+
+    Stages are read, dissolve, reproject and write, with variants such as
+    dissolve_exterior counted as their stage.
+
+    Args:
+        trace_spans: spans with memory of traced tasks
+        task_span: name of task spans
+        estimates: estimated memory by task key
+
+    Returns:
+        task memory
+    """
+    estimates = {} if estimates is None else estimates
+    stages: dict[tuple, dict[str, dict[str, int]]] = {}
+    for item in trace_spans:
+        name = item.name.split("_")[0]
+        if item.task is None or name not in STAGES:
+            continue
+
+        stage = stages.setdefault(tuple(item.task), {}).setdefault(
+            name, {"peak_rss": 0, "peak_traced": 0}
+        )
+        stage["peak_rss"] = max(stage["peak_rss"], item.peak_rss)
+        stage["peak_traced"] = max(stage["peak_traced"], item.peak_traced)
+
+    report = [
+        TaskMemory(
+            item.task,
+            item.peak_rss,
+            max(0, item.peak_rss - item.rss),
+            item.peak_traced,
+            estimates.get(tuple(item.task), 0),
+            stages.get(tuple(item.task), {}),
+        )
+        for item in trace_spans
+        if item.name == task_span and item.task is not None
+    ]
+    return sort_memory_report(report)
+
+
+def sort_memory_report(report: list[TaskMemory]) -> list[TaskMemory]:
+    """Sort memory report by growth of peak RSS, then by peak RSS, in decreasing order.
+
+    Args:
+        report: task memory
+
+    Returns:
+        sorted task memory
+    """
+    return sorted(report, key=lambda task: (task.growth, task.peak_rss), reverse=True)
+
+
+def save_memory_report(target_path: str, report: list[TaskMemory]) -> str:
+    """Save memory report as JSON in target path.
+
+    Args:
+        target_path: extraction target directory
+        report: task memory
+
+    Returns:
+        path to report file
+    """
+    report_file = path.join(target_path, MEMORY_REPORT_FILE)
+    with open(report_file, "w") as f:
+        json.dump({"tasks": [asdict(task) for task in report]}, f, indent=2)
+
+    return report_file
+
+
+def load_memory_report(target_path: str) -> dict[Hashable, TaskMemory]:
+    """Load memory report of a previous run from target path.
+
+    Args:
+        target_path: extraction target directory
+
+    Returns:
+        task memory by task key, empty if there is no report
+    """
+    report_file = path.join(target_path, MEMORY_REPORT_FILE)
+    if not path.exists(report_file):
+        return {}
+
+    with open(report_file, "r") as f:
+        return {tuple(task["key"]): TaskMemory(**task) for task in json.load(f)["tasks"]}
+
+
+def measured_memory(task: TaskMemory) -> int:
+    """Get memory to admit a task with, from its measured memory with a margin.
+
+    Ray reuses workers and freed heap is kept by the allocator, so a task following
+    another in the same worker can grow RSS by close to nothing. Its traced peak and
+    its estimate bound the memory from below.
+
+    Args:
+        task: task memory
+
+    Returns:
+        memory in bytes
+    """
+    return max(int(max(task.growth, task.peak_traced) * MEMORY_MARGIN), task.estimate)
+
+
+def memory_per_worker(report: dict[Hashable, TaskMemory]) -> Optional[int]:
+    """Get memory to reserve per worker, from the highest measured peak RSS.
+
+    Args:
+        report: task memory by task key
+
+    Returns:
+        memory in bytes, None if nothing was measured
+    """
+    if len(report) == 0:
+        return None
+
+    return int(max(task.peak_rss for task in report.values()) * MEMORY_MARGIN)
+
+
+def format_memory_report(report: list[TaskMemory]) -> str:
+    """Format memory report as a text table.
+
+    Args:
+        report: task memory
+
+    Returns:
+        table with one row per task
+    """
+    return format_table(
+        REPORT_COLUMNS,
+        [
+            (
+                path.basename(task.key[0]),
+                *[str(part) for part in task.key[1:]],
+                f"{task.peak_rss / 1024**2:.1f}",
+                f"{task.growth / 1024**2:.1f}",
+                f"{task.peak_traced / 1024**2:.1f}",
+                f"{task.estimate / 1024**2:.1f}",
+            )
+            for task in report
+        ],
+    )
@@ -0,0 +1,234 @@
+"""OGC API Features module."""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+LIMIT = 1000
+CONCURRENCY = 4
+MAX_CONNECTIONS = 10
+REQUEST_TIMEOUT = 200
+NEXT = "next"
+OFFSET = "offset"
+
+logger = logging.getLogger(__name__)
+
+
+class OGCFeatures:
+    """Asynchronous OGC API Features client.
+
+    Requests made inside `async with` share one connection pool. Clients for several
+    datasets can share a pool by passing the same `httpx.AsyncClient`. Outside a
+    context, each call opens and closes its own pool.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        auth: Optional[tuple[str, str]] = None,
+        limit: int = LIMIT,
+        concurrency: int = CONCURRENCY,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        """Initialise OGC API Features client.
+
+        Args:
+            base_url: landing page url of the dataset
+            auth: basic authentication as (user, password)
+            limit: page size of item requests
+            concurrency: max number of concurrent page requests
+            client: shared HTTP client, opened and closed by the caller
+        """
+        self._base_url = base_url.rstrip("/")
+        self._auth = auth
+        self._limit = limit
+        self._concurrency = concurrency
+        self._client = client
+        self._owns_client = client is None
+
+    async def __aenter__(self) -> "OGCFeatures":
+        """Open connection pool.
+
+        Returns:
+            client
+        """
+        if self._client is None:
+            self._client = self._new_client()
+
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Close connection pool if owned by this client.
+
+        Args:
+            exc_info: exception info
+        """
+        if self._owns_client is True and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def is_open(self) -> bool:
+        """Check if requests share an open HTTP client, bound to the event loop it is used in.
+
+        Returns:
+            true if a shared or context client is set
+        """
+        return self._client is not None
+
+    def _new_client(self) -> httpx.AsyncClient:
+        """Create HTTP client with connection pool.
+
+        Returns:
+            HTTP client
+        """
+        return httpx.AsyncClient(
+            auth=self._auth,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS),
+        )
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Get open HTTP client, or a temporary one outside a context.
+
+        Yields:
+            HTTP client
+        """
+        if self._client is not None:
+            yield self._client
+            return
+
+        async with self._new_client() as client:
+            yield client
+
+    async def _get(
+        self, client: httpx.AsyncClient, url: str, params: Optional[dict] = None
+    ) -> dict:
+        """Get JSON from url.
+
+        Args:
+            client: HTTP client
+            url: url to request from
+            params: query parameters
+
+        Returns:
+            JSON response
+
+        Raises:
+            httpx.HTTPStatusError
+        """
+        logger.debug(f"Fetching from {url}.")
+
+        auth = httpx.USE_CLIENT_DEFAULT if self._auth is None else self._auth
+        response = await client.get(url, params=params, auth=auth)
+        response.raise_for_status()
+
+        logger.debug(f"Successful request from {url}.")
+
+        return response.json()
+
+    @staticmethod
+    def _next_link(page: dict) -> Optional[str]:
+        """Get next link of page.
+
+        Args:
+            page: feature collection page
+
+        Returns:
+            next url, None on last page
+        """
+        for link in page.get("links") or []:
+            if link.get("rel") == NEXT:
+                return link["href"]
+
+        return None
+
+    async def collections(self) -> list[str]:
+        """Get available feature collections.
+
+        Returns:
+            collection ids
+        """
+        async with self._session() as client:
+            response = await self._get(client, f"{self._base_url}/collections")
+
+        return [collection["id"] for collection in response["collections"]]
+
+    async def _get_offsets(
+        self, client: httpx.AsyncClient, url: str, params: dict, offsets: range
+    ) -> list[dict]:
+        """Get pages by offset concurrently, cancelling all on failure.
+
+        Args:
+            client: HTTP client
+            url: items url
+            params: query parameters
+            offsets: page offsets
+
+        Returns:
+            pages in offset order
+        """
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def get_page(offset: int) -> dict:
+            async with semaphore:
+                return await self._get(client, url, {**params, OFFSET: offset})
+
+        tasks = [asyncio.ensure_future(get_page(offset)) for offset in offsets]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def collection_items(self, collection: str, **query) -> dict:
+        """Get all items of a collection.
+
+        When the server reports the number of matched features and pages by offset,
+        remaining pages are fetched concurrently, otherwise next links are followed.
+
+        Args:
+            collection: collection id
+            **query: query parameters, e.g. bbox, crs or property filters
+
+        Returns:
+            feature collection with features of all pages
+        """
+        url = f"{self._base_url}/collections/{collection}/items"
+        params = {"limit": self._limit, **query}
+
+        async with self._session() as client:
+            first_page = await self._get(client, url, params)
+            features = list(first_page["features"])
+            next_link = self._next_link(first_page)
+            number_matched = first_page.get("numberMatched")
+
+            if (
+                next_link is not None
+                and number_matched is not None
+                and len(features) > 0
+                and OFFSET in parse_qs(urlparse(next_link).query)
+            ):
+                offsets = range(len(features), number_matched, len(features))
+                for page in await self._get_offsets(client, url, params, offsets):
+                    features.extend(page["features"])
+            else:
+                while next_link is not None:
+                    page = await self._get(client, next_link)
+                    features.extend(page["features"])
+                    next_link = self._next_link(page)
+
+        return {
+            **first_page,
+            "features": features,
+            "numberReturned": len(features),
+            "links": [link for link in first_page.get("links") or [] if link.get("rel") != NEXT],
+        }
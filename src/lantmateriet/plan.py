@@ -0,0 +1,134 @@
+"""Extraction plan module.
+
+An extraction plan lists every (file, layer, name) task with its feature and vertex
+counts and estimated cost and memory, in the order the scheduler starts them. Plans
+are saved as JSON in the target directory, so runs can be inspected before they start
+and compared afterwards.
+"""
+
+import json
+from dataclasses import asdict, dataclass
+from os import path
+from typing import Hashable, cast
+
+from lantmateriet.scheduler import Task
+from lantmateriet.utils import format_table
+
+PLAN_FILE = "plan.json"
+COLUMNS = ("file", "layer", "name", "features", "vertices", "cost", "memory_mb", "stale")
+
+
+@dataclass
+class PlanEntry:
+    """Planned extraction task.
+
+    Args:
+        file: source file
+        layer: layer in file
+        name: name of partition
+        features: number of features
+        vertices: estimated number of vertices
+        cost: estimated cost
+        memory: estimated peak memory in bytes
+        stale: if outputs are missing or built from other inputs
+    """
+
+    file: str
+    layer: str
+    name: str
+    features: int
+    vertices: int
+    cost: float
+    memory: int
+    stale: bool = True
+
+
+def plan_entries(tasks: list[Task], stale: set[Hashable]) -> list[PlanEntry]:
+    """Get plan entries of tasks, in order of decreasing cost.
+
+    Args:
+        tasks: extraction tasks, with feature and vertex counts in details
+        stale: keys of stale tasks
+
+    Returns:
+        plan entries
+    """
+    return [
+        PlanEntry(
+            *cast(tuple[str, str, str], task.key),
+            features=task.details.get("features", 0),
+            vertices=task.details.get("vertices", 0),
+            cost=task.cost,
+            memory=task.memory,
+            stale=task.key in stale,
+        )
+        for task in sorted(tasks, key=lambda task: task.cost, reverse=True)
+    ]
+
+
+def save_plan(target_path: str, entries: list[PlanEntry]) -> str:
+    """Save plan as JSON in target path.
+
+    Args:
+        target_path: extraction target directory
+        entries: plan entries
+
+    Returns:
+        path to plan file
+    """
+    plan_file = path.join(target_path, PLAN_FILE)
+    with open(plan_file, "w") as f:
+        json.dump({"tasks": [asdict(entry) for entry in entries]}, f, indent=2)
+
+    return plan_file
+
+
+def load_plan(plan_file: str) -> list[PlanEntry]:
+    """Load plan from JSON.
+
+    Args:
+        plan_file: path to plan file
+
+    Returns:
+        plan entries
+    """
+    with open(plan_file, "r") as f:
+        return [PlanEntry(**entry) for entry in json.load(f)["tasks"]]
+
+
+def format_plan(entries: list[PlanEntry]) -> str:
+    """Format plan as a text table.
+
+    Args:
+        entries: plan entries
+
+    Returns:
+        table with one row per task and a total row
+    """
+    rows = [
+        (
+            path.basename(entry.file),
+            entry.layer,
+            entry.name,
+            str(entry.features),
+            str(entry.vertices),
+            f"{entry.cost:.0f}",
+            f"{entry.memory / 1024**2:.1f}",
+            "yes" if entry.stale else "no",
+        )
+        for entry in entries
+    ]
+    rows.append(
+        (
+            "total",
+            "",
+            "",
+            str(sum(entry.features for entry in entries)),
+            str(sum(entry.vertices for entry in entries)),
+            f"{sum(entry.cost for entry in entries):.0f}",
+            "",
+            str(sum(entry.stale for entry in entries)),
+        )
+    )
+
+    return format_table(COLUMNS, rows)
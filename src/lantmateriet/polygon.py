@@ -1,5 +1,9 @@
 """Polygon module."""
 
+from typing import Optional
+
+import geopandas as gpd
+
 from lantmateriet.geometry import Geometry
 
 
@@ -13,6 +17,9 @@ class Polygon(Geometry):
         layer: str = "mark",
         name: str = "mark",
         field: str = "objekttyp",
+        df: Optional[gpd.GeoDataFrame] = None,
+        arrow: bool = False,
+        dissolve_tile_size: Optional[float] = None,
     ):
         """Initialise Polygon object.
 
@@ -22,8 +29,11 @@ class Polygon(Geometry):
             layer: layer to load
             name: name of data
             field: geopandas field
+            df: already read data of name
+            arrow: process data as Arrow table, unused since polygons are dissolved
+            dissolve_tile_size: dissolve in parallel grid tiles of this size in metres
         """
-        super().__init__(file_path, detail_level, layer, name, field)
+        super().__init__(file_path, detail_level, layer, name, field, df, arrow, dissolve_tile_size)
         self.dissolve = True
 
     def process(self, set_area: bool = True, set_length: bool = True) -> None:
@@ -35,12 +45,21 @@ class Polygon(Geometry):
         """
         self._process(self.dissolve, set_area, set_length)
 
-    def save(self, save_path: str, file: str, file_ending: str = "fgb"):
-        """Save processed ground items in EPSG:4326.
+    def save(
+        self,
+        save_path: str,
+        file: str,
+        file_ending: str = "fgb",
+        tile_size: Optional[float] = None,
+        crs: Optional[list[str]] = None,
+    ) -> None:
+        """Save processed ground items, in EPSG:4326 by default.
 
         Args:
             save_path: path to save files in
             file: name of saved file
             file_ending: what file type to save
+            tile_size: split output by grid tiles of this size in metres
+            crs: CRSs to save in, EPSG:4326 by default
         """
-        self._save(save_path, file, file_ending)
+        self._save(save_path, file, file_ending, tile_size, crs)
@@ -0,0 +1,271 @@
+"""Sampling profiler module.
+
+A background thread samples the Python stack of the thread running a task at a fixed
+interval, and of threads started while profiling, e.g. thread pools running unions of
+a dissolve, or running work in pools kept by the process. Stacks are tagged with the
+task key, e.g. (file, layer, name), and saved in the folded format of flamegraph tools,
+one line of semicolon separated frames and a sample count per stack. Each process
+appends its stacks to a profile folder, which is merged into one folded file, e.g. for
+flamegraph.pl or speedscope.
+"""
+
+import glob
+import os
+import shutil
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from os import path
+from types import FrameType
+from typing import Hashable, Iterator, Optional
+
+from lantmateriet.utils import format_table
+
+SAMPLE_INTERVAL = 0.005
+PROFILE_FOLDER = ".profile"
+PROFILE_FILE = "profile.folded"
+POOL_WORKER = "_worker (thread.py"
+TOP_COLUMNS = ("frame", "self_samples", "self_share", "total_samples")
+
+
+def frame_name(frame: FrameType) -> str:
+    """Get name of stack frame.
+
+    Args:
+        frame: stack frame
+
+    Returns:
+        function name with file name and first line of function
+    """
+    code = frame.f_code
+    return f"{code.co_name} ({path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def escape(name: str) -> str:
+    """Escape frame name for folded stacks, where semicolons separate frames.
+
+    Args:
+        name: frame name
+
+    Returns:
+        frame name without semicolons
+    """
+    return name.replace(";", ":")
+
+
+class SamplingProfiler:
+    """Sampling profiler of one thread and of the threads started while profiling.
+
+    Args:
+        thread_id: thread to sample, the current thread by default
+        interval: seconds between samples
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = SAMPLE_INTERVAL):
+        """Initialise profiler.
+
+        Args:
+            thread_id: thread to sample, the current thread by default
+            interval: seconds between samples
+        """
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.interval = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._existing: set[int] = set()
+
+    def _sampled(self, thread_id: int, stack: list[str]) -> bool:
+        """Check if a stack of a thread is sampled.
+
+        Pool worker threads waiting for work are left out. Pool workers kept by the
+        process, e.g. of reprojection, are sampled while running work.
+
+        Args:
+            thread_id: thread of stack
+            stack: frame names from leaf to root
+
+        Returns:
+            true if sampled
+        """
+        if thread_id == self.thread_id:
+            return True
+
+        if thread_id == threading.get_ident() or stack[0].startswith(POOL_WORKER):
+            return False
+
+        return thread_id not in self._existing or any(
+            name.startswith(POOL_WORKER) for name in stack
+        )
+
+    def _sample(self) -> None:
+        """Sample stacks of threads until stopped."""
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                stack = []
+                current: Optional[FrameType] = frame
+                while current is not None:
+                    stack.append(frame_name(current))
+                    current = current.f_back
+
+                if len(stack) > 0 and self._sampled(thread_id, stack):
+                    self.stacks[tuple(reversed(stack))] += 1
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._stopped.clear()
+        self._existing = set(sys._current_frames())
+        self._thread = threading.Thread(target=self._sample, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def folded(self, tag: tuple[str, ...] = ()) -> list[str]:
+        """Get sampled stacks in folded format.
+
+        Args:
+            tag: frames to prefix stacks with, e.g. file, layer and name of a task
+
+        Returns:
+            one line per stack with frames from root to leaf and sample count
+        """
+        return [
+            ";".join(escape(name) for name in (*tag, *stack)) + f" {count}"
+            for stack, count in self.stacks.items()
+        ]
+
+
+def task_tag(key: Hashable) -> tuple[str, ...]:
+    """Get frames to tag stacks of a task with.
+
+    Args:
+        key: task key, e.g. (file, layer, name)
+
+    Returns:
+        task frames, with file names without folders
+    """
+    parts = key if isinstance(key, tuple) else (key,)
+    return tuple(path.basename(str(part)) for part in parts)
+
+
+@contextmanager
+def profile_task(
+    profile_path: str, key: Hashable, interval: float = SAMPLE_INTERVAL
+) -> Iterator[SamplingProfiler]:
+    """Profile a task, e.g. in a worker, and append its stacks to the profile folder.
+
+    Args:
+        profile_path: profile folder
+        key: task key
+        interval: seconds between samples
+
+    Yields:
+        profiler of task
+    """
+    profiler = SamplingProfiler(interval=interval)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        lines = profiler.folded(task_tag(key))
+        if len(lines) > 0:
+            with open(path.join(profile_path, f"{os.getpid()}.folded"), "a") as f:
+                f.write("\n".join(lines) + "\n")
+
+
+def start_profile(target_path: str) -> str:
+    """Create empty profile folder.
+
+    Args:
+        target_path: extraction target directory
+
+    Returns:
+        path to profile folder
+    """
+    profile_path = path.join(target_path, PROFILE_FOLDER)
+    shutil.rmtree(profile_path, ignore_errors=True)
+    os.makedirs(profile_path)
+    return profile_path
+
+
+def read_folded(folded_file: str) -> Counter[str]:
+    """Read folded stacks.
+
+    Args:
+        folded_file: path to folded file
+
+    Returns:
+        sample count by stack
+    """
+    stacks: Counter[str] = Counter()
+    with open(folded_file, "r") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(count)
+
+    return stacks
+
+
+def save_profile(target_path: str, profile_path: str) -> str:
+    """Merge stacks of profile folder into one folded file.
+
+    Args:
+        target_path: extraction target directory
+        profile_path: profile folder
+
+    Returns:
+        path to profile file
+    """
+    stacks: Counter[str] = Counter()
+    for folded_file in glob.glob(path.join(profile_path, "*.folded")):
+        stacks.update(read_folded(folded_file))
+
+    profile_file = path.join(target_path, PROFILE_FILE)
+    with open(profile_file, "w") as f:
+        f.writelines(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+    shutil.rmtree(profile_path, ignore_errors=True)
+    return profile_file
+
+
+def top_frames(stacks: Counter[str], tag_depth: int = 3, limit: int = 20) -> str:
+    """Format frames with most samples as a text table.
+
+    Self samples are those with the frame at the top of the stack, total samples those
+    with the frame anywhere in the stack.
+
+    Args:
+        stacks: sample count by folded stack
+        tag_depth: number of task frames stacks are tagged with, left out
+        limit: max number of frames
+
+    Returns:
+        table of frames in order of decreasing self samples
+    """
+    own: Counter[str] = Counter()
+    total: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")[tag_depth:]
+        if len(frames) == 0:
+            continue
+
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+
+    samples = max(1, sum(stacks.values()))
+    return format_table(
+        TOP_COLUMNS,
+        [
+            (frame, str(count), f"{count / samples:.1%}", str(total[frame]))
+            for frame, count in own.most_common(limit)
+        ],
+    )
@@ -0,0 +1,179 @@
+"""Administrative border pyramid module."""
+
+import json
+import os
+from math import ceil, log10
+from os import path
+from typing import Optional
+
+import geopandas as gpd
+
+from lantmateriet.config import config_50
+from lantmateriet.geometry import FILE_ENDING_DRIVERS_MAP
+from lantmateriet.topology import Topology
+
+TOLERANCES = (0.0, 10.0, 50.0, 250.0, 1000.0, 5000.0)
+PIXEL_SIZE = 0.00028
+METRES_PER_DEGREE = 111_000
+MAX_COORDINATE_PRECISION = 7
+INDEX_FILE = "pyramid.json"
+
+
+def scale_to_resolution(scale: float) -> float:
+    """Convert scale denominator to ground resolution.
+
+    Uses the standardised rendering pixel size of 0.28 mm.
+
+    Args:
+        scale: scale denominator, e.g. 1_000_000 for 1:1M
+
+    Returns:
+        ground resolution in metres per pixel
+    """
+    return scale * PIXEL_SIZE
+
+
+def coordinate_precision(tolerance: float) -> int:
+    """Get number of decimals for EPSG:4326 coordinates at tolerance.
+
+    Rounding error is kept below a tenth of the tolerance.
+
+    Args:
+        tolerance: simplification tolerance in metres
+
+    Returns:
+        number of decimals
+    """
+    if tolerance <= 0:
+        return MAX_COORDINATE_PRECISION
+
+    return min(MAX_COORDINATE_PRECISION, max(0, ceil(log10(10 * METRES_PER_DEGREE / tolerance))))
+
+
+class BorderPyramid:
+    """Precomputed pyramid of generalised administrative borders.
+
+    Each level of the topology is simplified once per fixed tolerance and stored in
+    EPSG:4326, so a request at a given scale reads only the matching generalisation.
+    """
+
+    def __init__(self, pyramid_path: str):
+        """Initialise border pyramid from a built pyramid.
+
+        Args:
+            pyramid_path: path to pyramid directory
+        """
+        self._path = pyramid_path
+
+        with open(path.join(pyramid_path, INDEX_FILE), "r") as f:
+            self.index = json.load(f)
+
+    @classmethod
+    def build(
+        cls,
+        topology: Topology,
+        pyramid_path: str,
+        tolerances: tuple[float, ...] = TOLERANCES,
+        file_ending: str = "geojson",
+    ) -> "BorderPyramid":
+        """Build border pyramid from a topology in a projected CRS.
+
+        Args:
+            topology: topology of administrative borders
+            pyramid_path: path to save pyramid in
+            tolerances: simplification tolerances in metres
+            file_ending: what file type to save
+
+        Returns:
+            border pyramid
+        """
+        file_ending_driver = FILE_ENDING_DRIVERS_MAP[file_ending]
+        os.makedirs(pyramid_path, exist_ok=True)
+
+        index: dict = {
+            "crs": config_50.epsg_4326,
+            "levels": {name: [] for name in topology.objects},
+        }
+        for tolerance, simplified in topology.simplify_many(sorted(tolerances)).items():
+            layer_options = {}
+            if file_ending_driver == FILE_ENDING_DRIVERS_MAP["geojson"]:
+                layer_options["COORDINATE_PRECISION"] = coordinate_precision(tolerance)
+
+            for name in simplified.objects:
+                file = f"{name}_{tolerance:g}.{file_ending}"
+                df = simplified.to_geodataframe(name).to_crs(config_50.epsg_4326)
+                df.to_file(
+                    path.join(pyramid_path, file),
+                    driver=file_ending_driver,
+                    engine="pyogrio",
+                    **layer_options,
+                )
+
+                index["levels"][name].append(
+                    {
+                        "tolerance": tolerance,
+                        "file": file,
+                        "bytes": path.getsize(path.join(pyramid_path, file)),
+                        "features": len(df),
+                    }
+                )
+
+        with open(path.join(pyramid_path, INDEX_FILE), "w") as f:
+            json.dump(index, f, indent=2)
+
+        return cls(pyramid_path)
+
+    def _entry(self, name: str, scale: float) -> dict:
+        """Get coarsest pyramid entry not coarser than the resolution at scale.
+
+        Args:
+            name: level name, e.g. kommuner
+            scale: scale denominator
+
+        Returns:
+            pyramid entry
+        """
+        resolution = scale_to_resolution(scale)
+        entries = self.index["levels"][name]
+        candidates = [entry for entry in entries if entry["tolerance"] <= resolution]
+
+        return candidates[-1] if candidates else entries[0]
+
+    def tolerance(self, name: str, scale: float) -> float:
+        """Get tolerance of pyramid level used for scale.
+
+        Args:
+            name: level name, e.g. kommuner
+            scale: scale denominator
+
+        Returns:
+            tolerance in metres
+        """
+        return self._entry(name, scale)["tolerance"]
+
+    def file(self, name: str, scale: float) -> str:
+        """Get file of pyramid level for scale, e.g. to serve as is.
+
+        Args:
+            name: level name, e.g. kommuner
+            scale: scale denominator
+
+        Returns:
+            path to file
+        """
+        return path.join(self._path, self._entry(name, scale)["file"])
+
+    def read(
+        self, name: str, scale: float, bbox: Optional[tuple[float, float, float, float]] = None
+    ) -> gpd.GeoDataFrame:
+        """Read pyramid level for scale.
+
+        Args:
+            name: level name, e.g. kommuner
+            scale: scale denominator
+            bbox: bounding box in EPSG:4326 to read
+
+        Returns:
+            generalised borders in EPSG:4326
+        """
+        return gpd.read_file(self.file(name, scale), bbox=bbox, engine="pyogrio", use_arrow=True)
@@ -0,0 +1,130 @@
+"""Reprojection module.
+
+Reprojects shapely geometry arrays by transforming their coordinates in place, in
+chunks spread over a thread pool. pyproj releases the GIL while transforming, and
+since transformers are not thread-safe, each thread keeps its own cached transformer.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import shapely
+from pyproj import CRS, Transformer
+
+from lantmateriet.utils import available_cpus
+
+CHUNK_SIZE = 65_536
+
+_local = threading.local()
+
+
+@lru_cache
+def _executor() -> ThreadPoolExecutor:
+    """Get thread pool of process, kept so its threads keep their transformers.
+
+    Returns:
+        thread pool executor
+    """
+    return ThreadPoolExecutor(available_cpus(), thread_name_prefix="reproject")
+
+
+def transformer(source: str, target: str) -> Transformer:
+    """Get transformer of current thread, created on first use.
+
+    Args:
+        source: CRS to transform from
+        target: CRS to transform to
+
+    Returns:
+        transformer with x, y axis order
+    """
+    if not hasattr(_local, "transformers"):
+        _local.transformers = {}
+
+    if (source, target) not in _local.transformers:
+        _local.transformers[(source, target)] = Transformer.from_crs(source, target, always_xy=True)
+
+    return _local.transformers[(source, target)]
+
+
+def transform_coordinates(
+    x: np.ndarray, y: np.ndarray, source: str, target: str, chunk_size: int = CHUNK_SIZE
+) -> None:
+    """Transform coordinates in place, in parallel chunks.
+
+    Args:
+        x: contiguous float64 x coordinates
+        y: contiguous float64 y coordinates
+        source: CRS to transform from
+        target: CRS to transform to
+        chunk_size: number of coordinates per chunk
+    """
+    chunks = [slice(start, start + chunk_size) for start in range(0, len(x), chunk_size)]
+
+    def _transform(chunk: slice) -> None:
+        transformer(source, target).transform(x[chunk], y[chunk], inplace=True)
+
+    if len(chunks) <= 1:
+        for chunk in chunks:
+            _transform(chunk)
+        return
+
+    list(_executor().map(_transform, chunks))
+
+
+def crs_suffix(crs: str) -> str:
+    """Get file name suffix of outputs in CRS.
+
+    Args:
+        crs: CRS, e.g. EPSG:3006
+
+    Returns:
+        file name suffix, e.g. _epsg3006
+    """
+    return "_" + crs.replace(":", "").lower()
+
+
+def reproject(
+    geometries: np.ndarray, source: Optional[str], targets: list[str]
+) -> dict[str, np.ndarray]:
+    """Reproject geometries to one or more CRSs.
+
+    Coordinates are extracted once and each target gets new geometries, so the input
+    geometries are not modified, and geometries already in a target CRS are reused.
+
+    Args:
+        geometries: shapely geometry array
+        source: CRS of geometries
+        targets: CRSs to reproject to
+
+    Returns:
+        geometries by target CRS
+
+    Raises:
+        ValueError: if geometries have no CRS
+    """
+    if source is None:
+        raise ValueError("Cannot reproject geometries without CRS.")
+
+    coordinates: Optional[np.ndarray] = None
+    projected = {}
+    for target in targets:
+        if CRS.from_user_input(source) == CRS.from_user_input(target):
+            projected[target] = geometries
+            continue
+
+        if coordinates is None:
+            coordinates = shapely.get_coordinates(geometries, include_z=True)
+
+        x = np.ascontiguousarray(coordinates[:, 0])
+        y = np.ascontiguousarray(coordinates[:, 1])
+        transform_coordinates(x, y, source, target)
+
+        projected[target] = shapely.set_coordinates(
+            geometries.copy(), np.column_stack([x, y, coordinates[:, 2]])
+        )
+
+    return projected
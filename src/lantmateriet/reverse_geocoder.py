@@ -0,0 +1,169 @@
+"""Reverse geocoder module."""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from math import ceil
+from typing import TYPE_CHECKING, Optional
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from pyproj import CRS, Transformer
+
+from lantmateriet.config import config_50
+from lantmateriet.utils import features_to_geodataframe
+
+if TYPE_CHECKING:
+    from lantmateriet.admin_borders import AdminBorders
+
+CODES = ("kommunkod", "lanskod")
+CHUNK_SIZE = 250_000
+NO_MATCH = -1
+
+
+class ReverseGeocoder:
+    """Point-in-polygon reverse geocoder over municipality borders.
+
+    Polygons are held in an STRtree and prepared once. Lookups run in chunks on a
+    thread pool, GEOS releases the GIL in the vectorised predicates. Points on a border
+    shared by several polygons resolve to the polygon with the lowest code, which makes
+    the result independent of input order and chunking.
+    """
+
+    def __init__(
+        self,
+        df: gpd.GeoDataFrame,
+        codes: tuple[str, ...] = CODES,
+        chunk_size: int = CHUNK_SIZE,
+        workers: Optional[int] = None,
+    ):
+        """Initialise reverse geocoder.
+
+        Args:
+            df: polygons with code columns
+            codes: code columns to return, sorted on to break border ties
+            chunk_size: number of points per GEOS call
+            workers: number of threads, defaults to number of CPUs
+        """
+        df = df.to_crs(config_50.espg_3006).sort_values(list(codes)).reset_index(drop=True)
+
+        self._chunk_size = chunk_size
+        self._workers = workers
+        self._geometry = df.geometry.to_numpy()
+        self._code_values = {code: np.array([*df[code], None], dtype=object) for code in codes}
+
+        shapely.prepare(self._geometry)
+        self._tree = shapely.STRtree(self._geometry)
+        self._bounds = shapely.total_bounds(self._geometry)
+
+    @classmethod
+    def from_admin_borders(cls, admin_borders: "AdminBorders", **kwargs) -> "ReverseGeocoder":
+        """Initialise reverse geocoder from municipality borders.
+
+        Args:
+            admin_borders: admin borders client
+            **kwargs: keyword arguments passed to the constructor
+
+        Returns:
+            reverse geocoder
+        """
+        municipalities = admin_borders.get_municipalities(crs=config_50.espg_3006)
+        return cls(features_to_geodataframe(municipalities, config_50.espg_3006), **kwargs)
+
+    @staticmethod
+    def _to_sweref(x: np.ndarray, y: np.ndarray, crs: str) -> tuple[np.ndarray, np.ndarray]:
+        """Transform coordinates to SWEREF 99 TM.
+
+        Args:
+            x: x coordinates or longitudes
+            y: y coordinates or latitudes
+            crs: CRS of coordinates
+
+        Returns:
+            transformed coordinates
+        """
+        if CRS.from_user_input(crs).to_epsg() == 3006:
+            return x, y
+
+        transformer = Transformer.from_crs(crs, config_50.espg_3006, always_xy=True)
+        return transformer.transform(x, y)
+
+    def _lookup_chunk(
+        self, x: np.ndarray, y: np.ndarray, bbox_only: bool, index: np.ndarray
+    ) -> np.ndarray:
+        """Look up polygon index for a chunk of points.
+
+        Args:
+            x: x coordinates
+            y: y coordinates
+            bbox_only: only test against polygon bounding boxes
+            index: indices of points in chunk
+
+        Returns:
+            polygon index per point in chunk
+        """
+        chunk_x, chunk_y = x[index], y[index]
+        point_index, polygon_index = self._tree.query(shapely.points(chunk_x, chunk_y))
+
+        if bbox_only is False:
+            hit = shapely.intersects_xy(
+                self._geometry[polygon_index], chunk_x[point_index], chunk_y[point_index]
+            )
+            point_index, polygon_index = point_index[hit], polygon_index[hit]
+
+        no_match = len(self._geometry)
+        result = np.full(len(index), no_match, dtype=np.intp)
+        np.minimum.at(result, point_index, polygon_index)
+        result[result == no_match] = NO_MATCH
+
+        return result
+
+    def lookup_index(
+        self, x: np.ndarray, y: np.ndarray, crs: str = config_50.espg_3006, bbox_only: bool = False
+    ) -> np.ndarray:
+        """Look up index of the polygon containing each point.
+
+        Args:
+            x: x coordinates or longitudes
+            y: y coordinates or latitudes
+            crs: CRS of coordinates, e.g. EPSG:3006 or EPSG:4326
+            bbox_only: only test against polygon bounding boxes, fast but approximate
+
+        Returns:
+            polygon index per point, -1 where no polygon matches
+        """
+        x, y = self._to_sweref(np.asarray(x, dtype=float), np.asarray(y, dtype=float), crs)
+        result = np.full(len(x), NO_MATCH, dtype=np.intp)
+
+        min_x, min_y, max_x, max_y = self._bounds
+        candidates = np.flatnonzero((x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y))
+        if len(candidates) == 0:
+            return result
+
+        chunks = np.array_split(candidates, ceil(len(candidates) / self._chunk_size))
+        lookup_chunk = partial(self._lookup_chunk, x, y, bbox_only)
+
+        with ThreadPoolExecutor(self._workers) as executor:
+            for chunk, polygon_index in zip(
+                chunks, executor.map(lookup_chunk, chunks), strict=True
+            ):
+                result[chunk] = polygon_index
+
+        return result
+
+    def lookup(
+        self, x: np.ndarray, y: np.ndarray, crs: str = config_50.espg_3006, bbox_only: bool = False
+    ) -> dict[str, np.ndarray]:
+        """Look up codes of the polygon containing each point.
+
+        Args:
+            x: x coordinates or longitudes
+            y: y coordinates or latitudes
+            crs: CRS of coordinates, e.g. EPSG:3006 or EPSG:4326
+            bbox_only: only test against polygon bounding boxes, fast but approximate
+
+        Returns:
+            code arrays keyed by code column, None where no polygon matches
+        """
+        index = self.lookup_index(x, y, crs, bbox_only)
+        return {code: values[index] for code, values in self._code_values.items()}
@@ -0,0 +1,281 @@
+"""Scheduler module."""
+
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Hashable, Optional
+
+from lantmateriet.utils import available_cpus
+
+MEMORY_PER_WORKER = 2 * 1024**3
+MEMORY_BUDGET_FRACTION = 0.8
+HEAVY_FRACTION = 0.25
+HEAVY_WORKERS = 1
+RETRIES = 2
+MEMINFO = "/proc/meminfo"
+MEM_AVAILABLE = "MemAvailable:"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Task:
+    """Schedulable task.
+
+    Args:
+        key: unique task key, e.g. (file, layer, name)
+        args: arguments of the task function
+        cost: estimated cost, tasks with highest cost are started first
+        memory: estimated peak memory in bytes
+        details: what the estimates are based on, e.g. feature and vertex counts
+    """
+
+    key: Hashable
+    args: tuple
+    cost: float = 0.0
+    memory: int = 0
+    details: dict = field(default_factory=dict)
+
+
+def available_memory() -> int:
+    """Get available physical memory.
+
+    Returns:
+        available memory in bytes
+    """
+    try:
+        with open(MEMINFO, "r") as f:
+            for line in f:
+                if line.startswith(MEM_AVAILABLE):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+
+
+def auto_workers(memory_per_worker: int = MEMORY_PER_WORKER) -> int:
+    """Get number of workers from CPU count and available memory.
+
+    Args:
+        memory_per_worker: memory to reserve per worker in bytes
+
+    Returns:
+        number of workers
+    """
+    return max(1, min(available_cpus(), available_memory() // memory_per_worker))
+
+
+@lru_cache
+def _remote(function: Callable) -> Any:
+    """Register function as Ray remote function once.
+
+    Ray is imported here, so modules using the scheduler can be imported without it.
+
+    Args:
+        function: function to register
+
+    Returns:
+        Ray remote function
+    """
+    import ray
+
+    return ray.remote(function)
+
+
+def ray_submit(function: Callable, args: tuple) -> Future:
+    """Submit function as a Ray task.
+
+    Args:
+        function: function to run
+        args: arguments of function
+
+    Returns:
+        future of result
+    """
+    return _remote(function).remote(*args).future()
+
+
+class TaskScheduler:
+    """Flat task scheduler with memory admission control.
+
+    Runs all tasks on one set of workers. Tasks are started in order of decreasing cost
+    and a new task is started as soon as any worker is free, so a single large task
+    does not hold back the others.
+
+    A task is only admitted while the estimated memory of all running tasks stays within
+    the memory budget. Tasks estimated above the heavy threshold run in a separate lane
+    with lower concurrency. A waiting heavy task blocks admission of other tasks, so it
+    is not starved by smaller tasks filling up the budget. A task is always admitted when
+    nothing is running, even if it exceeds the budget on its own.
+
+    A failing task does not stop the others. Failed tasks are retried in rounds after
+    all other tasks finished, each round with half the concurrency of the previous one,
+    since failures are often caused by memory pressure. Tasks still failing after the
+    last retry are collected in `failures`.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        submit: Callable[[Callable, tuple], Future] = ray_submit,
+        memory_budget: Optional[int] = None,
+        heavy_memory: Optional[int] = None,
+        heavy_workers: int = HEAVY_WORKERS,
+        retries: int = RETRIES,
+    ):
+        """Initialise scheduler.
+
+        Args:
+            workers: number of concurrent tasks, tuned from CPUs and memory by default
+            submit: function submitting a task and returning a future
+            memory_budget: memory budget in bytes, a share of available memory by default
+            heavy_memory: memory threshold of heavy tasks, a share of the budget by default
+            heavy_workers: number of concurrent heavy tasks
+            retries: max number of retries of a failed task
+        """
+        self.workers = auto_workers() if workers is None else workers
+        self.memory_budget = (
+            int(available_memory() * MEMORY_BUDGET_FRACTION)
+            if memory_budget is None
+            else memory_budget
+        )
+        self.heavy_memory = (
+            int(self.memory_budget * HEAVY_FRACTION) if heavy_memory is None else heavy_memory
+        )
+        self.heavy_workers = heavy_workers
+        self.retries = retries
+        self.failures: dict[Hashable, BaseException] = {}
+        self._submit = submit
+
+    def is_heavy(self, task: Task) -> bool:
+        """Check if task runs in the heavy lane.
+
+        Args:
+            task: task to check
+
+        Returns:
+            true if heavy
+        """
+        return task.memory >= self.heavy_memory
+
+    def _admit(
+        self, lanes: tuple[list[Task], list[Task]], running: dict[Future, Task], workers: int
+    ) -> Optional[Task]:
+        """Take next task that can be admitted.
+
+        Args:
+            lanes: pending heavy and light tasks, in order of decreasing cost
+            running: running tasks
+            workers: number of concurrent tasks
+
+        Returns:
+            admitted task, None if no task can be admitted
+        """
+        if len(running) >= workers:
+            return None
+
+        heavy, light = lanes
+        running_memory = sum(task.memory for task in running.values())
+        running_heavy = sum(self.is_heavy(task) for task in running.values())
+
+        for lane, open_lane in ((heavy, running_heavy < self.heavy_workers), (light, True)):
+            if not lane or open_lane is False:
+                continue
+
+            if len(running) == 0 or running_memory + lane[0].memory <= self.memory_budget:
+                return lane.pop(0)
+
+            return None
+
+        return None
+
+    def _run_round(
+        self,
+        function: Callable,
+        tasks: list[Task],
+        workers: int,
+        on_done: Optional[Callable[[Task, Any], None]],
+    ) -> tuple[dict[Hashable, Any], dict[Hashable, BaseException]]:
+        """Run function on tasks once.
+
+        Args:
+            function: function to run
+            tasks: tasks to run
+            workers: number of concurrent tasks
+            on_done: called with task and result as each task finishes
+
+        Returns:
+            results and errors by task key
+        """
+        pending = sorted(tasks, key=lambda task: task.cost, reverse=True)
+        lanes = (
+            [task for task in pending if self.is_heavy(task)],
+            [task for task in pending if not self.is_heavy(task)],
+        )
+        running: dict[Future, Task] = {}
+        results = {}
+        errors: dict[Hashable, BaseException] = {}
+
+        logger.info(
+            f"Running {len(pending)} tasks ({len(lanes[0])} heavy) on {workers} workers "
+            f"within {self.memory_budget / 1024**3:.1f} GiB."
+        )
+
+        while lanes[0] or lanes[1] or running:
+            while (task := self._admit(lanes, running, workers)) is not None:
+                running[self._submit(function, task.args)] = task
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                try:
+                    results[task.key] = future.result()
+                except Exception as error:
+                    logger.warning(f"Task {task.key} failed: {error!r}")
+                    errors[task.key] = error
+                    continue
+
+                if on_done is not None:
+                    on_done(task, results[task.key])
+
+        return results, errors
+
+    def run(
+        self,
+        function: Callable,
+        tasks: list[Task],
+        on_done: Optional[Callable[[Task, Any], None]] = None,
+    ) -> dict[Hashable, Any]:
+        """Run function on all tasks, retrying failed tasks.
+
+        Args:
+            function: function to run
+            tasks: tasks to run
+            on_done: called with task and result as each task finishes, e.g. to checkpoint
+
+        Returns:
+            results by task key, without failed tasks
+        """
+        results: dict[Hashable, Any] = {}
+        workers = self.workers
+
+        for attempt in range(self.retries + 1):
+            if attempt > 0:
+                workers = max(1, workers // 2)
+                logger.info(f"Retrying {len(tasks)} failed tasks, attempt {attempt}.")
+
+            round_results, self.failures = self._run_round(function, tasks, workers, on_done)
+            results |= round_results
+
+            if len(self.failures) == 0:
+                break
+
+            tasks = [task for task in tasks if task.key in self.failures]
+
+        for key, error in self.failures.items():
+            logger.error(f"Task {key} failed after {self.retries} retries: {error!r}")
+
+        return results
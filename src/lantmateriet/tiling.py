@@ -0,0 +1,136 @@
+"""Grid tiling module.
+
+Splits outputs by a fixed SWEREF 99 TM grid. Each feature is assigned to exactly one
+tile, the one containing its representative point, so features are not cut and tiles
+can be read independently. A tile index records the extent of each tile's features, in
+the grid CRS also when tiles are saved in another CRS.
+"""
+
+import json
+from os import path
+from typing import Optional
+
+import numpy as np
+import shapely
+
+from lantmateriet.config import config_50
+
+TILE_SIZE = 50_000
+INDEX_FILE = "index.json"
+
+
+def tile_name(tile: tuple[int, int]) -> str:
+    """Get name of tile.
+
+    Args:
+        tile: tile column and row
+
+    Returns:
+        tile name
+    """
+    return f"{tile[0]}_{tile[1]}"
+
+
+def tile_bounds(tile: tuple[int, int], tile_size: float) -> list[float]:
+    """Get bounds of grid cell of tile.
+
+    Args:
+        tile: tile column and row
+        tile_size: tile size in metres
+
+    Returns:
+        bounds as [minx, miny, maxx, maxy]
+    """
+    column, row = tile
+    return [column * tile_size, row * tile_size, (column + 1) * tile_size, (row + 1) * tile_size]
+
+
+def group_by_tile(
+    geometries: np.ndarray, tile_size: float = TILE_SIZE
+) -> dict[tuple[int, int], np.ndarray]:
+    """Group geometries by the grid tile of their representative point.
+
+    Args:
+        geometries: shapely geometry array in SWEREF 99 TM
+        tile_size: tile size in metres
+
+    Returns:
+        row indices by tile, in sorted tile order
+    """
+    if len(geometries) == 0:
+        return {}
+
+    points = shapely.point_on_surface(geometries)
+    columns = np.floor(shapely.get_x(points) / tile_size).astype(np.int64)
+    rows = np.floor(shapely.get_y(points) / tile_size).astype(np.int64)
+
+    tiles, inverse = np.unique(np.column_stack([columns, rows]), axis=0, return_inverse=True)
+    order = np.argsort(inverse.ravel(), kind="stable")
+    splits = np.cumsum(np.bincount(inverse.ravel(), minlength=len(tiles)))[:-1]
+
+    return {
+        (int(column), int(row)): indices
+        for (column, row), indices in zip(tiles, np.split(order, splits), strict=True)
+    }
+
+
+def write_index(
+    folder_path: str, tiles: list[dict], tile_size: float, file_ending: str, crs: str
+) -> None:
+    """Write tile index.
+
+    Tiles are saved in the given CRS, while their grid bounds and extents are in the
+    SWEREF 99 TM grid, recorded as the extent CRS.
+
+    Args:
+        folder_path: folder of tiles
+        tiles: tile entries with tile, file, bounds, extent and features
+        tile_size: tile size in metres
+        file_ending: file type of tiles
+        crs: CRS of tile files
+    """
+    index = {
+        "crs": crs,
+        "extent_crs": config_50.espg_3006,
+        "tile_size": tile_size,
+        "file_ending": file_ending,
+        "tiles": tiles,
+    }
+    with open(path.join(folder_path, INDEX_FILE), "w") as f:
+        json.dump(index, f, indent=2)
+
+
+class TileIndex:
+    """Index of a tiled output."""
+
+    def __init__(self, folder_path: str):
+        """Initialise tile index from a tiled output.
+
+        Args:
+            folder_path: folder of tiles
+        """
+        self._path = folder_path
+
+        with open(path.join(folder_path, INDEX_FILE), "r") as f:
+            self.index = json.load(f)
+
+    def files(self, bbox: Optional[tuple[float, float, float, float]] = None) -> list[str]:
+        """Get files of tiles with features intersecting bbox.
+
+        Args:
+            bbox: bounding box in SWEREF 99 TM, all tiles by default
+
+        Returns:
+            paths to tile files
+        """
+        return [
+            path.join(self._path, tile["file"])
+            for tile in self.index["tiles"]
+            if bbox is None
+            or (
+                tile["extent"][0] <= bbox[2]
+                and tile["extent"][2] >= bbox[0]
+                and tile["extent"][1] <= bbox[3]
+                and tile["extent"][3] >= bbox[1]
+            )
+        ]
@@ -0,0 +1,352 @@
+"""Topology module."""
+
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from pyproj import CRS
+
+from lantmateriet.config import config_50
+from lantmateriet.utils import features_to_geodataframe
+
+if TYPE_CHECKING:
+    from lantmateriet.admin_borders import AdminBorders
+
+COUNTRY = "rike"
+COUNTIES = "lan"
+MUNICIPALITIES = "kommuner"
+MIN_RING_COORDINATES = 4
+
+Rings = list[list[int]]
+Polygons = list[Rings]
+
+
+@dataclass
+class TopologyObject:
+    """Topology object holding feature properties and arc references per feature.
+
+    Each feature is a list of polygons, each polygon a list of rings (exterior first)
+    and each ring a list of arc references.
+    """
+
+    properties: pd.DataFrame
+    geometries: list[Polygons]
+
+
+class Topology:
+    """Shared-arc topology of polygon layers.
+
+    Ring boundaries of all layers are noded together and merged into arcs between
+    junctions, so a border shared by two municipalities, or by a municipality and its
+    county, is stored once. Rings reference arcs by index, where ~i means arc i reversed,
+    following TopoJSON. Simplifying arcs instead of polygons keeps arc end points fixed,
+    so neighbours stay gap free at every tolerance.
+    """
+
+    def __init__(self, arcs: list[np.ndarray], objects: dict[str, TopologyObject], crs: Any):
+        """Initialise topology.
+
+        Args:
+            arcs: arc coordinates
+            objects: topology objects by name
+            crs: CRS of arc coordinates
+        """
+        self.arcs = arcs
+        self.objects = objects
+        self.crs = None if crs is None else CRS.from_user_input(crs)
+
+    @staticmethod
+    def _chain_arcs(arc_indices: np.ndarray, start: np.ndarray, end: np.ndarray) -> list[int]:
+        """Chain arcs covered by a ring into ring order.
+
+        Args:
+            arc_indices: indices of arcs covered by ring
+            start: start point of all arcs
+            end: end point of all arcs
+
+        Returns:
+            ordered arc references
+
+        Raises:
+            ValueError
+        """
+        first, *rest = (int(i) for i in arc_indices)
+        references = [first]
+        current = tuple(end[first])
+        remaining = set(rest)
+
+        while remaining:
+            for arc in remaining:
+                if tuple(start[arc]) == current:
+                    references.append(arc)
+                    current = tuple(end[arc])
+                    break
+
+                if tuple(end[arc]) == current:
+                    references.append(~arc)
+                    current = tuple(start[arc])
+                    break
+            else:
+                raise ValueError("Could not chain arcs into a closed ring.")
+
+            remaining.remove(arc)
+
+        return references
+
+    @classmethod
+    def from_geodataframes(cls, dfs: dict[str, gpd.GeoDataFrame]) -> "Topology":
+        """Build topology from polygon layers sharing CRS.
+
+        Args:
+            dfs: polygon layers by object name
+
+        Returns:
+            topology
+
+        Raises:
+            ValueError
+        """
+        crs = next(iter(dfs.values())).crs
+
+        layer_rings = []
+        for df in dfs.values():
+            parts, feature_index = shapely.get_parts(df.geometry.to_numpy(), return_index=True)
+            rings, part_index = shapely.get_rings(parts, return_index=True)
+            layer_rings.append((rings, feature_index[part_index], part_index))
+
+        all_rings = np.concatenate([rings for rings, _, _ in layer_rings])
+        arcs = shapely.get_parts(shapely.line_merge(shapely.union_all(all_rings)))
+        start = shapely.get_coordinates(shapely.get_point(arcs, 0))
+        end = shapely.get_coordinates(shapely.get_point(arcs, -1))
+
+        ring_index, arc_index = shapely.STRtree(arcs).query(all_rings, predicate="covers")
+        order = np.argsort(ring_index, kind="stable")
+        covered_rings, splits = np.unique(ring_index[order], return_index=True)
+        ring_arcs = dict(zip(covered_rings, np.split(arc_index[order], splits[1:]), strict=True))
+
+        objects = {}
+        offset = 0
+        for (name, df), (rings, feature_index, part_index) in zip(
+            dfs.items(), layer_rings, strict=True
+        ):
+            geometries: list[Polygons] = [[] for _ in range(len(df))]
+            previous_part = -1
+            for i in range(len(rings)):
+                if offset + i not in ring_arcs:
+                    raise ValueError(
+                        f"Ring {i} of {name} is not covered by any arc, "
+                        "shared borders may not be noded exactly."
+                    )
+
+                references = cls._chain_arcs(ring_arcs[offset + i], start, end)
+                if part_index[i] != previous_part:
+                    geometries[feature_index[i]].append([])
+                    previous_part = part_index[i]
+
+                geometries[feature_index[i]][-1].append(references)
+
+            offset += len(rings)
+            objects[name] = TopologyObject(
+                pd.DataFrame(df.drop(columns=df.geometry.name)).reset_index(drop=True),
+                geometries,
+            )
+
+        return cls([shapely.get_coordinates(arc) for arc in arcs], objects, crs)
+
+    @classmethod
+    def from_admin_borders(
+        cls, admin_borders: "AdminBorders", crs: str = config_50.espg_3006
+    ) -> "Topology":
+        """Build topology of country, county and municipality borders.
+
+        Args:
+            admin_borders: admin borders client
+            crs: CRS to request borders in, should be projected for simplification
+
+        Returns:
+            topology
+        """
+        return cls.from_geodataframes(
+            {
+                COUNTRY: features_to_geodataframe(admin_borders.get_country(crs=crs), crs),
+                COUNTIES: features_to_geodataframe(admin_borders.get_counties(crs=crs), crs),
+                MUNICIPALITIES: features_to_geodataframe(
+                    admin_borders.get_municipalities(crs=crs), crs
+                ),
+            }
+        )
+
+    def simplify(self, tolerance: float) -> "Topology":
+        """Simplify topology, each shared arc is simplified once.
+
+        Args:
+            tolerance: simplification tolerance in CRS units
+
+        Returns:
+            simplified topology
+        """
+        lines = shapely.simplify(
+            [shapely.LineString(arc) for arc in self.arcs], tolerance, preserve_topology=True
+        )
+        return Topology([shapely.get_coordinates(line) for line in lines], self.objects, self.crs)
+
+    def simplify_many(self, tolerances: list[float]) -> dict[float, "Topology"]:
+        """Simplify topology at several tolerances.
+
+        Args:
+            tolerances: simplification tolerances in CRS units
+
+        Returns:
+            simplified topologies by tolerance
+        """
+        return {tolerance: self.simplify(tolerance) for tolerance in tolerances}
+
+    def _ring_coordinates(self, references: list[int]) -> np.ndarray:
+        """Join arcs into ring coordinates.
+
+        Args:
+            references: arc references
+
+        Returns:
+            ring coordinates
+        """
+        parts = []
+        for i, reference in enumerate(references):
+            arc = self.arcs[reference] if reference >= 0 else self.arcs[~reference][::-1]
+            parts.append(arc if i == 0 else arc[1:])
+
+        return np.concatenate(parts)
+
+    def _polygon(self, rings: Rings) -> Optional[shapely.Polygon]:
+        """Build polygon from rings, dropping rings collapsed by simplification.
+
+        Args:
+            rings: arc references per ring, exterior first
+
+        Returns:
+            polygon or None if exterior collapsed
+        """
+        shell, *holes = (self._ring_coordinates(references) for references in rings)
+        if len(shell) < MIN_RING_COORDINATES:
+            return None
+
+        return shapely.Polygon(shell, [hole for hole in holes if len(hole) >= MIN_RING_COORDINATES])
+
+    def to_geodataframe(self, name: str) -> gpd.GeoDataFrame:
+        """Build GeoDataFrame of topology object.
+
+        Args:
+            name: object name
+
+        Returns:
+            GeoDataFrame with MultiPolygon geometries
+        """
+        topology_object = self.objects[name]
+        geometry = []
+        for polygons in topology_object.geometries:
+            parts = [self._polygon(rings) for rings in polygons]
+            geometry.append(shapely.MultiPolygon([part for part in parts if part is not None]))
+
+        return gpd.GeoDataFrame(topology_object.properties, geometry=geometry, crs=self.crs)
+
+    def _quantize(self, quantization: int) -> tuple[list[list[list[int]]], dict]:
+        """Quantize and delta-encode arcs.
+
+        Args:
+            quantization: number of quantization steps per axis
+
+        Returns:
+            encoded arcs and TopoJSON transform
+        """
+        all_coordinates = np.concatenate(self.arcs)
+        translate = all_coordinates.min(axis=0)
+        scale = (all_coordinates.max(axis=0) - translate) / (quantization - 1)
+        scale[scale == 0] = 1
+
+        arcs = []
+        for arc in self.arcs:
+            quantized = np.round((arc - translate) / scale).astype(np.int64)
+            keep = np.ones(len(quantized), dtype=bool)
+            keep[1:-1] = np.any(np.diff(quantized, axis=0)[:-1] != 0, axis=1)
+            quantized = quantized[keep]
+            arcs.append(np.vstack([quantized[:1], np.diff(quantized, axis=0)]).tolist())
+
+        return arcs, {"scale": scale.tolist(), "translate": translate.tolist()}
+
+    @staticmethod
+    def _records(properties: pd.DataFrame) -> list[dict]:
+        """Convert properties to JSON serialisable records.
+
+        Args:
+            properties: feature properties
+
+        Returns:
+            one record per feature
+        """
+        if len(properties.columns) == 0:
+            return [{} for _ in range(len(properties))]
+
+        return json.loads(properties.to_json(orient="records", date_format="iso"))
+
+    def to_topojson(self, quantization: Optional[int] = None) -> dict:
+        """Serialise topology to TopoJSON.
+
+        Args:
+            quantization: number of quantization steps per axis, None to store full precision
+
+        Returns:
+            TopoJSON topology
+        """
+        topology: dict[str, Any] = {"type": "Topology"}
+        if quantization is None:
+            topology["arcs"] = [arc.tolist() for arc in self.arcs]
+        else:
+            topology["arcs"], topology["transform"] = self._quantize(quantization)
+
+        topology["objects"] = {
+            name: {
+                "type": "GeometryCollection",
+                "geometries": [
+                    {"type": "MultiPolygon", "arcs": polygons, "properties": properties}
+                    for polygons, properties in zip(
+                        topology_object.geometries,
+                        self._records(topology_object.properties),
+                        strict=True,
+                    )
+                ],
+            }
+            for name, topology_object in self.objects.items()
+        }
+        topology["crs"] = None if self.crs is None else self.crs.to_string()
+
+        return topology
+
+    @classmethod
+    def from_topojson(cls, topology: dict) -> "Topology":
+        """Deserialise topology from TopoJSON.
+
+        Args:
+            topology: TopoJSON topology
+
+        Returns:
+            topology
+        """
+        arcs = [np.asarray(arc, dtype=float) for arc in topology["arcs"]]
+        if "transform" in topology:
+            scale = np.asarray(topology["transform"]["scale"])
+            translate = np.asarray(topology["transform"]["translate"])
+            arcs = [np.cumsum(arc, axis=0) * scale + translate for arc in arcs]
+
+        objects = {
+            name: TopologyObject(
+                pd.DataFrame([geometry["properties"] for geometry in item["geometries"]]),
+                [geometry["arcs"] for geometry in item["geometries"]],
+            )
+            for name, item in topology["objects"].items()
+        }
+
+        return cls(arcs, objects, topology.get("crs"))
@@ -0,0 +1,399 @@
+"""Tracing module.
+
+Spans record the wall time, CPU time, feature count and bytes of pipeline stages. They
+are only kept while tracing is enabled, so instrumented code costs next to nothing
+otherwise. Each process appends its spans to a trace folder, and the spans of all
+workers are merged into a Chrome trace and a summary table of stages.
+
+With memory accounting, spans also record the peak RSS and the peak memory traced by
+tracemalloc. Both peaks are reset when a span starts, and nested spans pass their
+peaks on to the enclosing span, so each span gets its own high-water mark. Memory is
+only accounted for spans in the thread that started tracing.
+"""
+
+import glob
+import json
+import os
+import shutil
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from os import path
+from typing import Hashable, Iterator, Optional
+
+from lantmateriet.memory import current_rss, peak_rss, reset_peak_rss
+from lantmateriet.utils import format_table
+
+TRACE_FOLDER = ".trace"
+TRACE_FILE = "trace.json"
+TASK_SPAN = "task"
+SUMMARY_COLUMNS = ("stage", "calls", "wall_s", "cpu_s", "features", "mb", "features_per_s")
+
+
+@dataclass
+class Span:
+    """Timed pipeline stage.
+
+    Args:
+        name: stage name, e.g. read or dissolve
+        start: start time in nanoseconds since the epoch
+        wall: wall time in nanoseconds
+        cpu: CPU time of the process in nanoseconds
+        pid: process id
+        tid: thread id
+        task: key of task the stage ran in, e.g. (file, layer, name)
+        features: number of features handled
+        nbytes: number of bytes handled
+        rss: RSS at start in bytes, with memory accounting
+        peak_rss: peak RSS in bytes, with memory accounting
+        peak_traced: peak memory traced by tracemalloc in bytes, with memory accounting
+    """
+
+    name: str
+    start: int = 0
+    wall: int = 0
+    cpu: int = 0
+    pid: int = 0
+    tid: int = 0
+    task: Optional[list] = None
+    features: int = 0
+    nbytes: int = 0
+    rss: int = 0
+    peak_rss: int = 0
+    peak_traced: int = 0
+
+
+class _State:
+    """Tracing state of process."""
+
+    enabled: bool = False
+    memory: bool = False
+    task: Optional[list] = None
+    thread: Optional[int] = None
+    peaks: list[list[int]] = []
+
+
+_spans: list[Span] = []
+_state = _State()
+_lock = threading.Lock()
+
+
+def enable(memory: bool = False) -> None:
+    """Start keeping spans in this process.
+
+    Args:
+        memory: account peak memory of spans, starting tracemalloc
+    """
+    _state.enabled = True
+    _state.memory = memory
+    if memory is True:
+        _state.thread = threading.get_ident()
+        _state.peaks = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+def disable() -> None:
+    """Stop keeping spans in this process, and stop tracemalloc if accounting memory."""
+    if _state.memory is True and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+    _state.enabled = False
+    _state.memory = False
+
+
+def _enter_memory(current: Span) -> None:
+    """Reset memory peaks at start of span, passing peaks so far to enclosing span.
+
+    Args:
+        current: span starting
+    """
+    if len(_state.peaks) > 0:
+        _exit_peaks(_state.peaks[-1])
+
+    current.rss = current_rss()
+    reset_peak_rss()
+    tracemalloc.reset_peak()
+    _state.peaks.append([0, 0])
+
+
+def _exit_peaks(peaks: list[int]) -> None:
+    """Update peaks with current peak RSS and traced memory.
+
+    Args:
+        peaks: peak RSS and traced memory so far
+    """
+    peaks[0] = max(peaks[0], peak_rss())
+    peaks[1] = max(peaks[1], tracemalloc.get_traced_memory()[1])
+
+
+def _exit_memory(current: Span) -> None:
+    """Set memory peaks at end of span, passing them to enclosing span.
+
+    Args:
+        current: span ending
+    """
+    peaks = _state.peaks.pop()
+    _exit_peaks(peaks)
+    current.peak_rss, current.peak_traced = peaks
+
+    if len(_state.peaks) > 0:
+        enclosing = _state.peaks[-1]
+        enclosing[0] = max(enclosing[0], peaks[0])
+        enclosing[1] = max(enclosing[1], peaks[1])
+
+
+def is_enabled() -> bool:
+    """Check if spans are kept in this process.
+
+    Returns:
+        true if enabled
+    """
+    return _state.enabled is True
+
+
+@contextmanager
+def span(name: str, features: int = 0, nbytes: int = 0) -> Iterator[Span]:
+    """Time a stage, kept as a span if tracing is enabled.
+
+    Features and bytes can also be set on the yielded span, e.g. once a result is known.
+
+    Args:
+        name: stage name
+        features: number of features handled
+        nbytes: number of bytes handled
+
+    Yields:
+        span of stage
+    """
+    task = _state.task
+    current = Span(name, features=features, nbytes=nbytes, task=task)
+    if not is_enabled():
+        yield current
+        return
+
+    memory = _state.memory is True and threading.get_ident() == _state.thread
+    if memory is True:
+        _enter_memory(current)
+
+    current.start = time.time_ns()
+    wall = time.perf_counter_ns()
+    cpu = time.process_time_ns()
+    try:
+        yield current
+    finally:
+        current.wall = time.perf_counter_ns() - wall
+        current.cpu = time.process_time_ns() - cpu
+        if memory is True:
+            _exit_memory(current)
+        current.pid = os.getpid()
+        current.tid = threading.get_ident()
+        with _lock:
+            _spans.append(current)
+
+
+def spans() -> list[Span]:
+    """Get spans kept in this process.
+
+    Returns:
+        spans, in order of completion
+    """
+    with _lock:
+        return list(_spans)
+
+
+def flush(trace_path: str) -> None:
+    """Append spans kept in this process to the trace folder and forget them.
+
+    Args:
+        trace_path: trace folder
+    """
+    with _lock:
+        records, _spans[:] = list(_spans), []
+
+    if len(records) == 0:
+        return
+
+    with open(path.join(trace_path, f"{os.getpid()}.jsonl"), "a") as f:
+        for record in records:
+            f.write(json.dumps(asdict(record)) + "\n")
+
+
+@contextmanager
+def trace_task(trace_path: str, key: Hashable, memory: bool = False) -> Iterator[Span]:
+    """Trace a task, e.g. in a worker, and append its spans to the trace folder.
+
+    Args:
+        trace_path: trace folder
+        key: task key
+        memory: account peak memory of spans
+
+    Yields:
+        span of task
+    """
+    enabled = is_enabled()
+    enable(memory)
+    _state.task = list(key) if isinstance(key, tuple) else [key]
+    try:
+        with span(TASK_SPAN) as task_span:
+            yield task_span
+    finally:
+        _state.task = None
+        flush(trace_path)
+        if enabled is False:
+            disable()
+
+
+def start(target_path: str, memory: bool = False) -> str:
+    """Start tracing in this process with an empty trace folder.
+
+    Args:
+        target_path: extraction target directory
+        memory: account peak memory of spans
+
+    Returns:
+        path to trace folder
+    """
+    trace_path = path.join(target_path, TRACE_FOLDER)
+    shutil.rmtree(trace_path, ignore_errors=True)
+    os.makedirs(trace_path)
+    enable(memory)
+    return trace_path
+
+
+def load_spans(trace_path: str) -> list[Span]:
+    """Load spans of all processes from trace folder.
+
+    Args:
+        trace_path: trace folder
+
+    Returns:
+        spans, in order of start time
+    """
+    loaded: list[Span] = []
+    for trace_file in glob.glob(path.join(trace_path, "*.jsonl")):
+        with open(trace_file, "r") as f:
+            loaded.extend(Span(**json.loads(line)) for line in f)
+
+    return sorted(loaded, key=lambda item: item.start)
+
+
+def chrome_trace(trace_spans: list[Span]) -> dict:
+    """Convert spans to Chrome trace format, e.g. for chrome://tracing or Perfetto.
+
+    Args:
+        trace_spans: spans
+
+    Returns:
+        trace with one complete event per span
+    """
+    return {
+        "traceEvents": [
+            {
+                "name": item.name,
+                "cat": "lantmateriet",
+                "ph": "X",
+                "ts": item.start / 1000,
+                "dur": item.wall / 1000,
+                "pid": item.pid,
+                "tid": item.tid,
+                "args": {
+                    "task": item.task,
+                    "cpu": item.cpu,
+                    "features": item.features,
+                    "nbytes": item.nbytes,
+                    "rss": item.rss,
+                    "peak_rss": item.peak_rss,
+                    "peak_traced": item.peak_traced,
+                },
+            }
+            for item in trace_spans
+        ],
+        "displayTimeUnit": "ms",
+    }
+
+
+def read_trace(trace_file: str) -> list[Span]:
+    """Read spans from Chrome trace.
+
+    Args:
+        trace_file: path to trace file
+
+    Returns:
+        spans
+    """
+    with open(trace_file, "r") as f:
+        events = json.load(f)["traceEvents"]
+
+    return [
+        Span(
+            event["name"],
+            int(event["ts"] * 1000),
+            int(event["dur"] * 1000),
+            event["args"]["cpu"],
+            event["pid"],
+            event["tid"],
+            event["args"]["task"],
+            event["args"]["features"],
+            event["args"]["nbytes"],
+            event["args"]["rss"],
+            event["args"]["peak_rss"],
+            event["args"]["peak_traced"],
+        )
+        for event in events
+    ]
+
+
+def save_trace(target_path: str, trace_path: str) -> str:
+    """Merge spans of trace folder into a Chrome trace and stop tracing.
+
+    Args:
+        target_path: extraction target directory
+        trace_path: trace folder
+
+    Returns:
+        path to trace file
+    """
+    flush(trace_path)
+    disable()
+
+    trace_file = path.join(target_path, TRACE_FILE)
+    with open(trace_file, "w") as f:
+        json.dump(chrome_trace(load_spans(trace_path)), f)
+
+    shutil.rmtree(trace_path, ignore_errors=True)
+    return trace_file
+
+
+def summary(trace_spans: list[Span]) -> str:
+    """Summarise spans by stage, in order of decreasing wall time.
+
+    Args:
+        trace_spans: spans
+
+    Returns:
+        table with one row per stage
+    """
+    stages: dict[str, list[Span]] = {}
+    for item in trace_spans:
+        stages.setdefault(item.name, []).append(item)
+
+    rows = []
+    for name, items in sorted(stages.items(), key=lambda stage: -sum(i.wall for i in stage[1])):
+        wall = sum(item.wall for item in items) / 1e9
+        features = sum(item.features for item in items)
+        rows.append(
+            (
+                name,
+                str(len(items)),
+                f"{wall:.3f}",
+                f"{sum(item.cpu for item in items) / 1e9:.3f}",
+                str(features),
+                f"{sum(item.nbytes for item in items) / 1024**2:.1f}",
+                f"{features / wall:.0f}" if wall > 0 and features > 0 else "",
+            )
+        )
+
+    return format_table(SUMMARY_COLUMNS, rows)
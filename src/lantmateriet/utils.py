@@ -1,15 +1,19 @@
 """Utils module."""
 
 import logging
+import os
 import time
 from functools import wraps
 from typing import Callable, Optional
 
 import geopandas as gpd
 import requests
+from pydantic import BaseModel
 from requests.auth import HTTPBasicAuth
 from unidecode import unidecode
 
+from lantmateriet.gpkg import unique_names
+
 logger = logging.getLogger(__name__)
 
 STATUS_OK = 200
@@ -44,8 +48,51 @@ def timeit(has_key: bool = False):
     return timeit_decorator
 
 
+def available_cpus() -> int:
+    """Get number of CPUs available to this process.
+
+    Returns:
+        number of CPUs
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def format_table(columns: tuple[str, ...], rows: list[tuple[str, ...]]) -> str:
+    """Format rows as a text table with left-aligned columns.
+
+    Args:
+        columns: column names
+        rows: rows of formatted values
+
+    Returns:
+        table with a header line
+    """
+    widths = [max(len(row[i]) for row in [columns, *rows]) for i in range(len(columns))]
+    return "\n".join(
+        "  ".join(value.ljust(width) for value, width in zip(row, widths, strict=True)).rstrip()
+        for row in [columns, *rows]
+    )
+
+
 def read_unique_names(file: str, layer: str, field: str) -> list[str]:
-    """Read unique names from specified field in file."""
+    """Read unique names from specified field in file.
+
+    GeoPackages are queried with SQL, so the field column is never read.
+
+    Args:
+        file: file to read
+        layer: layer to read
+        field: field to get names of
+
+    Returns:
+        unique names, in sorted order
+    """
+    if file.endswith(".gpkg"):
+        return unique_names(file, layer, field)
+
     return sorted(
         list(
             set(
@@ -61,11 +108,43 @@ def read_unique_names(file: str, layer: str, field: str) -> list[str]:
     )
 
 
+def read_partitions(file: str, layer: str, field: str) -> dict[str, gpd.GeoDataFrame]:
+    """Read layer once and partition it by field.
+
+    Args:
+        file: file to read
+        layer: layer to read
+        field: field to partition by
+
+    Returns:
+        partitions by field value, in sorted order
+    """
+    df = gpd.read_file(file, layer=layer, engine="pyogrio", use_arrow=True)
+    return {
+        name: partition.reset_index(drop=True) for name, partition in df.groupby(field, sort=True)
+    }
+
+
 def read_first_entry(file: str, layer: str) -> gpd.GeoDataFrame:
     """Read info from file."""
     return gpd.read_file(file, use_arrow=True, layer=layer, rows=1)
 
 
+def features_to_geodataframe(features: list[BaseModel], crs: str) -> gpd.GeoDataFrame:
+    """Convert parsed GeoJSON features to GeoDataFrame.
+
+    Args:
+        features: pydantic GeoJSON features
+        crs: CRS of feature geometries
+
+    Returns:
+        GeoDataFrame with feature properties as columns
+    """
+    return gpd.GeoDataFrame.from_features(
+        [feature.model_dump(mode="json") for feature in features], crs=crs
+    )
+
+
 def normalise_item_names(item_names: list[str]) -> dict[str, str]:
     """Normalise item names to save format."""
     return {
@@ -0,0 +1,535 @@
+"""Vector tile module.
+
+Builds a PMTiles archive of Mapbox Vector Tiles from extracted outputs. Only file
+bounds and fields are read in the parent. Blocks of tiles of each layer and zoom level
+run in a process pool, each reading the features intersecting its block, simplifying
+them for the zoom level, and clipping and encoding them. Tiles of all layers are merged
+by concatenating their encoded layers, which is a valid MVT tile since a tile is a
+repeated field of layers.
+"""
+
+import glob
+import gzip
+import json
+import logging
+import math
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from os import path
+from typing import Iterator, Optional
+
+import geopandas as gpd
+import mapbox_vector_tile
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pyogrio
+import shapely
+from mapbox_vector_tile.encoder import on_invalid_geometry_make_valid
+from pmtiles.tile import Compression, TileType, zxy_to_tileid
+from pmtiles.writer import write
+from pyproj import Transformer
+
+from lantmateriet.config import config_50
+from lantmateriet.geoparquet import BBOX_NAME, GEOMETRY_NAME
+from lantmateriet.tiling import INDEX_FILE
+from lantmateriet.utils import available_cpus
+
+WEB_MERCATOR = "EPSG:3857"
+EARTH_CIRCUMFERENCE = 2 * math.pi * 6_378_137
+ORIGIN = EARTH_CIRCUMFERENCE / 2
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+TILE_PIXELS = 256
+BLOCK_SIZE = 16
+MIN_ZOOM = 0
+MAX_ZOOM = 12
+FILE_ENDINGS = ("fgb", "geojson", "parquet")
+PROPERTIES = ("objekttyp", "texttyp")
+SWEDEN_LAYER = "sverige"
+CRS_SUFFIX = re.compile(r"_epsg\d+$")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VectorLayer:
+    """Vector tile layer.
+
+    Args:
+        name: layer name
+        geometries: shapely geometry array in web mercator
+        properties: feature properties, one per geometry
+    """
+
+    name: str
+    geometries: np.ndarray
+    properties: list[dict]
+
+
+def tile_size(zoom: int) -> float:
+    """Get width of a tile at zoom in web mercator metres.
+
+    Args:
+        zoom: zoom level
+
+    Returns:
+        tile width
+    """
+    return EARTH_CIRCUMFERENCE / 2**zoom
+
+
+def tile_bounds(zoom: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """Get bounds of XYZ tile in web mercator.
+
+    Args:
+        zoom: zoom level
+        x: tile column
+        y: tile row, from the top
+
+    Returns:
+        bounds as (minx, miny, maxx, maxy)
+    """
+    size = tile_size(zoom)
+    return (
+        -ORIGIN + x * size,
+        ORIGIN - (y + 1) * size,
+        -ORIGIN + (x + 1) * size,
+        ORIGIN - y * size,
+    )
+
+
+def tile_range(bounds: tuple[float, float, float, float], zoom: int) -> tuple[int, int, int, int]:
+    """Get range of XYZ tiles covering bounds.
+
+    Args:
+        bounds: bounds in web mercator
+        zoom: zoom level
+
+    Returns:
+        first and last tile column and row as (x0, y0, x1, y1)
+    """
+    size = tile_size(zoom)
+    last = 2**zoom - 1
+    x0 = int(np.clip(math.floor((bounds[0] + ORIGIN) / size), 0, last))
+    x1 = int(np.clip(math.floor((bounds[2] + ORIGIN) / size), 0, last))
+    y0 = int(np.clip(math.floor((ORIGIN - bounds[3]) / size), 0, last))
+    y1 = int(np.clip(math.floor((ORIGIN - bounds[1]) / size), 0, last))
+    return x0, y0, x1, y1
+
+
+def resolution(zoom: int) -> float:
+    """Get size of a pixel at zoom in web mercator metres.
+
+    Args:
+        zoom: zoom level
+
+    Returns:
+        pixel size
+    """
+    return tile_size(zoom) / TILE_PIXELS
+
+
+def layer_name(file: str) -> str:
+    """Get vector layer name of output file.
+
+    Args:
+        file: output file, e.g. target/mark_sverige/mark/11_sjo.fgb or a tile of
+            target/mark_sverige/mark/11_sjo/3_130.fgb
+
+    Returns:
+        layer name, e.g. mark
+    """
+    if path.basename(file) == config_50.ground_sweden:
+        return SWEDEN_LAYER
+
+    parts = path.normpath(file).split(path.sep)
+    return parts[-3] if path.exists(path.join(path.dirname(file), INDEX_FILE)) else parts[-2]
+
+
+def is_extra_crs(file: str) -> bool:
+    """Check if output file, or tile of output, is saved in another CRS than EPSG:4326.
+
+    Args:
+        file: output file
+
+    Returns:
+        true if file has a CRS suffix
+    """
+    stems = [path.splitext(path.basename(file))[0], path.basename(path.dirname(file))]
+    return any(CRS_SUFFIX.search(stem) is not None for stem in stems)
+
+
+def find_outputs(source_path: str) -> dict[str, list[str]]:
+    """Find extracted outputs in EPSG:4326, including tiled outputs, by vector layer.
+
+    Args:
+        source_path: extraction target path
+
+    Returns:
+        output files by layer name, in sorted order
+    """
+    outputs = defaultdict(list)
+    for file_ending in FILE_ENDINGS:
+        for pattern in (("*", "*", "*"), ("*", "*", "*", "*")):
+            for file in glob.glob(path.join(source_path, *pattern) + f".{file_ending}"):
+                if not is_extra_crs(file):
+                    outputs[layer_name(file)].append(file)
+
+    return {name: sorted(files) for name, files in sorted(outputs.items())}
+
+
+def transform_bounds(
+    bounds: tuple[float, float, float, float], source: str, target: str
+) -> tuple[float, float, float, float]:
+    """Transform bounds between WGS 84 and web mercator, which map boxes to boxes.
+
+    Args:
+        bounds: bounds as (minx, miny, maxx, maxy)
+        source: CRS of bounds
+        target: CRS to transform to
+
+    Returns:
+        transformed bounds
+    """
+    transformer = Transformer.from_crs(source, target, always_xy=True)
+    xs, ys = transformer.transform([bounds[0], bounds[2]], [bounds[1], bounds[3]])
+    return xs[0], ys[0], xs[1], ys[1]
+
+
+def intersects(
+    bounds: tuple[float, float, float, float], other: tuple[float, float, float, float]
+) -> bool:
+    """Check if bounds intersect.
+
+    Args:
+        bounds: bounds as (minx, miny, maxx, maxy)
+        other: other bounds
+
+    Returns:
+        true if bounds intersect
+    """
+    return (
+        bounds[0] <= other[2]
+        and bounds[2] >= other[0]
+        and bounds[1] <= other[3]
+        and bounds[3] >= other[1]
+    )
+
+
+def file_info(file: str) -> tuple[Optional[tuple[float, float, float, float]], list[str]]:
+    """Read bounds and fields of an output file without reading its features.
+
+    Args:
+        file: output file in EPSG:4326
+
+    Returns:
+        bounds in WGS 84, None if file has no features, and field names
+    """
+    if file.endswith(".parquet"):
+        schema = pq.read_schema(file)
+        bbox = json.loads(schema.metadata[b"geo"])["columns"][GEOMETRY_NAME].get("bbox")
+        if bbox is None and pq.read_metadata(file).num_rows > 0:
+            bbox = gpd.read_parquet(file).total_bounds.tolist()
+
+        bounds = None if bbox is None or np.isnan(bbox).any() else tuple(bbox)
+        return bounds, [name for name in schema.names if name not in {GEOMETRY_NAME, BBOX_NAME}]
+
+    info = pyogrio.read_info(file, force_total_bounds=True)
+    bbox = info["total_bounds"]
+    bounds = None if info["features"] == 0 or np.isnan(bbox).any() else tuple(bbox)
+    return bounds, list(info["fields"])
+
+
+def read_block(
+    name: str,
+    files: list[str],
+    bounds: tuple[float, float, float, float],
+    properties: tuple[str, ...] = PROPERTIES,
+) -> VectorLayer:
+    """Read features of a layer intersecting bounds in web mercator.
+
+    Args:
+        name: layer name
+        files: output files in EPSG:4326
+        bounds: bounds in web mercator
+        properties: properties to keep
+
+    Returns:
+        vector layer
+    """
+    minx, miny, maxx, maxy = transform_bounds(bounds, WEB_MERCATOR, config_50.epsg_4326)
+
+    dfs = []
+    for file in files:
+        if file.endswith(".parquet"):
+            bbox_filter = (
+                (pc.field(BBOX_NAME, "xmin") <= maxx)
+                & (pc.field(BBOX_NAME, "xmax") >= minx)
+                & (pc.field(BBOX_NAME, "ymin") <= maxy)
+                & (pc.field(BBOX_NAME, "ymax") >= miny)
+            )
+            has_bbox = BBOX_NAME in pq.read_schema(file).names
+            df = gpd.read_parquet(file, filters=bbox_filter if has_bbox else None)
+        else:
+            df = gpd.read_file(file, engine="pyogrio", bbox=(minx, miny, maxx, maxy))
+
+        dfs.append(df.to_crs(WEB_MERCATOR))
+
+    df = pd.concat(dfs, ignore_index=True)
+    columns = [column for column in properties if column in df.columns]
+
+    return VectorLayer(
+        name,
+        np.asarray(df.geometry.values),
+        df[columns].astype(str).to_dict("records") if columns else [{} for _ in range(len(df))],
+    )
+
+
+def simplify_layer(layer: VectorLayer, zoom: int) -> VectorLayer:
+    """Simplify layer for zoom, dropping features smaller than a pixel.
+
+    Args:
+        layer: vector layer in web mercator
+        zoom: zoom level
+
+    Returns:
+        simplified layer
+    """
+    pixel = resolution(zoom)
+    geometries = shapely.simplify(layer.geometries, pixel, preserve_topology=True)
+
+    dimensions = shapely.get_dimensions(geometries)
+    visible = ~shapely.is_empty(geometries) & (
+        (dimensions == 0)
+        | ((dimensions == 1) & (shapely.length(geometries) >= pixel))
+        | ((dimensions == 2) & (shapely.area(geometries) >= pixel**2))
+    )
+    keep = np.flatnonzero(visible)
+
+    return VectorLayer(layer.name, geometries[keep], [layer.properties[i] for i in keep])
+
+
+def encode_block(
+    name: str,
+    zoom: int,
+    tiles: list[tuple[int, int]],
+    geometries: np.ndarray,
+    properties: list[dict],
+) -> list[tuple[int, bytes]]:
+    """Clip and encode a layer in a block of tiles.
+
+    Args:
+        name: layer name
+        zoom: zoom level
+        tiles: tile columns and rows
+        geometries: shapely geometry array in web mercator intersecting the block
+        properties: feature properties
+
+    Returns:
+        tile ids and encoded layer
+    """
+    tree = shapely.STRtree(geometries)
+    buffer = tile_size(zoom) * TILE_BUFFER / TILE_EXTENT
+
+    encoded = []
+    for x, y in tiles:
+        bounds = tile_bounds(zoom, x, y)
+        buffered = (bounds[0] - buffer, bounds[1] - buffer, bounds[2] + buffer, bounds[3] + buffer)
+        indices = tree.query(shapely.box(*buffered))
+        if len(indices) == 0:
+            continue
+
+        indices.sort()
+        clipped = shapely.clip_by_rect(geometries[indices], *buffered)
+        features = [
+            {"geometry": geometry, "properties": properties[i]}
+            for geometry, i in zip(clipped, indices, strict=True)
+            if not geometry.is_empty
+        ]
+        if len(features) == 0:
+            continue
+
+        data = mapbox_vector_tile.encode(
+            [{"name": name, "features": features}],
+            default_options={
+                "quantize_bounds": bounds,
+                "extents": TILE_EXTENT,
+                "on_invalid_geometry": on_invalid_geometry_make_valid,
+            },
+        )
+        encoded.append((zxy_to_tileid(zoom, x, y), data))
+
+    return encoded
+
+
+def tile_block(
+    name: str,
+    zoom: int,
+    tiles: list[tuple[int, int]],
+    bounds: tuple[float, float, float, float],
+    files: list[str],
+    properties: tuple[str, ...] = PROPERTIES,
+) -> list[tuple[int, bytes]]:
+    """Read, simplify, clip and encode a layer in a block of tiles, e.g. in a process.
+
+    Args:
+        name: layer name
+        zoom: zoom level
+        tiles: tile columns and rows
+        bounds: buffered bounds of block in web mercator
+        files: output files of layer intersecting the block
+        properties: properties to keep
+
+    Returns:
+        tile ids and encoded layer
+    """
+    simplified = simplify_layer(read_block(name, files, bounds, properties), zoom)
+    if len(simplified.geometries) == 0:
+        return []
+
+    return encode_block(name, zoom, tiles, simplified.geometries, simplified.properties)
+
+
+def blocks(
+    bounds: tuple[float, float, float, float], zoom: int, block_size: int = BLOCK_SIZE
+) -> Iterator[tuple[list[tuple[int, int]], tuple[float, float, float, float]]]:
+    """Split tiles covering bounds into blocks.
+
+    Args:
+        bounds: bounds in web mercator
+        zoom: zoom level
+        block_size: number of tiles per side of a block
+
+    Yields:
+        tiles of block and its bounds buffered by the tile buffer, clamped to the web
+        mercator extent so they transform to WGS 84 without wrapping around
+    """
+    buffer = tile_size(zoom) * TILE_BUFFER / TILE_EXTENT
+    x0, y0, x1, y1 = tile_range(bounds, zoom)
+
+    for block_x in range(x0, x1 + 1, block_size):
+        for block_y in range(y0, y1 + 1, block_size):
+            last_x, last_y = min(block_x + block_size, x1 + 1), min(block_y + block_size, y1 + 1)
+            minx, _, _, maxy = tile_bounds(zoom, block_x, block_y)
+            _, miny, maxx, _ = tile_bounds(zoom, last_x - 1, last_y - 1)
+
+            tiles = [(x, y) for x in range(block_x, last_x) for y in range(block_y, last_y)]
+            buffered = (
+                max(minx - buffer, -ORIGIN),
+                max(miny - buffer, -ORIGIN),
+                min(maxx + buffer, ORIGIN),
+                min(maxy + buffer, ORIGIN),
+            )
+            yield tiles, buffered
+
+
+def build_pmtiles(
+    source_path: str,
+    archive: str,
+    min_zoom: int = MIN_ZOOM,
+    max_zoom: int = MAX_ZOOM,
+    workers: Optional[int] = None,
+    properties: tuple[str, ...] = PROPERTIES,
+) -> int:
+    """Build PMTiles archive of vector tiles from extracted outputs.
+
+    Args:
+        source_path: extraction target path
+        archive: PMTiles file to write
+        min_zoom: min zoom level
+        max_zoom: max zoom level
+        workers: number of processes, number of CPUs by default
+        properties: feature properties to keep
+
+    Returns:
+        number of tiles
+
+    Raises:
+        ValueError: if there are no features to tile
+    """
+    outputs = find_outputs(source_path)
+    tiles: dict[int, list[bytes]] = defaultdict(list)
+    vector_layers = []
+    bounds = [math.inf, math.inf, -math.inf, -math.inf]
+
+    with ProcessPoolExecutor(workers or available_cpus()) as executor:
+        futures = []
+        for name, files in outputs.items():
+            infos = {file: file_info(file) for file in files}
+            lon_lat = {file: info[0] for file, info in infos.items() if info[0] is not None}
+            if len(lon_lat) == 0:
+                continue
+
+            logger.info(f"Tiling layer {name} from {len(lon_lat)} files.")
+            corners = np.array(list(lon_lat.values()))
+            layer_lon_lat = (*corners[:, :2].min(axis=0), *corners[:, 2:].max(axis=0))
+            bounds = [
+                *np.minimum(bounds[:2], layer_lon_lat[:2]),
+                *np.maximum(bounds[2:], layer_lon_lat[2:]),
+            ]
+            file_bounds = {
+                file: transform_bounds(box, config_50.epsg_4326, WEB_MERCATOR)
+                for file, box in lon_lat.items()
+            }
+            layer_bounds = transform_bounds(layer_lon_lat, config_50.epsg_4326, WEB_MERCATOR)
+
+            for zoom in range(min_zoom, max_zoom + 1):
+                for block_tiles, block_bounds in blocks(layer_bounds, zoom):
+                    block_files = [
+                        file for file, box in file_bounds.items() if intersects(box, block_bounds)
+                    ]
+                    if len(block_files) > 0:
+                        futures.append(
+                            executor.submit(
+                                tile_block,
+                                name,
+                                zoom,
+                                block_tiles,
+                                block_bounds,
+                                block_files,
+                                properties,
+                            )
+                        )
+
+            fields = {field for _, file_fields in infos.values() for field in file_fields}
+            vector_layers.append(
+                {
+                    "id": name,
+                    "fields": {column: "String" for column in properties if column in fields},
+                    "minzoom": min_zoom,
+                    "maxzoom": max_zoom,
+                }
+            )
+
+        for future in futures:
+            for tile_id, data in future.result():
+                tiles[tile_id].append(data)
+
+    if len(tiles) == 0:
+        raise ValueError(f"No features to tile in {source_path}.")
+
+    with write(archive) as writer:
+        for tile_id in sorted(tiles):
+            writer.write_tile(tile_id, gzip.compress(b"".join(tiles[tile_id]), mtime=0))
+
+        writer.finalize(
+            {
+                "tile_type": TileType.MVT,
+                "tile_compression": Compression.GZIP,
+                "min_lon_e7": int(bounds[0] * 1e7),
+                "min_lat_e7": int(bounds[1] * 1e7),
+                "max_lon_e7": int(bounds[2] * 1e7),
+                "max_lat_e7": int(bounds[3] * 1e7),
+                "center_zoom": min_zoom,
+                "center_lon_e7": int((bounds[0] + bounds[2]) / 2 * 1e7),
+                "center_lat_e7": int((bounds[1] + bounds[3]) / 2 * 1e7),
+            },
+            {"vector_layers": vector_layers},
+        )
+
+    logger.info(f"Wrote {len(tiles)} tiles to {archive}.")
+    return len(tiles)
@@ -25,3 +25,18 @@ class TestAdminBorder:
         """Integration test for AdminBorders municipalities."""
         client = AdminBorders(limit=1)
         assert len(client.municipalities) >= 1
+
+    def test_integration_admin_borders_municipalities_property_filter(self):
+        """Integration test for AdminBorders municipalities with property filter."""
+        client = AdminBorders()
+        municipalities = client.get_municipalities(properties={"lanskod": "01"})
+        assert len(municipalities) >= 1
+        assert all(m.properties.lanskod == "01" for m in municipalities)
+
+    def test_integration_admin_borders_counties_bbox(self):
+        """Integration test for AdminBorders counties with bbox and crs."""
+        client = AdminBorders()
+        counties = client.get_counties(
+            bbox=(674000, 6580000, 675000, 6581000), bbox_crs="EPSG:3006", crs="EPSG:3006"
+        )
+        assert len(counties) >= 1
@@ -0,0 +1,61 @@
+"""GeoPackage metadata integration tests."""
+
+import os
+import shutil
+
+import geopandas as gpd
+import pytest
+import shapely
+
+from lantmateriet.gpkg import extent, feature_count, geometry_type, name_statistics, unique_names
+
+test_mark_geojson = gpd.read_file(
+    "tests/fixtures/test_integration_ground_mark.geojson", layer="mark", use_arrow=True
+)
+test_mark_geojson.to_file(
+    "tests/fixtures/test_integration_ground_mark.gpkg", layer="mark", driver="GPKG"
+)
+
+
+class TestIntegrationGpkg:
+    """Integration tests of GeoPackage metadata."""
+
+    def test_integration_name_statistics(self):
+        """Integration test of name_statistics function."""
+        file = "tests/fixtures/test_integration_ground_mark.gpkg"
+        df = gpd.read_file(file, layer="mark", engine="pyogrio")
+
+        statistics = name_statistics(file, "mark", "objekttyp")
+
+        assert list(statistics) == sorted(df["objekttyp"].unique())
+        for name, partition in df.groupby("objekttyp"):
+            vertices = shapely.get_num_coordinates(partition.geometry.values).sum()
+            assert statistics[name].features == len(partition)
+            assert vertices <= statistics[name].vertices <= 2 * vertices + 10 * len(partition)
+
+    def test_integration_layer_metadata(self):
+        """Integration test of unique_names, feature_count, geometry_type and extent functions."""
+        file = "tests/fixtures/test_integration_ground_mark.gpkg"
+        df = gpd.read_file(file, layer="mark", engine="pyogrio")
+
+        assert unique_names(file, "mark", "objekttyp") == sorted(df["objekttyp"].unique())
+        assert feature_count(file, "mark") == len(df)
+        assert geometry_type(file, "mark") == df.geom_type.iloc[0].upper()
+        assert extent(file, "mark") == pytest.approx(tuple(df.total_bounds))
+
+    def test_integration_special_path(self, tmp_path):
+        """Integration test of metadata queries on a path with URI characters, closing files."""
+        folder = tmp_path / "a?b#c%20d"
+        folder.mkdir()
+        file = str(folder / "mark.gpkg")
+        shutil.copy("tests/fixtures/test_integration_ground_mark.gpkg", file)
+
+        assert feature_count(file, "mark") == len(test_mark_geojson)
+        assert geometry_type(file, "mark") == "POLYGON"
+
+        if os.path.isdir("/proc/self/fd"):
+            open_files = len(os.listdir("/proc/self/fd"))
+            for _ in range(10):
+                extent(file, "mark")
+
+            assert len(os.listdir("/proc/self/fd")) <= open_files
@@ -1,8 +1,12 @@
 """Line integration tests."""
 
+from os import path
+
 import geopandas as gpd
+import pytest
 from geopandas import testing
 
+from lantmateriet.extract import ALL_NAMES, plan_layer, process_layer, task_outputs
 from lantmateriet.line import Line
 
 test_vaglinje_geojson = gpd.read_file(
@@ -46,3 +50,109 @@ class TestIntegrationLine:
             check_like=True,
             check_dtype=False,
         )
+
+    def test_integration_process_arrow(self, tmp_path):
+        """Integration test of Line process and save as Arrow table."""
+        line = Line(
+            "tests/fixtures/test_integration_communication_vaglinje.gpkg",
+            "50",
+            "vaglinje",
+            "Motorväg",
+            "objekttyp",
+            arrow=True,
+        )
+        line.process()
+        line.save(str(tmp_path), "motorvag")
+
+        df = gpd.GeoDataFrame(
+            line.table.table.to_pandas(), geometry=line.table.geometries, crs=line.table.crs
+        )
+        testing.assert_geodataframe_equal(
+            df,
+            test_vaglinje_result,
+            check_like=True,
+            check_dtype=False,
+        )
+
+        saved_df = gpd.read_file(
+            tmp_path / "test_integration_communication_vaglinje" / "vaglinje" / "motorvag.fgb"
+        )
+        assert saved_df.crs == "EPSG:4326"
+        assert len(saved_df) == len(test_vaglinje_result)
+
+    @pytest.mark.parametrize("file_ending", ["fgb", "geojson", "parquet"])
+    def test_integration_save_dtypes(self, tmp_path, file_ending):
+        """Integration test of saved dtypes of the pandas, Arrow and batched paths."""
+        file = "tests/fixtures/test_integration_communication_vaglinje.gpkg"
+        dtypes = []
+        for options in ({}, {"arrow": True}, {"batch_size": 1}):
+            line = Line(file, "50", "vaglinje", "Motorväg", "objekttyp", **options)
+            line.process()
+            line.save(str(tmp_path), "motorvag", file_ending)
+
+            output_path = line.output_path(str(tmp_path), "motorvag", file_ending)
+            saved_df = (
+                gpd.read_parquet(output_path)
+                if file_ending == "parquet"
+                else gpd.read_file(output_path, engine="pyogrio")
+            )
+            dtypes.append(saved_df.dtypes.astype(str).sort_index().to_dict())
+
+        assert dtypes[0]["skapad"] == "datetime64[ms]"
+        assert dtypes[1] == dtypes[0]
+        assert dtypes[2] == dtypes[0]
+
+    def test_integration_save_batches(self, tmp_path):
+        """Integration test of Line process and save in batches."""
+        line = Line(
+            "tests/fixtures/test_integration_communication_vaglinje.gpkg",
+            "50",
+            "vaglinje",
+            "Motorväg",
+            "objekttyp",
+            batch_size=1,
+        )
+        line.process()
+        line.save(str(tmp_path), "motorvag", crs=["EPSG:4326", "EPSG:3006"])
+
+        folder = tmp_path / "test_integration_communication_vaglinje" / "vaglinje"
+        saved_df = gpd.read_file(folder / "motorvag_epsg3006.fgb")
+        assert line.table is None
+        assert gpd.read_file(folder / "motorvag.fgb").crs == "EPSG:4326"
+        testing.assert_geodataframe_equal(
+            saved_df.sort_values("objektidentitet", ignore_index=True),
+            test_vaglinje_result.sort_values("objektidentitet", ignore_index=True),
+            check_like=True,
+            check_dtype=False,
+            check_less_precise=True,
+        )
+
+    def test_integration_plan_batches(self, tmp_path):
+        """Integration test of plan_layer memory estimate of batched tasks."""
+        file = "tests/fixtures/test_integration_communication_vaglinje.gpkg"
+        whole = {task.key: task.memory for task in plan_layer(str(tmp_path), file, "vaglinje")}
+        batched = plan_layer(str(tmp_path), file, "vaglinje", batch_size=1)
+        parquet = plan_layer(str(tmp_path), file, "vaglinje", file_ending="parquet", batch_size=1)
+
+        assert all(task.args[0].batch_size == 1 for task in batched + parquet)
+        assert any(task.memory < whole[task.key] for task in batched)
+        assert all(task.memory == whole[task.key] for task in parquet)
+
+    def test_integration_plan_single_pass(self, tmp_path):
+        """Integration test of a single pass task reading its layer in the worker."""
+        file = "tests/fixtures/test_integration_communication_vaglinje.gpkg"
+        per_name = plan_layer(str(tmp_path), file, "vaglinje")
+        [task] = plan_layer(str(tmp_path), file, "vaglinje", single_pass=True)
+
+        assert task.key == (file, "vaglinje", ALL_NAMES)
+        assert task.args[:3] == (file, "vaglinje", "objekttyp")
+        assert not any(isinstance(arg, gpd.GeoDataFrame) for arg in task.args)
+        assert task.details["features"] == sum(
+            name_task.details["features"] for name_task in per_name
+        )
+        assert sorted(task_outputs(task)[0]) == sorted(
+            output for name_task in per_name for output in task_outputs(name_task)[0]
+        )
+
+        assert process_layer(*task.args) is None
+        assert all(path.exists(output) for output in task_outputs(task)[0])
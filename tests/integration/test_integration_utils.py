@@ -0,0 +1,34 @@
+"""Utils integration tests."""
+
+import geopandas as gpd
+from geopandas import testing
+
+from lantmateriet.utils import read_partitions, read_unique_names
+
+test_mark_geojson = gpd.read_file(
+    "tests/fixtures/test_integration_ground_mark.geojson", layer="mark", use_arrow=True
+)
+test_mark_geojson.to_file(
+    "tests/fixtures/test_integration_ground_mark.gpkg", layer="mark", driver="GPKG"
+)
+
+
+class TestIntegrationUtils:
+    """Integration tests of utils."""
+
+    def test_integration_read_partitions(self):
+        """Integration test of read_partitions."""
+        file = "tests/fixtures/test_integration_ground_mark.gpkg"
+        partitions = read_partitions(file, "mark", "objekttyp")
+
+        assert list(partitions.keys()) == read_unique_names(file, "mark", "objekttyp")
+
+        for name, partition in partitions.items():
+            expected_result = gpd.read_file(
+                file,
+                layer="mark",
+                where=f"objekttyp='{name}'",
+                engine="pyogrio",
+                use_arrow=True,
+            )
+            testing.assert_geodataframe_equal(partition, expected_result)
@@ -0,0 +1,92 @@
+"""Administrative division borders unit tests."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from lantmateriet.admin_borders import CRS84, AdminBorders, build_query, crs_uri
+from lantmateriet.ogc_features import OGCFeatures
+
+
+class TestUnitAdminBorders:
+    """Unit tests of AdminBorders."""
+
+    @pytest.mark.parametrize(
+        "crs, expected_result",
+        [
+            ("EPSG:3006", "http://www.opengis.net/def/crs/EPSG/0/3006"),
+            ("epsg:4326", "http://www.opengis.net/def/crs/EPSG/0/4326"),
+            ("CRS84", CRS84),
+            (CRS84, CRS84),
+            ("3006", None),
+        ],
+    )
+    def test_unit_crs_uri(self, crs, expected_result):
+        """Unit test of crs_uri function."""
+        if expected_result is None:
+            with pytest.raises(ValueError):
+                crs_uri(crs)
+        else:
+            assert crs_uri(crs) == expected_result
+
+    def test_unit_build_query(self):
+        """Unit test of build_query function."""
+        assert build_query() == {}
+        assert build_query(
+            bbox=(1, 2, 3, 4),
+            bbox_crs="EPSG:3006",
+            crs="EPSG:3006",
+            properties={"lanskod": "01"},
+            cql_filter="kommunkod='0114'",
+        ) == {
+            "bbox": "1,2,3,4",
+            "bbox-crs": "http://www.opengis.net/def/crs/EPSG/0/3006",
+            "crs": "http://www.opengis.net/def/crs/EPSG/0/3006",
+            "lanskod": "01",
+            "filter": "kommunkod='0114'",
+            "filter-lang": "cql2-text",
+        }
+
+    def test_unit_get_municipalities(self):
+        """Unit test of AdminBorders get_municipalities method."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"type": "FeatureCollection", "features": []})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        admin_borders = AdminBorders(limit=5, client=client)
+
+        with pytest.raises(RuntimeError):
+            admin_borders.get_municipalities()
+
+        for _ in range(2):
+            assert (
+                asyncio.run(admin_borders.get_municipalities_async(properties={"lanskod": "01"}))
+                == []
+            )
+        assert requests[0].url.path.endswith("/collections/kommuner/items")
+        assert dict(requests[0].url.params) == {"limit": "5", "lanskod": "01"}
+        assert requests[0].headers["authorization"].startswith("Basic")
+
+    def test_unit_sync_event_loop(self, monkeypatch):
+        """Unit test of AdminBorders synchronous methods, repeated and in a running loop."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"type": "FeatureCollection", "features": []})
+
+        monkeypatch.setattr(
+            OGCFeatures,
+            "_new_client",
+            lambda self: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        admin_borders = AdminBorders()
+
+        async def in_running_loop() -> list:
+            return admin_borders.get_counties()
+
+        assert admin_borders.get_counties() == []
+        assert admin_borders.get_counties() == []
+        assert asyncio.run(in_running_loop()) == []
@@ -0,0 +1,83 @@
+"""Arrow unit tests."""
+
+import numpy as np
+import pyarrow as pa
+import pytest
+import shapely
+from shapely.geometry import LineString, MultiLineString, Point
+
+from lantmateriet.arrow import GeoTable
+
+
+class TestUnitGeoTable:
+    """Unit tests of GeoTable."""
+
+    def test_unit_explode(self):
+        """Unit test of GeoTable explode method."""
+        table = GeoTable(
+            pa.table({"name": ["a", "b"]}),
+            np.array(
+                [
+                    MultiLineString([[(0, 0), (1, 0)], [(2, 0), (3, 0)]]),
+                    LineString([(0, 1), (0, 2)]),
+                ]
+            ),
+            "geom",
+            "EPSG:3006",
+        ).explode()
+
+        assert len(table) == 3
+        assert table.table["name"].to_pylist() == ["a", "a", "b"]
+        assert table.geometry_type == "LineString"
+
+    def test_unit_set_column(self):
+        """Unit test of GeoTable set_column method."""
+        table = GeoTable(pa.table({"name": ["a"]}), np.array([LineString([(0, 0), (3, 4)])]))
+        table = table.set_column("length_m", shapely.length(table.geometries))
+        table = table.set_column("name", np.array(["b"]))
+
+        assert table.table.column_names == ["name", "length_m"]
+        assert table.table.to_pylist() == [{"name": "b", "length_m": 5.0}]
+
+    def test_unit_to_crs(self):
+        """Unit test of GeoTable to_crs method."""
+        table = GeoTable(
+            pa.table({"name": ["a"]}), np.array([Point(500000, 6500000)]), "geom", "EPSG:3006"
+        ).to_crs("EPSG:4326")
+
+        assert table.crs == "EPSG:4326"
+        assert table.geometries[0].x == pytest.approx(15.0, abs=1e-6)
+        assert table.geometries[0].y == pytest.approx(58.6, abs=0.1)
+
+    @pytest.mark.parametrize(
+        "geometries, expected_result",
+        [
+            ([Point(0, 0), Point(1, 1)], "Point"),
+            ([Point(0, 0), LineString([(0, 0), (1, 1)])], "Unknown"),
+            ([], "Unknown"),
+        ],
+    )
+    def test_unit_geometry_type(self, geometries, expected_result):
+        """Unit test of GeoTable geometry_type property."""
+        table = GeoTable(
+            pa.table({"name": ["a"] * len(geometries)}), np.array(geometries, dtype=object)
+        )
+        assert table.geometry_type == expected_result
+
+    def test_unit_read_write_batches(self, tmp_path):
+        """Unit test of GeoTable read_batches and write_batches methods."""
+        GeoTable(
+            pa.table({"name": ["a", "b", "c"]}),
+            np.array([Point(0, 0), Point(1, 1), Point(2, 2)]),
+            "geom",
+            "EPSG:3006",
+        ).write(str(tmp_path / "input.gpkg"), "GPKG")
+
+        tables = GeoTable.read_batches(str(tmp_path / "input.gpkg"), "input", batch_size=2)
+        first = next(tables)
+        first.write_batches(tables, str(tmp_path / "output.fgb"), "FlatGeobuf")
+
+        assert len(first) == 2
+        table = GeoTable.read(str(tmp_path / "output.fgb"), "output")
+        assert sorted(table.table["name"].to_pylist()) == ["a", "b", "c"]
+        assert table.crs == "EPSG:3006"
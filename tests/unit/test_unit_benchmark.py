@@ -0,0 +1,94 @@
+"""Benchmark unit tests."""
+
+import geopandas as gpd
+import pytest
+import shapely
+
+from lantmateriet.benchmark import (
+    MARK_TYPES,
+    ROAD_TYPES,
+    TEXT_TYPES,
+    BenchmarkResult,
+    format_results,
+    generate_topografi,
+    load_baseline,
+    option_differences,
+    regressions,
+    save_baseline,
+)
+
+MB = 1024**2
+
+
+class TestUnitBenchmark:
+    """Unit tests of benchmark."""
+
+    def test_unit_generate_topografi(self, tmp_path):
+        """Unit test of generate_topografi function."""
+        files = generate_topografi(str(tmp_path), scale=0.01)
+        assert list(files) == ["mark", "vaglinje", "textpunkt"]
+
+        mark = gpd.read_file(files["mark"], layer="mark")
+        roads = gpd.read_file(files["vaglinje"], layer="vaglinje")
+        texts = gpd.read_file(files["textpunkt"], layer="textpunkt")
+
+        assert (len(mark), len(roads), len(texts)) == (100, 200, 200)
+        assert set(mark.geom_type) == {"Polygon"}
+        assert set(roads.geom_type) == {"MultiLineString"}
+        assert set(texts.geom_type) == {"Point"}
+        assert mark.crs.to_epsg() == 3006
+        assert set(mark.objekttyp) <= set(MARK_TYPES)
+        assert set(roads.objekttyp) <= set(ROAD_TYPES)
+        assert set(texts.texttyp) <= set(TEXT_TYPES)
+        assert mark.objektidentitet.is_unique
+
+        polygons = mark.geometry.values
+        assert mark.is_valid.all()
+        assert shapely.touches(polygons[0], polygons[1])
+        assert shapely.union_all(polygons).area == pytest.approx(shapely.area(polygons).sum())
+
+        again = generate_topografi(str(tmp_path / "again"), scale=0.01)
+        assert gpd.read_file(again["mark"]).geometry.equals(mark.geometry)
+
+    def test_unit_baseline(self, tmp_path):
+        """Unit test of save_baseline, load_baseline, option_differences and regressions."""
+        baseline = [
+            BenchmarkResult("mark", 1000, 2.0, 1.0, 5 * MB, 30 * MB),
+            BenchmarkResult("total", 5000, 10.0, 2.0, 5 * MB, 30 * MB),
+        ]
+        options = {"scale": 0.1, "seed": 0, "workers": None, "arrow": False, "batch_size": None}
+        baseline_file = str(tmp_path / "baseline.json")
+        save_baseline(baseline_file, baseline, options)
+
+        baseline_options, loaded = load_baseline(baseline_file)
+        assert baseline_options == options
+        assert loaded == baseline
+        assert loaded[0].features_per_second == 500
+        assert loaded[0].megabytes_per_second == 0.5
+        assert format_results(loaded).splitlines()[1].split() == [
+            "mark",
+            "1000",
+            "2.00",
+            "500",
+            "0.50",
+            "5.0",
+            "30.0",
+        ]
+
+        assert option_differences(options, baseline_options) == []
+        assert option_differences({**options, "arrow": True, "batch_size": 1024}, options) == [
+            "arrow: True, baseline False",
+            "batch_size: 1024, baseline None",
+        ]
+
+        results = [
+            BenchmarkResult("mark", 1000, 3.0, 1.0, 0, 30 * MB),
+            BenchmarkResult("total", 5000, 11.0, 2.0, 50 * MB, 40 * MB),
+            BenchmarkResult("textpunkt", 2000, 1.0, 1.0, 5 * MB, 30 * MB),
+        ]
+        assert regressions(baseline, loaded) == []
+        assert regressions(results, loaded) == [
+            "mark: 333 features/s, baseline 500",
+            "total: traced peak 40.0 MB, baseline 30.0 MB",
+        ]
+        assert regressions(results, loaded, tolerance=0.5) == []
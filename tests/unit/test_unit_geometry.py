@@ -1,15 +1,23 @@
 """Geometry unit tests."""
 
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import patch
 
 import geopandas as gpd
 import numpy as np
 import pytest
+import shapely
 from geopandas import testing
-from shapely.geometry import Point, Polygon
+from shapely.geometry import Point, Polygon, box
 
 from lantmateriet import config
-from lantmateriet.geometry import DissolveTouchingGeometry, Geometry
+from lantmateriet.arrow import GeoTable
+from lantmateriet.geometry import (
+    FILE_ENDING_DRIVERS_MAP,
+    DissolveTouchingGeometry,
+    Geometry,
+    union_tree,
+)
+from lantmateriet.tiling import TileIndex
 
 
 class TestUnitDissolveTouchingGeometry:
@@ -576,6 +584,67 @@ class TestUnitDissolveTouchingGeometry:
         result = dtg.dissolve_and_explode_exterior()
         testing.assert_geodataframe_equal(expected_result, result)
 
+    def test_unit_dissolvetouchinggeometry_label_components(self):
+        """Unit test of DissolveTouchingGeometry _label_components method."""
+        labels = DissolveTouchingGeometry._label_components(
+            7, np.array([1, 3, 4, 5, 6]), np.array([6, 2, 3, 1, 5])
+        )
+        assert labels.tolist() == [0, 1, 2, 2, 2, 1, 1]
+
+    @pytest.mark.parametrize(
+        "labels, connected, expected_result",
+        [
+            (np.array([0, 0, 2, 0]), np.array([0, 1, 3]), [0]),
+            (np.array([0, 0, 2, 2, 0, 5, 2]), np.array([0, 1, 2, 3, 4, 6]), [4, 6]),
+            (np.array([0, 0, 2, 2, 5]), np.array([0, 1, 2, 3]), [0, 3]),
+        ],
+    )
+    def test_unit_dissolvetouchinggeometry_get_primary_indices(
+        self, labels, connected, expected_result
+    ):
+        """Unit test of DissolveTouchingGeometry _get_primary_indices method.
+
+        Args:
+            labels: component labels
+            connected: indices of connected geometries
+            expected_result: expected results
+        """
+        primary = DissolveTouchingGeometry._get_primary_indices(labels, connected)
+        assert primary.tolist() == expected_result
+
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_unit_dissolvetouchinggeometry_dissolve_and_explode_tiled(self, seed):
+        """Unit test of DissolveTouchingGeometry dissolve_and_explode method with tiles.
+
+        Args:
+            seed: random seed of squares
+        """
+        cells = np.random.default_rng(seed).choice(30 * 30, 300, replace=False)
+        df = gpd.GeoDataFrame(
+            {
+                "objektidentitet": [f"id{cell}" for cell in cells],
+                "geometry": [
+                    box(cell % 30, cell // 30, cell % 30 + 1, cell // 30 + 1) for cell in cells
+                ],
+            },
+            crs=config.config_50.espg_3006,
+        )
+
+        expected_result = DissolveTouchingGeometry(df.copy()).dissolve_and_explode()
+        result = DissolveTouchingGeometry(df.copy(), 7, 2).dissolve_and_explode()
+
+        def _rows(df: gpd.GeoDataFrame) -> list:
+            return sorted(
+                zip(
+                    df["objektidentitet"],
+                    shapely.to_wkt(shapely.normalize(df.geometry.values)),
+                    strict=True,
+                )
+            )
+
+        assert list(result.columns) == list(expected_result.columns)
+        assert _rows(result) == _rows(expected_result)
+
 
 class TestUnitGeometry:
     """Unit tests of Geometry."""
@@ -613,6 +682,27 @@ class TestUnitGeometry:
             assert geometry._name == name
             assert geometry._field == field
 
+    @patch("lantmateriet.geometry.gpd.read_file")
+    def test_unit_df(self, mock_read_file):
+        """Unit test of Geometry df property reading data on first use."""
+        geometry = Geometry("path", "50", "mark", "name", "field")
+        mock_read_file.assert_not_called()
+
+        assert geometry.df == mock_read_file.return_value
+        assert geometry.df == mock_read_file.return_value
+        mock_read_file.assert_called_once_with(
+            "path", layer="mark", where="field='name'", engine="pyogrio", use_arrow=True
+        )
+
+    @patch("lantmateriet.geometry.gpd.read_file")
+    def test_unit_init_df(self, mock_read_file):
+        """Unit test of Geometry __init__ method with already read data."""
+        df = gpd.GeoDataFrame({"geometry": [Point(0, 0)]})
+        geometry = Geometry("path", "50", "mark", "name", "field", df)
+
+        mock_read_file.assert_not_called()
+        testing.assert_geodataframe_equal(geometry.df, df)
+
     @pytest.mark.parametrize(
         "input_df",
         [
@@ -652,7 +742,7 @@ class TestUnitGeometry:
         assert (
             mock_DissolveTouchingGeometry.return_value.dissolve_and_explode.return_value == result
         )
-        mock_DissolveTouchingGeometry.assert_called_with(df)
+        mock_DissolveTouchingGeometry.assert_called_with(df, None)
         mock_DissolveTouchingGeometry.return_value.dissolve_and_explode.assert_called()
 
     @patch("lantmateriet.geometry.DissolveTouchingGeometry")
@@ -783,21 +873,147 @@ class TestUnitGeometry:
         if set_length is False:
             assert "length_m" not in geometry.df
 
+    @patch("lantmateriet.geometry.gpd.GeoDataFrame.to_file")
     @patch("lantmateriet.geometry.os.makedirs")
-    @patch("lantmateriet.geometry.gpd.read_file")
-    def test_unit_save(self, mock_df_read_file, mock_makedirs):
+    def test_unit_save(self, mock_makedirs, mock_to_file):
         """Unit test of Geometry _save method."""
         geometry = Geometry("path", "50", "layer", "name", "field")
-        geometry.df = MagicMock()
+        geometry.df = gpd.GeoDataFrame(
+            {"objekttyp": ["a"], "geometry": [Point(500000, 6500000)]}, crs="EPSG:3006"
+        )
 
         path = "path_to_save"
         file_name = "file"
         geometry._save(path, file_name)
 
         mock_makedirs.assert_called_once()
-        geometry.df.to_crs.assert_has_calls(
-            [
-                call("EPSG:4326"),
-                call().to_file("path_to_save/path/layer/file.fgb", driver="FlatGeobuf"),
-            ]
+        mock_to_file.assert_called_once_with(
+            "path_to_save/path/layer/file.fgb", driver="FlatGeobuf"
+        )
+        assert geometry.df.crs == "EPSG:3006"
+
+    def test_unit_save_crs(self, tmp_path):
+        """Unit test of Geometry _save method with several CRSs."""
+        geometry = Geometry("path", "50", "layer", "name", "field")
+        geometry.df = gpd.GeoDataFrame(
+            {"objekttyp": ["a", "b"], "geometry": [Point(500000, 6500000), Point(600000, 7000000)]},
+            crs="EPSG:3006",
         )
+
+        geometry._save(str(tmp_path), "file", "fgb", crs=["EPSG:4326", "EPSG:3006"])
+
+        df_4326 = gpd.read_file(tmp_path / "path" / "layer" / "file.fgb")
+        df_3006 = gpd.read_file(tmp_path / "path" / "layer" / "file_epsg3006.fgb")
+        assert df_4326.crs == "EPSG:4326"
+        assert df_3006.crs == "EPSG:3006"
+        assert sorted(df_3006.geometry.x) == [500000, 600000]
+        assert df_4326.to_crs("EPSG:3006").geometry.x.round(3).sort_values().tolist() == [
+            500000,
+            600000,
+        ]
+        assert geometry.df.crs == "EPSG:3006"
+
+    @pytest.mark.parametrize(
+        "file_path, file_ending, expected_result",
+        [
+            ("source/mark_sverige.gpkg", "fgb", "target/mark_sverige/layer/file.fgb"),
+            ("mark_sverige.gpkg", "geojson", "target/mark_sverige/layer/file.geojson"),
+        ],
+    )
+    def test_unit_output_path(self, file_path, file_ending, expected_result):
+        """Unit test of Geometry output_path method."""
+        geometry = Geometry(file_path, "50", "layer", "name", "field")
+        assert geometry.output_path("target", "file", file_ending) == expected_result
+
+    def test_unit_save_parquet(self, tmp_path):
+        """Unit test of Geometry _save method with GeoParquet."""
+        geometry = Geometry("path", "50", "layer", "name", "field")
+        geometry.df = gpd.GeoDataFrame(
+            {"objekttyp": ["a", "b"], "geometry": [Point(500000, 6500000), Point(600000, 7000000)]},
+            crs="EPSG:3006",
+        )
+
+        geometry._save(str(tmp_path), "file", "parquet")
+
+        df = gpd.read_parquet(tmp_path / "path" / "layer" / "file.parquet")
+        assert df.crs == "EPSG:4326"
+        assert list(df.columns) == ["objekttyp", "geometry", "bbox"]
+        assert df["objekttyp"].tolist() == ["a", "b"]
+
+    @pytest.mark.parametrize("arrow", [False, True])
+    @pytest.mark.parametrize("file_ending", list(FILE_ENDING_DRIVERS_MAP))
+    def test_unit_save_file_endings(self, tmp_path, file_ending, arrow):
+        """Unit test of Geometry _save method with each supported file ending."""
+        geometry = Geometry("path", "50", "layer", "name", "field")
+        df = gpd.GeoDataFrame(
+            {"objekttyp": ["a", "b"], "geometry": [Point(500000, 6500000), Point(600000, 7000000)]},
+            crs="EPSG:3006",
+        )
+        if arrow is True:
+            geometry.table = GeoTable.from_geodataframe(df)
+        else:
+            geometry.df = df
+
+        geometry._save(str(tmp_path), "file", file_ending)
+
+        output_path = geometry.output_path(str(tmp_path), "file", file_ending)
+        saved = (
+            gpd.read_parquet(output_path)
+            if file_ending == "parquet"
+            else gpd.read_file(output_path, engine="pyogrio")
+        )
+        assert saved.crs == "EPSG:4326"
+        assert sorted(saved["objekttyp"]) == ["a", "b"]
+
+    def test_unit_save_tiles(self, tmp_path):
+        """Unit test of Geometry _save method with grid tiles."""
+        geometry = Geometry("path", "50", "layer", "name", "field")
+        geometry.df = gpd.GeoDataFrame(
+            {
+                "objekttyp": ["a", "b", "c"],
+                "geometry": [
+                    Point(520000, 6510000),
+                    Point(560000, 6510000),
+                    Point(530000, 6520000),
+                ],
+            },
+            crs="EPSG:3006",
+        )
+
+        geometry._save(str(tmp_path), "file", "fgb", 50000, ["EPSG:4326", "EPSG:3006"])
+
+        index = TileIndex(str(tmp_path / "path" / "layer" / "file"))
+        assert index.index["crs"] == "EPSG:4326"
+        assert index.index["extent_crs"] == "EPSG:3006"
+        assert TileIndex(str(tmp_path / "path" / "layer" / "file_epsg3006")).index["crs"] == (
+            "EPSG:3006"
+        )
+        assert [tile["features"] for tile in index.index["tiles"]] == [2, 1]
+        assert sorted(gpd.read_file(index.files()[0])["objekttyp"]) == ["a", "c"]
+        assert gpd.read_file(index.files()[1]).crs == "EPSG:4326"
+        assert geometry.output_path(str(tmp_path), "file", "fgb", True) == str(
+            tmp_path / "path" / "layer" / "file" / "index.json"
+        )
+
+
+class TestUnitUnionTree:
+    """Unit tests of union_tree."""
+
+    @pytest.mark.parametrize(
+        "workers, fan_in",
+        [(1, 2), (2, 2), (3, 4)],
+    )
+    def test_unit_union_tree(self, workers, fan_in):
+        """Unit test of union_tree function."""
+        geometries = np.array(
+            [box(x, y, x + 1, y + 1) for x in range(10) for y in range(10) if (x + y) % 7 != 0]
+            + [box(20, 20, 21, 21)]
+        )
+
+        union = union_tree(geometries, workers, fan_in)
+
+        assert union.equals(shapely.union_all(geometries))
+
+    def test_unit_union_tree_empty(self):
+        """Unit test of union_tree function without geometries."""
+        assert union_tree(np.array([], dtype=object)).is_empty
@@ -0,0 +1,67 @@
+"""GeoParquet unit tests."""
+
+import json
+from unittest.mock import patch
+
+import geopandas as gpd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import shapely
+from shapely.geometry import Point
+
+from lantmateriet.geoparquet import hilbert_distance, write_geoparquet
+
+
+class TestUnitGeoParquet:
+    """Unit tests of GeoParquet."""
+
+    @pytest.mark.parametrize(
+        "points, expected_result",
+        [
+            ([(0, 0), (0, 1), (1, 1), (1, 0)], [0, 1, 2, 3]),
+            ([(1, 0), (0, 0), (1, 1), (0, 1)], [3, 0, 2, 1]),
+            ([], []),
+        ],
+    )
+    def test_unit_hilbert_distance(self, points, expected_result):
+        """Unit test of hilbert_distance function."""
+        geometries = np.array([Point(x, y) for x, y in points], dtype=object)
+        assert hilbert_distance(geometries, level=1).tolist() == expected_result
+
+    def test_unit_hilbert_distance_locality(self):
+        """Unit test of hilbert_distance function keeping neighbours close."""
+        x, y = np.meshgrid(np.arange(16), np.arange(16))
+        geometries = shapely.points(x.ravel(), y.ravel())
+        order = np.argsort(hilbert_distance(geometries, level=4))
+
+        steps = shapely.distance(geometries[order][:-1], geometries[order][1:])
+        assert np.all(steps == 1)
+
+    @patch("lantmateriet.geoparquet.MIN_ROW_GROUP_SIZE", 2)
+    @patch("lantmateriet.geoparquet.TARGET_ROW_GROUP_BYTES", 1)
+    def test_unit_write_geoparquet(self, tmp_path):
+        """Unit test of write_geoparquet function."""
+        file = str(tmp_path / "test.parquet")
+        geometries = np.array([Point(3, 3), Point(0, 0), Point(3, 0), Point(0, 3)])
+        table = pa.table({"name": ["a", "b", "c", "d"]})
+
+        write_geoparquet(table, geometries, "EPSG:3006", file)
+
+        parquet_file = pq.ParquetFile(file)
+        geo = json.loads(parquet_file.schema_arrow.metadata[b"geo"])
+        assert geo["version"] == "1.1.0"
+        assert geo["columns"]["geometry"]["geometry_types"] == ["Point"]
+        assert geo["columns"]["geometry"]["bbox"] == [0.0, 0.0, 3.0, 3.0]
+        assert geo["columns"]["geometry"]["covering"]["bbox"]["xmin"] == ["bbox", "xmin"]
+        assert parquet_file.metadata.num_row_groups == 2
+        assert parquet_file.metadata.row_group(0).column(0).compression == "ZSTD"
+
+        written = pq.read_table(file)
+        assert written["name"].to_pylist() == ["b", "d", "a", "c"]
+        assert written["bbox"].to_pylist()[0] == {"xmin": 0, "ymin": 0, "xmax": 0, "ymax": 0}
+
+        df = gpd.read_parquet(file, columns=["name", "geometry"])
+        assert df.crs == "EPSG:3006"
+        assert df.geometry.tolist() == [Point(0, 0), Point(0, 3), Point(3, 3), Point(3, 0)]
@@ -0,0 +1,49 @@
+"""Journal unit tests."""
+
+import geopandas as gpd
+from geopandas import testing
+from shapely.geometry import Point
+
+from lantmateriet.journal import JOURNAL_FILE, JOURNAL_FOLDER, Journal
+
+
+class TestUnitJournal:
+    """Unit tests of Journal."""
+
+    def test_unit_resume(self, tmp_path):
+        """Unit test of Journal resume."""
+        df = gpd.GeoDataFrame({"geometry": [Point(0, 0)]}, crs="EPSG:3006")
+        entry = {"source": {"size": 1}}
+
+        journal = Journal(str(tmp_path))
+        journal.done(("file", "layer", "a"), entry, df)
+        journal.done(("file", "layer", "b"), entry)
+        journal.failed(("file", "layer", "c"), MemoryError())
+        journal.close()
+
+        with open(tmp_path / JOURNAL_FOLDER / JOURNAL_FILE, "a") as f:
+            f.write('{"key": ["file", "layer", "d"], "sta')
+
+        journal = Journal(str(tmp_path), resume=True)
+        assert set(journal.completed) == {("file", "layer", "a"), ("file", "layer", "b")}
+        assert journal.is_done(("file", "layer", "a"), entry) is True
+        assert journal.is_done(("file", "layer", "a"), {"source": {"size": 2}}) is False
+        assert journal.is_done(("file", "layer", "c"), entry) is False
+        testing.assert_geodataframe_equal(journal.result(("file", "layer", "a")), df)
+        assert journal.result(("file", "layer", "b")) is None
+
+        journal.done(("file", "layer", "d"), entry)
+        journal.close()
+        assert len(Journal(str(tmp_path), resume=True).completed) == 3
+
+    def test_unit_clear(self, tmp_path):
+        """Unit test of Journal clear and restart without resume."""
+        journal = Journal(str(tmp_path))
+        journal.done(("file", "layer", "a"), {})
+        journal.close()
+
+        assert len(Journal(str(tmp_path)).completed) == 0
+
+        journal = Journal(str(tmp_path), resume=True)
+        journal.clear()
+        assert not (tmp_path / JOURNAL_FOLDER).exists()
@@ -0,0 +1,74 @@
+"""Manifest unit tests."""
+
+import os
+
+import pytest
+
+from lantmateriet.config import config_10, config_50
+from lantmateriet.manifest import Manifest, config_fingerprint, file_fingerprint
+
+
+class TestUnitManifest:
+    """Unit tests of Manifest."""
+
+    def test_unit_config_fingerprint(self):
+        """Unit test of config_fingerprint function."""
+        assert config_fingerprint(config_50) == config_fingerprint(config_50)
+        assert config_fingerprint(config_50) != config_fingerprint(config_10)
+
+    @pytest.mark.parametrize("content_hash", [False, True])
+    def test_unit_file_fingerprint(self, tmp_path, content_hash):
+        """Unit test of file_fingerprint function."""
+        file = tmp_path / "source.gpkg"
+        file.write_bytes(b"data")
+        fingerprint = file_fingerprint(str(file), content_hash)
+
+        assert fingerprint["size"] == 4
+        assert ("sha256" in fingerprint) is content_hash
+
+        file.write_bytes(b"other")
+        assert file_fingerprint(str(file), content_hash) != fingerprint
+
+    def test_unit_is_current(self, tmp_path):
+        """Unit test of Manifest is_current method."""
+        source = tmp_path / "source.gpkg"
+        source.write_bytes(b"data")
+        target = tmp_path / "target"
+        output = str(target / "source" / "layer" / "name.fgb")
+
+        manifest = Manifest(str(target))
+        entry = manifest.entry(str(source), "layer", "name", config_50)
+        assert manifest.is_current(output, entry) is False
+
+        os.makedirs(os.path.dirname(output))
+        open(output, "w").close()
+        manifest.update(output, entry)
+        manifest.save()
+
+        manifest = Manifest(str(target))
+        assert manifest.outputs == {"source/layer/name.fgb": entry}
+        assert manifest.is_current(output, entry) is True
+        assert manifest.is_current(output, {**entry, "name": "other"}) is False
+        assert (
+            manifest.is_current(
+                output,
+                Manifest(str(target), options={"arrow": True}).entry(
+                    str(source), "layer", "name", config_50
+                ),
+            )
+            is False
+        )
+
+        source.write_bytes(b"changed")
+        assert (
+            manifest.is_current(
+                output, Manifest(str(target)).entry(str(source), "layer", "name", config_50)
+            )
+            is False
+        )
+
+        os.remove(output)
+        assert manifest.is_current(output, entry) is False
+
+        manifest.update(output, None)
+        assert manifest.outputs == {}
@@ -0,0 +1,97 @@
+"""Memory unit tests."""
+
+import numpy as np
+
+from lantmateriet import tracing
+from lantmateriet.memory import (
+    MEMORY_MARGIN,
+    TaskMemory,
+    current_rss,
+    format_memory_report,
+    load_memory_report,
+    measured_memory,
+    memory_per_worker,
+    memory_report,
+    peak_rss,
+    reset_peak_rss,
+    save_memory_report,
+)
+from lantmateriet.tracing import TASK_SPAN, Span, span, spans
+
+MB = 1024**2
+
+
+class TestUnitMemory:
+    """Unit tests of memory accounting."""
+
+    def test_unit_peak_rss(self):
+        """Unit test of peak_rss and reset_peak_rss functions."""
+        data = np.ones(50 * MB // 8)
+        del data
+
+        assert peak_rss() >= current_rss() > 0
+        if reset_peak_rss() is True:
+            assert peak_rss() < current_rss() + 25 * MB
+
+    def test_unit_span_memory(self, tmp_path):
+        """Unit test of span memory accounting."""
+        tracing.enable(memory=True)
+        try:
+            with span("task"):
+                with span("read"):
+                    data = np.ones(20 * MB // 8)
+                    del data
+                with span("write"):
+                    pass
+        finally:
+            tracing.disable()
+
+        read, write, task = spans()
+        tracing.flush(str(tmp_path))
+
+        assert read.peak_traced >= 20 * MB > write.peak_traced
+        assert task.peak_traced >= read.peak_traced
+        assert task.peak_rss >= read.peak_rss > 0
+        assert task.rss > 0
+
+    def test_unit_memory_report(self, tmp_path):
+        """Unit test of memory_report, save_memory_report and load_memory_report functions."""
+        small, large = ["a.gpkg", "mark", "small"], ["a.gpkg", "mark", "large"]
+        report = memory_report(
+            [
+                Span("read", task=large, peak_rss=300 * MB, peak_traced=50 * MB),
+                Span("dissolve_exterior", task=large, peak_rss=400 * MB, peak_traced=80 * MB),
+                Span(TASK_SPAN, task=large, rss=200 * MB, peak_rss=400 * MB, peak_traced=80 * MB),
+                Span(TASK_SPAN, task=small, rss=200 * MB, peak_rss=450 * MB, peak_traced=1 * MB),
+                Span("plan", peak_rss=500 * MB),
+            ],
+            TASK_SPAN,
+            {tuple(large): 10 * MB},
+        )
+
+        assert [task.key for task in report] == [small, large]
+        assert report[1].growth == 200 * MB
+        assert report[1].estimate == 10 * MB
+        assert report[1].stages == {
+            "read": {"peak_rss": 300 * MB, "peak_traced": 50 * MB},
+            "dissolve": {"peak_rss": 400 * MB, "peak_traced": 80 * MB},
+        }
+        assert format_memory_report(report).splitlines()[1].split()[3:] == [
+            "450.0",
+            "250.0",
+            "1.0",
+            "0.0",
+        ]
+
+        assert load_memory_report(str(tmp_path)) == {}
+        save_memory_report(str(tmp_path), report)
+        loaded = load_memory_report(str(tmp_path))
+
+        assert loaded[tuple(large)] == report[1]
+        assert measured_memory(loaded[tuple(large)]) == int(200 * MB * MEMORY_MARGIN)
+        assert measured_memory(loaded[tuple(small)]) == int(250 * MB * MEMORY_MARGIN)
+        reused = TaskMemory(large, 400 * MB, 0, 80 * MB, 10 * MB)
+        assert measured_memory(reused) == int(80 * MB * MEMORY_MARGIN)
+        assert measured_memory(TaskMemory(large, 400 * MB, 0, 1 * MB, 10 * MB)) == 10 * MB
+        assert memory_per_worker(loaded) == int(450 * MB * MEMORY_MARGIN)
+        assert memory_per_worker({}) is None
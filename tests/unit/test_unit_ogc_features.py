@@ -0,0 +1,116 @@
+"""OGC API Features unit tests."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from lantmateriet.ogc_features import OGCFeatures
+
+BASE_URL = "https://example.com/ogc-features/v1/dataset"
+ITEMS_URL = BASE_URL + "/collections/items/items"
+
+
+def feature(i: int) -> dict:
+    """Create test feature.
+
+    Args:
+        i: feature id
+
+    Returns:
+        feature
+    """
+    return {"type": "Feature", "id": i, "geometry": None, "properties": {}}
+
+
+def paged_handler(number_matched: int, use_offset: bool, fail_offset: int = -1):
+    """Create handler paging features by offset.
+
+    Args:
+        number_matched: number of features in collection
+        use_offset: if next links page by offset
+        fail_offset: offset to fail at
+
+    Returns:
+        request handler and list of requests made
+    """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        params = request.url.params
+        limit = int(params["limit"])
+        offset = int(params.get("offset", params.get("page", 0)))
+
+        if offset == fail_offset:
+            return httpx.Response(500)
+
+        links = []
+        if offset + limit < number_matched:
+            key = "offset" if use_offset else "page"
+            links.append(
+                {"rel": "next", "href": f"{ITEMS_URL}?limit={limit}&{key}={offset + limit}"}
+            )
+
+        return httpx.Response(
+            200,
+            json={
+                "type": "FeatureCollection",
+                "features": [
+                    feature(i) for i in range(offset, min(offset + limit, number_matched))
+                ],
+                "numberMatched": number_matched,
+                "links": links,
+            },
+        )
+
+    return handler, requests
+
+
+class TestUnitOGCFeatures:
+    """Unit tests of OGCFeatures."""
+
+    @pytest.mark.parametrize("use_offset", [True, False])
+    @pytest.mark.parametrize("number_matched", [0, 1, 3, 7])
+    def test_unit_collection_items(self, use_offset, number_matched):
+        """Unit test of OGCFeatures collection_items method."""
+        handler, requests = paged_handler(number_matched, use_offset)
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        features = OGCFeatures(BASE_URL, limit=2, client=client)
+
+        result = asyncio.run(features.collection_items("items", lanskod="01"))
+
+        assert [f["id"] for f in result["features"]] == list(range(number_matched))
+        assert result["numberReturned"] == number_matched
+        assert all(link["rel"] != "next" for link in result["links"])
+        assert requests[0].url.params["lanskod"] == "01"
+        assert len(requests) == max(1, -(-number_matched // 2))
+
+    def test_unit_collection_items_failure(self):
+        """Unit test of OGCFeatures collection_items method with failing page."""
+        handler, _ = paged_handler(20, True, fail_offset=4)
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        features = OGCFeatures(BASE_URL, limit=2, concurrency=2, client=client)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(features.collection_items("items"))
+
+    def test_unit_collections(self):
+        """Unit test of OGCFeatures collections method and connection pool context."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.headers["authorization"].startswith("Basic")
+            return httpx.Response(200, json={"collections": [{"id": "lan"}, {"id": "rike"}]})
+
+        async def run() -> list[str]:
+            features = OGCFeatures(BASE_URL, auth=("user", "password"))
+            async with features:
+                features._client = httpx.AsyncClient(
+                    auth=("user", "password"), transport=httpx.MockTransport(handler)
+                )
+                result = await features.collections()
+
+            assert features._client is None
+            return result
+
+        assert asyncio.run(run()) == ["lan", "rike"]
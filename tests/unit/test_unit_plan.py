@@ -0,0 +1,45 @@
+"""Plan unit tests."""
+
+from lantmateriet.plan import PLAN_FILE, format_plan, load_plan, plan_entries, save_plan
+from lantmateriet.scheduler import Task
+
+
+class TestUnitPlan:
+    """Unit tests of extraction plans."""
+
+    def test_unit_plan_entries(self):
+        """Unit test of plan_entries function."""
+        tasks = [
+            Task(("a.gpkg", "mark", "small"), (), 10.0, 1024, {"features": 2, "vertices": 80}),
+            Task(("a.gpkg", "mark", "large"), (), 500.0, 2048, {"features": 40, "vertices": 900}),
+            Task(("b.gpkg", "vaglinje", "road"), (), 50.0, 512),
+        ]
+        entries = plan_entries(tasks, {("a.gpkg", "mark", "large")})
+
+        assert [entry.name for entry in entries] == ["large", "road", "small"]
+        assert [entry.stale for entry in entries] == [True, False, False]
+        assert (entries[0].features, entries[0].vertices, entries[0].memory) == (40, 900, 2048)
+        assert (entries[1].features, entries[1].vertices) == (0, 0)
+
+    def test_unit_save_plan(self, tmp_path):
+        """Unit test of save_plan, load_plan and format_plan functions."""
+        tasks = [Task(("a.gpkg", "mark", "sjö"), (), 12.5, 1024**2, {"features": 3})]
+        entries = plan_entries(tasks, set())
+
+        plan_file = save_plan(str(tmp_path), entries)
+        assert plan_file == str(tmp_path / PLAN_FILE)
+        assert load_plan(plan_file) == entries
+
+        lines = format_plan(entries).splitlines()
+        assert lines[0].split() == [
+            "file",
+            "layer",
+            "name",
+            "features",
+            "vertices",
+            "cost",
+            "memory_mb",
+            "stale",
+        ]
+        assert lines[1].split() == ["a.gpkg", "mark", "sjö", "3", "0", "12", "1.0", "no"]
+        assert lines[2].split() == ["total", "3", "0", "12", "0"]
@@ -0,0 +1,97 @@
+"""Profiler unit tests."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lantmateriet.profiler import (
+    PROFILE_FILE,
+    PROFILE_FOLDER,
+    SamplingProfiler,
+    escape,
+    profile_task,
+    read_folded,
+    save_profile,
+    start_profile,
+    top_frames,
+)
+
+
+def busy(seconds: float) -> None:
+    """Keep thread busy.
+
+    Args:
+        seconds: time to be busy
+    """
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def kept_busy(seconds: float) -> None:
+    """Keep thread of a pool kept from before profiling busy.
+
+    Args:
+        seconds: time to be busy
+    """
+    busy(seconds)
+
+
+class TestUnitProfiler:
+    """Unit tests of sampling profiler."""
+
+    def test_unit_sampling_profiler(self):
+        """Unit test of SamplingProfiler."""
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        busy(0.1)
+        profiler.stop()
+
+        assert sum(profiler.stacks.values()) > 10
+        assert any("busy (test_unit_profiler.py" in stack[-1] for stack in profiler.stacks)
+
+        lines = profiler.folded(("a.gpkg", "mark", "sjö; äng"))
+        assert all(line.startswith("a.gpkg;mark;sjö: äng;") for line in lines)
+        assert escape("a;b") == "a:b"
+
+    def test_unit_sampling_profiler_threads(self):
+        """Unit test of SamplingProfiler sampling threads started while profiling."""
+        existing = threading.Thread(target=busy, args=(0.3,))
+        existing.start()
+        kept = ThreadPoolExecutor(max_workers=1)
+        kept.submit(busy, 0).result()
+
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(busy, [0.1, 0.1]))
+        kept.submit(kept_busy, 0.1).result()
+        profiler.stop()
+        existing.join()
+        kept.shutdown()
+
+        pooled = [stack for stack in profiler.stacks if stack[0].startswith("_bootstrap ")]
+        assert all("busy (test_unit_profiler.py" in stack[-1] for stack in pooled)
+        assert any("kept_busy (" in stack[-2] for stack in pooled)
+        assert any("kept_busy (" not in stack[-2] for stack in pooled)
+        assert all("_worker (thread.py" in " ".join(stack) for stack in pooled)
+        assert any(not stack[0].startswith("_bootstrap ") for stack in profiler.stacks)
+
+    def test_unit_save_profile(self, tmp_path):
+        """Unit test of profile_task, save_profile and top_frames functions."""
+        profile_path = start_profile(str(tmp_path))
+        for name in ["a", "b"]:
+            with profile_task(profile_path, ("/data/a.gpkg", "mark", name), interval=0.001):
+                busy(0.05)
+
+        profile_file = save_profile(str(tmp_path), profile_path)
+        assert profile_file == str(tmp_path / PROFILE_FILE)
+        assert not (tmp_path / PROFILE_FOLDER).exists()
+
+        stacks = read_folded(profile_file)
+        assert {stack.split(";")[2] for stack in stacks} == {"a", "b"}
+        assert all(stack.startswith("a.gpkg;mark;") for stack in stacks)
+
+        lines = top_frames(stacks).splitlines()
+        assert lines[0].split() == ["frame", "self_samples", "self_share", "total_samples"]
+        assert lines[1].startswith("busy (test_unit_profiler.py")
@@ -0,0 +1,54 @@
+"""Border pyramid unit tests."""
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import MultiPolygon, box
+
+from lantmateriet import config
+from lantmateriet.pyramid import BorderPyramid, coordinate_precision, scale_to_resolution
+from lantmateriet.topology import Topology
+
+municipalities = gpd.GeoDataFrame(
+    {
+        "kommunkod": ["0114", "0180"],
+        "geometry": [
+            MultiPolygon([box(670000, 6580000, 675000, 6585000)]),
+            MultiPolygon([box(675000, 6580000, 680000, 6585000)]),
+        ],
+    },
+    crs=config.config_50.espg_3006,
+)
+
+
+class TestUnitBorderPyramid:
+    """Unit tests of BorderPyramid."""
+
+    @pytest.mark.parametrize(
+        "tolerance, expected_result", [(0, 7), (1, 7), (10, 6), (1000, 4), (1e9, 0)]
+    )
+    def test_unit_coordinate_precision(self, tolerance, expected_result):
+        """Unit test of coordinate_precision function."""
+        assert coordinate_precision(tolerance) == expected_result
+
+    def test_unit_scale_to_resolution(self):
+        """Unit test of scale_to_resolution function."""
+        assert scale_to_resolution(1_000_000) == pytest.approx(280)
+
+    def test_unit_build(self, tmp_path):
+        """Unit test of BorderPyramid build and read methods."""
+        topology = Topology.from_geodataframes({"kommuner": municipalities})
+        pyramid = BorderPyramid.build(topology, str(tmp_path), (0.0, 100.0, 1000.0))
+
+        assert [entry["tolerance"] for entry in pyramid.index["levels"]["kommuner"]] == [
+            0.0,
+            100.0,
+            1000.0,
+        ]
+        assert pyramid.tolerance("kommuner", 1_000) == 0.0
+        assert pyramid.tolerance("kommuner", 1_000_000) == 100.0
+        assert pyramid.tolerance("kommuner", 10_000_000) == 1000.0
+        assert pyramid.file("kommuner", 1_000).endswith("kommuner_0.geojson")
+
+        result = BorderPyramid(str(tmp_path)).read("kommuner", 10_000_000)
+        assert result.crs == config.config_50.epsg_4326
+        assert list(result["kommunkod"]) == ["0114", "0180"]
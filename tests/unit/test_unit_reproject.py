@@ -0,0 +1,70 @@
+"""Reprojection unit tests."""
+
+import numpy as np
+import pytest
+import shapely
+from pyproj import Transformer
+from shapely.geometry import LineString, Point, Polygon
+
+from lantmateriet.reproject import crs_suffix, reproject, transform_coordinates, transformer
+
+
+class TestUnitReproject:
+    """Unit tests of reprojection."""
+
+    def test_unit_transformer(self):
+        """Unit test of transformer function."""
+        assert transformer("EPSG:3006", "EPSG:4326") is transformer("EPSG:3006", "EPSG:4326")
+        assert transformer("EPSG:3006", "EPSG:4326") is not transformer("EPSG:3006", "EPSG:3857")
+
+    @pytest.mark.parametrize("chunk_size", [2, 3, 100])
+    def test_unit_transform_coordinates(self, chunk_size):
+        """Unit test of transform_coordinates function."""
+        x = np.linspace(300_000, 900_000, 7)
+        y = np.linspace(6_200_000, 7_600_000, 7)
+        expected_x, expected_y = Transformer.from_crs(
+            "EPSG:3006", "EPSG:4326", always_xy=True
+        ).transform(x, y)
+
+        transform_coordinates(x, y, "EPSG:3006", "EPSG:4326", chunk_size)
+
+        np.testing.assert_allclose(x, expected_x)
+        np.testing.assert_allclose(y, expected_y)
+
+    def test_unit_crs_suffix(self):
+        """Unit test of crs_suffix function."""
+        assert crs_suffix("EPSG:3006") == "_epsg3006"
+
+    def test_unit_reproject(self):
+        """Unit test of reproject function."""
+        geometries = np.array(
+            [
+                Point(500_000, 6_500_000),
+                LineString([(500_000, 6_500_000, 10), (510_000, 6_510_000, 20)]),
+                Polygon([(500_000, 6_500_000), (510_000, 6_500_000), (510_000, 6_510_000)]),
+            ]
+        )
+        original = geometries.copy()
+
+        projected = reproject(geometries, "EPSG:3006", ["EPSG:3006", "EPSG:4326"])
+
+        assert projected["EPSG:3006"] is geometries
+        assert list(geometries) == list(original)
+        expected = shapely.transform(
+            geometries,
+            Transformer.from_crs("EPSG:3006", "EPSG:4326", always_xy=True).transform,
+            interleaved=False,
+        )
+        assert shapely.equals_exact(projected["EPSG:4326"], expected, 1e-9).all()
+        assert shapely.has_z(projected["EPSG:4326"]).tolist() == [False, True, False]
+        assert shapely.get_coordinates(projected["EPSG:4326"][1], include_z=True)[
+            :, 2
+        ].tolist() == [
+            10,
+            20,
+        ]
+
+    def test_unit_reproject_without_crs(self):
+        """Unit test of reproject function without CRS."""
+        with pytest.raises(ValueError):
+            reproject(np.array([Point(0, 0)]), None, ["EPSG:4326"])
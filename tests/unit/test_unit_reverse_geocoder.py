@@ -0,0 +1,85 @@
+"""Reverse geocoder unit tests."""
+
+from unittest.mock import MagicMock
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import box
+
+from lantmateriet import config
+from lantmateriet.admin_border_types import FeatureGeoJsonKommuner
+from lantmateriet.reverse_geocoder import ReverseGeocoder
+
+municipalities = gpd.GeoDataFrame(
+    {
+        "kommunkod": ["0180", "0114"],
+        "lanskod": ["01", "01"],
+        "geometry": [
+            box(674000, 6580000, 676000, 6582000),
+            box(672000, 6580000, 674000, 6582000),
+        ],
+    },
+    crs=config.config_50.espg_3006,
+)
+
+
+class TestUnitReverseGeocoder:
+    """Unit tests of ReverseGeocoder."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 100])
+    def test_unit_lookup(self, chunk_size):
+        """Unit test of ReverseGeocoder lookup method."""
+        geocoder = ReverseGeocoder(municipalities, chunk_size=chunk_size, workers=2)
+        result = geocoder.lookup(
+            np.array([675000, 673000, 674000, 0]),
+            np.array([6581000, 6581000, 6581000, 0]),
+        )
+
+        assert list(result["kommunkod"]) == ["0180", "0114", "0114", None]
+        assert list(result["lanskod"]) == ["01", "01", "01", None]
+
+    def test_unit_lookup_index_crs(self):
+        """Unit test of ReverseGeocoder lookup_index method with EPSG:4326."""
+        geocoder = ReverseGeocoder(municipalities)
+        points = gpd.GeoSeries.from_xy(
+            [675000, 673000], [6581000, 6581000], crs=config.config_50.espg_3006
+        ).to_crs(config.config_50.epsg_4326)
+
+        result = geocoder.lookup_index(points.x, points.y, crs=config.config_50.epsg_4326)
+        assert list(result) == [1, 0]
+
+    def test_unit_lookup_index_bbox_only(self):
+        """Unit test of ReverseGeocoder lookup_index method with bbox only."""
+        triangle = gpd.GeoDataFrame(
+            {
+                "kommunkod": ["0114"],
+                "lanskod": ["01"],
+                "geometry": [box(0, 0, 2, 2).difference(box(1, 1, 2, 2))],
+            },
+            crs=config.config_50.espg_3006,
+        )
+        geocoder = ReverseGeocoder(triangle)
+
+        assert list(geocoder.lookup_index(np.array([1.5]), np.array([1.5]))) == [-1]
+        assert list(geocoder.lookup_index(np.array([1.5]), np.array([1.5]), bbox_only=True)) == [0]
+
+    def test_unit_from_admin_borders(self):
+        """Unit test of ReverseGeocoder from_admin_borders method."""
+        admin_borders = MagicMock()
+        admin_borders.get_municipalities.return_value = [
+            FeatureGeoJsonKommuner(
+                type="Feature",
+                geometry={
+                    "type": "MultiPolygon",
+                    "coordinates": [[[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]],
+                },
+                properties={"kommunkod": "0114", "lanskod": "01"},
+            )
+        ]
+
+        geocoder = ReverseGeocoder.from_admin_borders(admin_borders)
+        result = geocoder.lookup(np.array([0.5]), np.array([0.5]))
+
+        admin_borders.get_municipalities.assert_called_once_with(crs=config.config_50.espg_3006)
+        assert list(result["kommunkod"]) == ["0114"]
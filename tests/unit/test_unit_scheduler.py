@@ -0,0 +1,150 @@
+"""Scheduler unit tests."""
+
+import subprocess
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from unittest.mock import patch
+
+import pytest
+
+from lantmateriet.scheduler import MEMORY_PER_WORKER, Task, TaskScheduler, auto_workers
+
+
+def identity(*args):
+    """Return arguments.
+
+    Args:
+        args: arguments
+
+    Returns:
+        arguments
+    """
+    return args
+
+
+class TestUnitTaskScheduler:
+    """Unit tests of TaskScheduler."""
+
+    @pytest.mark.parametrize(
+        "cpus, memory, expected_result",
+        [
+            (8, 64 * MEMORY_PER_WORKER, 8),
+            (8, 3 * MEMORY_PER_WORKER, 3),
+            (8, 0, 1),
+        ],
+    )
+    @patch("lantmateriet.scheduler.available_memory")
+    @patch("lantmateriet.scheduler.available_cpus")
+    def test_unit_auto_workers(self, mock_cpus, mock_memory, cpus, memory, expected_result):
+        """Unit test of auto_workers function."""
+        mock_cpus.return_value = cpus
+        mock_memory.return_value = memory
+        assert auto_workers() == expected_result
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_unit_run(self, workers):
+        """Unit test of TaskScheduler run method."""
+        started = []
+        with ThreadPoolExecutor(workers) as executor:
+
+            def submit(function, args):
+                started.append(args)
+                return executor.submit(function, *args)
+
+            scheduler = TaskScheduler(workers, submit)
+            tasks = [Task(key, (key,), cost) for key, cost in (("a", 1), ("b", 3), ("c", 2))]
+            results = scheduler.run(identity, tasks)
+
+        assert results == {"a": ("a",), "b": ("b",), "c": ("c",)}
+        assert started == [("b",), ("c",), ("a",)]
+
+    @pytest.mark.parametrize(
+        "heavy_workers, expected_result",
+        [
+            (1, [["a", "c", "d"], ["b", "e"]]),
+            (2, [["a"], ["b", "c", "d"], ["e"]]),
+        ],
+    )
+    def test_unit_run_memory(self, heavy_workers, expected_result):
+        """Unit test of TaskScheduler run method with memory budget."""
+        batches: list[list] = [[]]
+
+        def submit(function, args):
+            batches[-1].append(args[0])
+            future: Future = Future()
+            future.set_result(function(*args))
+            return future
+
+        def wait_batch(futures, return_when):
+            batches.append([])
+            return wait(futures, return_when=return_when)
+
+        scheduler = TaskScheduler(
+            3, submit, memory_budget=10, heavy_memory=6, heavy_workers=heavy_workers
+        )
+        tasks = [
+            Task(key, (key,), cost, memory)
+            for key, cost, memory in (
+                ("a", 5, 6),
+                ("b", 4, 6),
+                ("c", 3, 2),
+                ("d", 2, 2),
+                ("e", 1, 2),
+            )
+        ]
+        with patch("lantmateriet.scheduler.wait", wait_batch):
+            results = scheduler.run(identity, tasks)
+
+        assert len(results) == 5
+        assert [batch for batch in batches if batch] == expected_result
+
+    def test_unit_run_over_budget(self):
+        """Unit test of TaskScheduler run method with task exceeding memory budget."""
+        with ThreadPoolExecutor(1) as executor:
+            scheduler = TaskScheduler(
+                2, lambda function, args: executor.submit(function, *args), memory_budget=1
+            )
+            results = scheduler.run(identity, [Task("a", ("a",), 1, 100)])
+
+        assert results == {"a": ("a",)}
+
+    @pytest.mark.parametrize(
+        "retries, fails, expected_result, expected_failures",
+        [
+            (2, 2, {"a": ("a",), "b": ("b",)}, set()),
+            (1, 2, {"b": ("b",)}, {"a"}),
+        ],
+    )
+    def test_unit_run_retries(self, retries, fails, expected_result, expected_failures):
+        """Unit test of TaskScheduler run method with failing tasks."""
+        calls = {"a": 0}
+        done = []
+
+        def flaky(key):
+            if key == "a" and calls["a"] < fails:
+                calls["a"] += 1
+                raise MemoryError("worker died")
+
+            return (key,)
+
+        with ThreadPoolExecutor(2) as executor:
+            scheduler = TaskScheduler(
+                4, lambda function, args: executor.submit(function, *args), retries=retries
+            )
+            results = scheduler.run(
+                flaky,
+                [Task("a", ("a",), 2), Task("b", ("b",), 1)],
+                on_done=lambda task, result: done.append(task.key),
+            )
+
+        assert results == expected_result
+        assert set(scheduler.failures) == expected_failures
+        assert sorted(done) == sorted(expected_result)
+
+    def test_unit_import_without_ray(self):
+        """Unit test of importing the scheduler and geometry when ray is not installed."""
+        code = (
+            "import sys; sys.modules['ray'] = None; "
+            "import lantmateriet.scheduler, lantmateriet.geometry"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
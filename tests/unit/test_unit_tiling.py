@@ -0,0 +1,68 @@
+"""Tiling unit tests."""
+
+import numpy as np
+import pytest
+from shapely.geometry import LineString, Point
+
+from lantmateriet.tiling import TileIndex, group_by_tile, tile_bounds, tile_name, write_index
+
+
+class TestUnitTiling:
+    """Unit tests of tiling."""
+
+    def test_unit_tile_name(self):
+        """Unit test of tile_name function."""
+        assert tile_name((10, 130)) == "10_130"
+
+    def test_unit_tile_bounds(self):
+        """Unit test of tile_bounds function."""
+        assert tile_bounds((10, 130), 50_000) == [500_000, 6_500_000, 550_000, 6_550_000]
+
+    @pytest.mark.parametrize(
+        "geometries, expected_result",
+        [
+            (
+                [
+                    Point(520_000, 6_510_000),
+                    Point(560_000, 6_510_000),
+                    LineString([(560_000, 6_520_000), (580_000, 6_520_000)]),
+                    Point(510_000, 6_540_000),
+                ],
+                {(10, 130): [0, 3], (11, 130): [1, 2]},
+            ),
+            ([], {}),
+        ],
+    )
+    def test_unit_group_by_tile(self, geometries, expected_result):
+        """Unit test of group_by_tile function."""
+        tiles = group_by_tile(np.array(geometries, dtype=object), 50_000)
+        assert {tile: indices.tolist() for tile, indices in tiles.items()} == expected_result
+
+    def test_unit_tile_index(self, tmp_path):
+        """Unit test of TileIndex files method."""
+        tiles = [
+            {
+                "tile": [10, 130],
+                "file": "10_130.fgb",
+                "extent": [500_000, 6_500_000, 560_000, 6_540_000],
+            },
+            {
+                "tile": [11, 130],
+                "file": "11_130.fgb",
+                "extent": [550_000, 6_500_000, 600_000, 6_550_000],
+            },
+        ]
+        write_index(str(tmp_path), tiles, 50_000, "fgb", "EPSG:4326")
+        index = TileIndex(str(tmp_path))
+
+        assert index.index["crs"] == "EPSG:4326"
+        assert index.index["extent_crs"] == "EPSG:3006"
+        assert index.files() == [str(tmp_path / "10_130.fgb"), str(tmp_path / "11_130.fgb")]
+        assert index.files((555_000, 6_500_000, 556_000, 6_501_000)) == [
+            str(tmp_path / "10_130.fgb"),
+            str(tmp_path / "11_130.fgb"),
+        ]
+        assert index.files((590_000, 6_500_000, 591_000, 6_501_000)) == [
+            str(tmp_path / "11_130.fgb")
+        ]
+        assert index.files((0, 0, 1, 1)) == []
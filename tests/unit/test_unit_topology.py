@@ -0,0 +1,93 @@
+"""Topology unit tests."""
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import MultiPolygon, Polygon, box
+
+from lantmateriet import config
+from lantmateriet.topology import Topology
+
+municipalities = gpd.GeoDataFrame(
+    {
+        "kommunkod": ["0114", "0180"],
+        "geometry": [
+            MultiPolygon([Polygon([(0, 0), (1, 0), (1.5, 0.5), (1, 1), (0, 1)])]),
+            MultiPolygon(
+                [
+                    Polygon(
+                        [(1, 0), (2, 0), (2, 1), (1, 1), (1.5, 0.5)],
+                        [[(1.7, 0.2), (1.9, 0.2), (1.9, 0.4), (1.7, 0.4)]],
+                    ),
+                    box(3, 0, 4, 1),
+                ]
+            ),
+        ],
+    },
+    crs=config.config_50.espg_3006,
+)
+counties = gpd.GeoDataFrame(
+    {
+        "lanskod": ["01"],
+        "geometry": [MultiPolygon([box(0, 0, 2, 1), box(3, 0, 4, 1)])],
+    },
+    crs=config.config_50.espg_3006,
+)
+
+
+class TestUnitTopology:
+    """Unit tests of Topology."""
+
+    def test_unit_from_geodataframes(self):
+        """Unit test of Topology from_geodataframes method."""
+        topology = Topology.from_geodataframes({"kommuner": municipalities, "lan": counties})
+
+        assert len(topology.arcs) == 5
+        assert len(topology.objects["kommuner"].geometries[1]) == 2
+        assert len(topology.objects["kommuner"].geometries[1][0]) == 2
+
+        for name, df in (("kommuner", municipalities), ("lan", counties)):
+            result = topology.to_geodataframe(name)
+            assert list(result.columns) == list(df.columns)
+            assert all(shapely.equals(result.geometry.to_numpy(), df.geometry.to_numpy()))
+
+    def test_unit_from_geodataframes_not_noded(self):
+        """Unit test of Topology from_geodataframes method with borders not noded exactly."""
+        crossing = gpd.GeoDataFrame(
+            {"kommunkod": ["0114"]},
+            geometry=[Polygon([(0.1, 0.1), (0.7, 0.3), (1.3, 0.9), (0.2, 0.8)])],
+            crs=config.config_50.espg_3006,
+        )
+        square = gpd.GeoDataFrame(
+            {"lanskod": ["01"]}, geometry=[box(0, 0, 1, 1)], crs=config.config_50.espg_3006
+        )
+
+        with pytest.raises(ValueError, match="Ring 0 of kommuner is not covered"):
+            Topology.from_geodataframes({"kommuner": crossing, "lan": square})
+
+    def test_unit_simplify(self):
+        """Unit test of Topology simplify method."""
+        topology = Topology.from_geodataframes({"kommuner": municipalities})
+        simplified = topology.simplify_many([0.0, 0.6])
+
+        assert set(simplified) == {0.0, 0.6}
+
+        result = simplified[0.6].to_geodataframe("kommuner")
+        shared = shapely.intersection(result.geometry[0], result.geometry[1])
+        assert shared.area == 0
+        assert shapely.union_all(result.geometry).area == pytest.approx(2.96)
+
+    @pytest.mark.parametrize("quantization", [None, 10_001])
+    def test_unit_topojson(self, quantization):
+        """Unit test of Topology to_topojson and from_topojson methods."""
+        topology = Topology.from_geodataframes({"kommuner": municipalities, "lan": counties})
+        topojson = topology.to_topojson(quantization)
+
+        assert topojson["type"] == "Topology"
+        assert ("transform" in topojson) is (quantization is not None)
+        assert topojson["objects"]["lan"]["geometries"][0]["properties"] == {"lanskod": "01"}
+
+        result = Topology.from_topojson(topojson).to_geodataframe("kommuner")
+        assert result.crs == municipalities.crs
+        assert np.allclose(result.area, municipalities.area)
@@ -0,0 +1,67 @@
+"""Tracing unit tests."""
+
+import json
+
+from lantmateriet import tracing
+from lantmateriet.tracing import (
+    TRACE_FILE,
+    TRACE_FOLDER,
+    read_trace,
+    save_trace,
+    span,
+    spans,
+    start,
+    summary,
+    trace_task,
+)
+
+
+class TestUnitTracing:
+    """Unit tests of tracing."""
+
+    def test_unit_span_disabled(self):
+        """Unit test of span function without tracing."""
+        tracing.disable()
+        with span("read", 10) as current:
+            current.nbytes = 100
+
+        assert current.features == 10
+        assert spans() == []
+
+    def test_unit_trace_task(self, tmp_path):
+        """Unit test of trace_task function and saved trace."""
+        trace_path = start(str(tmp_path))
+        with span("plan", 1):
+            pass
+
+        tracing.disable()
+        with trace_task(trace_path, ("file", "layer", "name")) as task:
+            with span("read", 10) as read:
+                read.nbytes = 1024**2
+            with span("write", 10):
+                pass
+            task.features = 10
+
+        assert tracing.is_enabled() is False
+        assert spans() == []
+
+        trace_file = save_trace(str(tmp_path), trace_path)
+        assert trace_file == str(tmp_path / TRACE_FILE)
+        assert not (tmp_path / TRACE_FOLDER).exists()
+
+        with open(trace_file, "r") as f:
+            events = json.load(f)["traceEvents"]
+        assert [event["name"] for event in events] == ["plan", "task", "read", "write"]
+        assert all(event["ph"] == "X" for event in events)
+        assert events[0]["args"]["task"] is None
+        assert events[2]["args"]["task"] == ["file", "layer", "name"]
+
+        trace_spans = read_trace(trace_file)
+        assert [item.features for item in trace_spans] == [1, 10, 10, 10]
+        assert trace_spans[2].nbytes == 1024**2
+        assert trace_spans[1].start <= trace_spans[2].start
+
+        lines = summary(trace_spans).splitlines()
+        assert lines[0].split()[:3] == ["stage", "calls", "wall_s"]
+        assert {line.split()[0] for line in lines[1:]} == {"plan", "task", "read", "write"}
+        assert [line.split()[5] for line in lines[1:] if line.startswith("read")] == ["1.0"]
@@ -0,0 +1,199 @@
+"""Vector tiles unit tests."""
+
+import gzip
+
+import geopandas as gpd
+import numpy as np
+import pyarrow as pa
+import pytest
+from shapely.geometry import LineString, Point, Polygon, box
+
+mapbox_vector_tile = pytest.importorskip("mapbox_vector_tile")
+pmtiles_reader = pytest.importorskip("pmtiles.reader")
+
+from pmtiles.tile import zxy_to_tileid  # noqa: E402
+
+from lantmateriet.geoparquet import write_geoparquet  # noqa: E402
+from lantmateriet.vector_tiles import (  # noqa: E402
+    ORIGIN,
+    VectorLayer,
+    blocks,
+    build_pmtiles,
+    encode_block,
+    find_outputs,
+    resolution,
+    simplify_layer,
+    tile_block,
+    tile_bounds,
+    tile_range,
+)
+
+
+class TestUnitVectorTiles:
+    """Unit tests of vector tiles."""
+
+    def test_unit_tile_bounds(self):
+        """Unit test of tile_bounds function."""
+        assert tile_bounds(0, 0, 0) == (-ORIGIN, -ORIGIN, ORIGIN, ORIGIN)
+        assert tile_bounds(1, 1, 0) == (0, 0, ORIGIN, ORIGIN)
+
+    @pytest.mark.parametrize(
+        "bounds, zoom, expected_result",
+        [
+            ((-1, -1, 1, 1), 0, (0, 0, 0, 0)),
+            ((-1, -1, 1, 1), 1, (0, 0, 1, 1)),
+            ((1, 1, 2, 2), 2, (2, 1, 2, 1)),
+            ((-2 * ORIGIN, -2 * ORIGIN, 2 * ORIGIN, 2 * ORIGIN), 1, (0, 0, 1, 1)),
+        ],
+    )
+    def test_unit_tile_range(self, bounds, zoom, expected_result):
+        """Unit test of tile_range function."""
+        assert tile_range(bounds, zoom) == expected_result
+
+    def test_unit_simplify_layer(self):
+        """Unit test of simplify_layer function."""
+        pixel = resolution(10)
+        layer = VectorLayer(
+            "test",
+            np.array(
+                [
+                    Point(0, 0),
+                    LineString([(0, 0), (pixel / 2, 0)]),
+                    LineString([(0, 0), (5 * pixel, pixel / 10), (10 * pixel, 0)]),
+                    Polygon([(0, 0), (pixel / 2, 0), (0, pixel / 2)]),
+                ],
+                dtype=object,
+            ),
+            [{"id": "0"}, {"id": "1"}, {"id": "2"}, {"id": "3"}],
+        )
+        simplified = simplify_layer(layer, 10)
+
+        assert simplified.properties == [{"id": "0"}, {"id": "2"}]
+        assert len(simplified.geometries[1].coords) == 2
+
+    def test_unit_encode_block(self):
+        """Unit test of encode_block function."""
+        line = LineString([(ORIGIN / 4, ORIGIN / 4), (ORIGIN / 2, ORIGIN / 2)])
+        encoded = encode_block(
+            "test",
+            1,
+            [(0, 0), (1, 0), (1, 1)],
+            np.array([line], dtype=object),
+            [{"objekttyp": "väg"}],
+        )
+
+        assert [tile_id for tile_id, _ in encoded] == [zxy_to_tileid(1, 1, 0)]
+        decoded = mapbox_vector_tile.decode(encoded[0][1])
+        assert decoded["test"]["features"][0]["properties"] == {"objekttyp": "väg"}
+        assert decoded["test"]["features"][0]["geometry"]["type"] == "LineString"
+
+    def test_unit_build_pmtiles(self, tmp_path):
+        """Unit test of build_pmtiles function."""
+        with pytest.raises(ValueError):
+            build_pmtiles(str(tmp_path), str(tmp_path / "empty.pmtiles"), workers=1)
+
+        roads = tmp_path / "kommunikation_sverige" / "vaglinje"
+        ground = tmp_path / "mark_sverige" / "mark"
+        roads.mkdir(parents=True)
+        ground.mkdir(parents=True)
+
+        gpd.GeoDataFrame(
+            {"objekttyp": ["Motorväg"]},
+            geometry=[LineString([(17.9, 59.3), (18.1, 59.4)])],
+            crs="EPSG:4326",
+        ).to_file(roads / "07_motorvag.fgb")
+        gpd.GeoDataFrame(
+            {"objekttyp": ["Sjö"]},
+            geometry=[Polygon([(17.9, 59.3), (18.0, 59.3), (18.0, 59.35)])],
+            crs="EPSG:4326",
+        ).to_file(ground / "11_sjo.fgb")
+        write_geoparquet(
+            pa.table({"objekttyp": ["Landsväg"]}),
+            np.array([LineString([(13.0, 55.6), (13.1, 55.7)])]),
+            "EPSG:4326",
+            str(roads / "05_landsvag.parquet"),
+        )
+
+        assert list(find_outputs(str(tmp_path))) == ["mark", "vaglinje"]
+
+        archive = str(tmp_path / "basemap.pmtiles")
+        assert build_pmtiles(str(tmp_path), archive, 5, 7, workers=1) == 6
+
+        with open(archive, "rb") as f:
+            reader = pmtiles_reader.Reader(pmtiles_reader.MmapSource(f))
+            header = reader.header()
+            metadata = reader.metadata()
+            tile = mapbox_vector_tile.decode(gzip.decompress(reader.get(5, 17, 9)))
+
+        assert header["min_zoom"] == 5 and header["max_zoom"] == 7
+        assert round(header["min_lon_e7"] / 1e7, 1) == 13.0
+        assert [layer["id"] for layer in metadata["vector_layers"]] == ["mark", "vaglinje"]
+        assert set(tile) == {"mark", "vaglinje"}
+        assert sorted(
+            feature["properties"]["objekttyp"] for feature in tile["vaglinje"]["features"]
+        ) == ["Landsväg", "Motorväg"]
+        assert metadata["vector_layers"][1]["fields"] == {"objekttyp": "String"}
+
+    def test_unit_tile_block(self, tmp_path):
+        """Unit test of tile_block function."""
+        files = []
+        for name, x in (("near", 0.0), ("far", 10.0)):
+            files.append(str(tmp_path / f"{name}.fgb"))
+            gpd.GeoDataFrame(
+                {"objekttyp": [name, f"{name} small"]},
+                geometry=[
+                    Polygon([(x, 0), (x + 1, 0), (x + 1, 1)]),
+                    Polygon([(x, 0), (x + 1e-6, 0), (x, 1e-6)]),
+                ],
+                crs="EPSG:4326",
+            ).to_file(files[-1])
+
+        encoded = tile_block("mark", 8, [(128, 127)], tile_bounds(8, 128, 127), files)
+        decoded = mapbox_vector_tile.decode(encoded[0][1])
+
+        assert [tile_id for tile_id, _ in encoded] == [zxy_to_tileid(8, 128, 127)]
+        assert [feature["properties"] for feature in decoded["mark"]["features"]] == [
+            {"objekttyp": "near"}
+        ]
+        assert tile_block("mark", 8, [(0, 0)], tile_bounds(8, 0, 0), files) == []
+
+    def test_unit_blocks(self):
+        """Unit test of blocks function."""
+        for zoom in (0, 1):
+            for tiles, bounds in blocks((-ORIGIN, -ORIGIN, ORIGIN, ORIGIN), zoom):
+                assert len(tiles) == 4**zoom
+                assert bounds == (-ORIGIN, -ORIGIN, ORIGIN, ORIGIN)
+
+        [(tiles, bounds)] = list(blocks((-ORIGIN / 4, ORIGIN / 4) * 2, 2))
+        assert tiles == [(1, 1)]
+        assert box(*bounds).contains(box(*tile_bounds(2, 1, 1)))
+
+    @pytest.mark.parametrize("file_ending", ["fgb", "parquet"])
+    def test_unit_build_pmtiles_low_zoom(self, tmp_path, file_ending):
+        """Unit test of build_pmtiles function at low zoom levels, at the web mercator edges."""
+        roads = tmp_path / "kommunikation_sverige" / "vaglinje"
+        roads.mkdir(parents=True)
+        df = gpd.GeoDataFrame(
+            {"objekttyp": ["Motorväg"]},
+            geometry=[LineString([(11.0, 55.5), (24.0, 69.0)])],
+            crs="EPSG:4326",
+        )
+        if file_ending == "parquet":
+            write_geoparquet(
+                pa.table({"objekttyp": df.objekttyp}),
+                df.geometry.values,
+                "EPSG:4326",
+                str(roads / "07_motorvag.parquet"),
+            )
+        else:
+            df.to_file(roads / "07_motorvag.fgb")
+
+        archive = str(tmp_path / "basemap.pmtiles")
+        expected = [(0, 0, 0), (1, 1, 0), (2, 2, 0), (2, 2, 1)]
+        assert build_pmtiles(str(tmp_path), archive, 0, 2, workers=1) == len(expected)
+
+        with open(archive, "rb") as f:
+            reader = pmtiles_reader.Reader(pmtiles_reader.MmapSource(f))
+            for zoom, x, y in expected:
+                tile = mapbox_vector_tile.decode(gzip.decompress(reader.get(zoom, x, y)))
+                assert len(tile["vaglinje"]["features"]) == 1